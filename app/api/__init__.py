@@ -1,3 +1,5 @@
-from . import conference, employee, booking
-
-__all__ = ['conference', 'employee', 'booking'] 
\ No newline at end of file
+"""!
+@file __init__.py
+@brief API 路由包
+@details 各路由模块由 app.main 导入并注册；FastAPI 需要在处理第一个请求之前拿到完整的路由表，路由模块不做延迟导入。
+"""
@@ -1,55 +1,199 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Literal, Optional, Set, Tuple, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import join
-from app.models.database import get_db
-from app.models.booking import EmployeeConferenceDB, ConferenceBookingDB
+from sqlalchemy import Select, delete, exists, func, select
+from app.core.cache import cache, entity_key
+from app.core.config import BATCH_CHUNK_SIZE, MAX_PAGE_SIZE
+from app.core.pagination import NEXT_CURSOR_HEADER, apply_cursor, encode_cursor, ndjson_response
+from app.core.responses import rows_response
+from app.core.etag import weak_etag, validator_headers, is_not_modified
+from app.core.events import publish_booking_changes
+from app.core.exports import export_response
+from app.models.database import get_db, AsyncSessionLocal, insert_ignore, chunked
+from app.models.booking import EmployeeConferenceDB, WaitlistDB
+from app.models.capacity import (
+    seat_lock, take_seat, lock_conference, add_seats, fill_from_waitlist, waitlist_position, is_booked
+)
+from app.models.coalescer import run_write
 from app.models.conference import ConferenceDB
 from app.models.employee import EmployeeDB
-from app.schemas.booking import EmployeeConference, ConferenceBooking, ConferenceBookingCreate
+from app.models.room import RoomDB
+from app.models.schedule import employees_with_conflicts, find_employee_conflict, lock_employees
+from app.models.version import collection_state
+from app.schemas.booking import (
+    EmployeeConference, ConferenceBooking, ConferenceBookingCreate, BookingBatchCreate, BookingBatchResult,
+    WaitlistEntry, AttendeeCount, BookingDetail
+)
 from app.schemas.conference import Conference
 from app.schemas.employee import Employee
 
 router = APIRouter()
 
-@router.post("/conferences/{conference_id}/book", response_model=EmployeeConference, status_code=201)
+@router.post(
+    "/conferences/{conference_id}/book",
+    response_model=Union[EmployeeConference, WaitlistEntry],
+    status_code=201,
+    responses={202: {"model": WaitlistEntry, "description": "会议已满，已加入候补名单"}}
+)
 async def book_conference(
     conference_id: int,
     employee_id: int,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     """!
     @brief 为员工预定会议。
+    @details 先以一条条件 UPDATE 占用名额（会议与员工存在、尚未预定且有空位），占到后写入预定记录，
+             并发请求同一会议时不会超额。未占到名额时才再查询一次，区分不存在、重复预定和已满；
+             已满时加入候补名单并返回 202。SQLite 下同一会议的名额变更在进程内排队（seat_lock），
+             开启 WRITE_COALESCING 时与其他写操作合并提交（见 app.models.coalescer）。
+             会议有起止时间时，员工已预定的同一天的会议与之时段重叠则返回 409，响应的 detail.conference 为冲突的会议；
+             检测嵌入占用名额的条件 UPDATE，成功路径不增加查询；未占到名额时才查出冲突的会议（见 app.models.schedule）。
     @param conference_id 要预定的会议 ID。
     @param employee_id 预定会议的员工 ID。
+    @param response FastAPI 响应对象，加入候补名单时改写状态码。
     @param db 数据库会话。
-    @return EmployeeConference 新创建的预定记录。
+    @return EmployeeConference 新创建的预定记录；会议已满时为 WaitlistEntry 候补信息。
+    @exception HTTPException 如果会议或员工未找到 (404)，或该员工已预定此会议、已在候补名单中、已预定同一时段的其他会议 (409)。
     """
-    # 检查会议是否存在
-    conference = await db.get(ConferenceDB, conference_id)
-    if conference is None:
-        raise HTTPException(status_code=404, detail="Conference not found")
-    
-    # 检查员工是否存在
-    employee = await db.get(EmployeeDB, employee_id)
-    if employee is None:
-        raise HTTPException(status_code=404, detail="Employee not found")
+    async def book(session: AsyncSession) -> Optional[int]:
+        await lock_employees(session, [employee_id])
+        if await take_seat(session, conference_id, employee_id):
+            result = await session.execute(
+                insert_ignore(EmployeeConferenceDB, session).values(employee_id=employee_id, conference_id=conference_id)
+            )
+            if result.rowcount == 0:
+                # 同一员工的并发请求已先写入，抛出异常后回滚本次占用的名额
+                raise HTTPException(status_code=409, detail="Booking already exists")
+            return None
+
+        row = (await session.execute(select(
+            exists().where(ConferenceDB.id == conference_id),
+            exists().where(EmployeeDB.id == employee_id),
+            is_booked(conference_id, employee_id)
+        ))).one()
+        if not row[0]:
+            raise HTTPException(status_code=404, detail="Conference not found")
+        if not row[1]:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        if row[2]:
+            raise HTTPException(status_code=409, detail="Booking already exists")
+
+        conflict = await find_employee_conflict(session, conference_id, employee_id)
+        if conflict is not None:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Schedule conflict", "conference": jsonable_encoder(conflict)}
+            )
+
+        result = await session.execute(
+            insert_ignore(WaitlistDB, session).values(conference_id=conference_id, employee_id=employee_id)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=409, detail="Already on the waitlist")
+        return await waitlist_position(session, conference_id, employee_id)
+
+    async with seat_lock(db, conference_id):
+        position = await run_write(db, book)
+        if position is None:
+            await cache.delete(entity_key("conference", conference_id))
+            publish_booking_changes(conference_id, booked=[employee_id])
+            return EmployeeConference(employee_id=employee_id, conference_id=conference_id)
+        publish_booking_changes(conference_id, waitlisted=[employee_id])
+        response.status_code = 202
+        return WaitlistEntry(conference_id=conference_id, employee_id=employee_id, position=position)
+
+@router.post("/conferences/{conference_id}/bookings:batch", response_model=BookingBatchResult, status_code=201)
+async def book_conference_batch(
+    conference_id: int,
+    batch_in: BookingBatchCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 为一批员工预定同一个会议。
+    @details 先锁定会议行并读取剩余名额，员工存在性与已有预定各用一次 IN 查询确认，
+             缺失的预定记录按请求顺序分配剩余名额，以 INSERT ... ON CONFLICT DO NOTHING 批量写入，
+             分配不到名额的员工加入候补名单，整批只提交一次。
+             已预定同一时段其他会议的员工以一次查询筛出，不预定也不加入候补名单。
+    @param conference_id 要预定的会议 ID。
+    @param batch_in BookingBatchCreate Pydantic 模型，包含员工 ID 列表。
+    @param db 数据库会话。
+    @return BookingBatchResult 新建、已存在、无效和日程冲突的员工 ID。
+    @exception HTTPException 如果会议未找到 (404)。
+    """
+    # 去重并保持请求中的顺序
+    employee_ids = list(dict.fromkeys(batch_in.employee_ids))
+
+    async def book_all(session: AsyncSession) -> Tuple[List[int], List[int], Set[int], Set[int], Set[int]]:
+        seats = await lock_conference(session, conference_id)
+        if seats is None:
+            raise HTTPException(status_code=404, detail="Conference not found")
+
+        found_ids = set()
+        booked_ids = set()
+        for chunk in chunked(employee_ids, BATCH_CHUNK_SIZE):
+            result = await session.execute(select(EmployeeDB.id).where(EmployeeDB.id.in_(chunk)))
+            found_ids.update(result.scalars().all())
+            result = await session.execute(
+                select(EmployeeConferenceDB.employee_id).where(
+                    EmployeeConferenceDB.conference_id == conference_id,
+                    EmployeeConferenceDB.employee_id.in_(chunk)
+                )
+            )
+            booked_ids.update(result.scalars().all())
+
+        candidates = [eid for eid in employee_ids if eid in found_ids and eid not in booked_ids]
+        conflicting_ids = set()
+        await lock_employees(session, candidates)
+        for chunk in chunked(candidates, BATCH_CHUNK_SIZE):
+            conflicting_ids |= await employees_with_conflicts(session, conference_id, chunk)
+        candidates = [eid for eid in candidates if eid not in conflicting_ids]
+        free = len(candidates) if seats.capacity is None else max(seats.capacity - seats.booked_count, 0)
+        created, waitlisted = candidates[:free], candidates[free:]
+        if created:
+            statement = insert_ignore(EmployeeConferenceDB, session)
+            for chunk in chunked(created, BATCH_CHUNK_SIZE):
+                await session.execute(statement, [{"employee_id": eid, "conference_id": conference_id} for eid in chunk])
+            await add_seats(session, conference_id, len(created))
+        if waitlisted:
+            statement = insert_ignore(WaitlistDB, session)
+            for chunk in chunked(waitlisted, BATCH_CHUNK_SIZE):
+                await session.execute(statement, [{"employee_id": eid, "conference_id": conference_id} for eid in chunk])
+        return created, waitlisted, found_ids, booked_ids, conflicting_ids
+
+    async with seat_lock(db, conference_id):
+        created, waitlisted, found_ids, booked_ids, conflicting_ids = await run_write(db, book_all)
+        if created:
+            await cache.delete(entity_key("conference", conference_id))
+        publish_booking_changes(conference_id, booked=created, waitlisted=waitlisted)
 
-    # 创建预定记录
-    booking = EmployeeConferenceDB(
+    return BookingBatchResult(
         conference_id=conference_id,
-        employee_id=employee_id
+        created=created,
+        existing=[eid for eid in employee_ids if eid in booked_ids],
+        waitlisted=waitlisted,
+        invalid=[eid for eid in employee_ids if eid not in found_ids],
+        conflicting=[eid for eid in employee_ids if eid in conflicting_ids]
     )
-    db.add(booking)
-    await db.commit()
-    await db.refresh(booking)
-    return booking.to_pydantic()
+
+def employee_conferences_query(employee_id: int, *extra_columns) -> Select:
+    """!
+    @brief 员工预定的会议查询，只投影会议表的列。
+    @param employee_id 员工 ID。
+    @param extra_columns 额外投影的列。
+    @return Select 通过关联表连接会议表的查询。
+    """
+    return select(*ConferenceDB.__table__.columns, *extra_columns).join(
+        EmployeeConferenceDB,
+        ConferenceDB.id == EmployeeConferenceDB.conference_id
+    ).where(EmployeeConferenceDB.employee_id == employee_id)
 
 @router.get("/employees/{employee_id}/conferences", response_model=List[Conference])
 async def get_employee_conferences(employee_id: int, db: AsyncSession = Depends(get_db)):
     """!
     @brief 获取指定员工的所有预定会议。
+    @details 只查询会议表中的列并直接编码为 JSON，不逐行构造 Pydantic 模型。
     @param employee_id 员工 ID。
     @param db 数据库会话。
     @return List[Conference] 员工预定的所有会议列表。
@@ -59,70 +203,268 @@ async def get_employee_conferences(employee_id: int, db: AsyncSession = Depends(
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    # 通过关联表查询会议
-    query = select(ConferenceDB).join(
-        EmployeeConferenceDB,
-        ConferenceDB.id == EmployeeConferenceDB.conference_id
-    ).where(EmployeeConferenceDB.employee_id == employee_id)
-    
-    result = await db.execute(query)
-    conferences = result.scalars().all()
-    return [conf.to_pydantic() for conf in conferences]
+    result = await db.execute(employee_conferences_query(employee_id))
+    return rows_response(result.all(), result.keys())
+
+@router.get("/employees/{employee_id}/conferences.ics")
+async def get_employee_calendar(employee_id: int, db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 以 iCalendar 格式流式返回员工预定的会议，可供日历客户端订阅。
+    @details 会议与 get_employee_conferences 相同，另附会议室名称；沿主键 (employee_id, conference_id) 分批读取，
+             边读边发送（见 app.core.exports）。
+    @param employee_id 员工 ID。
+    @param db 数据库会话。
+    @return StreamingResponse text/calendar 附件，每个会议一个 VEVENT。
+    @exception HTTPException 如果员工未找到 (404)。
+    """
+    employee = await db.get(EmployeeDB, employee_id)
+    if employee is None:
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    query = employee_conferences_query(employee_id, RoomDB.name.label("room_name")).outerjoin(
+        RoomDB, RoomDB.id == ConferenceDB.room_id
+    ).order_by(EmployeeConferenceDB.conference_id)
+    return export_response(
+        AsyncSessionLocal, query, "ical", f"employee-{employee_id}-conferences", calendar_name=f"{employee.name}的会议"
+    )
+
+# 与会人员列表可投影的字段与可排序的列
+ATTENDEE_FIELDS = {column.key: column for column in EmployeeDB.__table__.columns}
+ATTENDEE_SORTS = {"id": EmployeeDB.id, "name": EmployeeDB.name, "department": EmployeeDB.department}
 
 @router.get("/conferences/{conference_id}/attendees", response_model=List[Employee])
-async def get_conference_attendees(conference_id: int, db: AsyncSession = Depends(get_db)):
+async def get_conference_attendees(
+    conference_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页条数，不传则返回全部"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 中的游标"),
+    sort: Literal["id", "name", "department"] = Query("id", description="排序字段"),
+    fields: Optional[str] = Query(None, description="逗号分隔的返回字段，如 id,name,department"),
+    db: AsyncSession = Depends(get_db)
+):
     """!
-    @brief 获取指定会议的所有与会人员。
+    @brief 获取指定会议的与会人员，支持分页、排序和字段投影。
+    @details 按 (排序字段, id) 做 keyset 分页，若还有下一页，在 X-Next-Cursor 响应头中返回游标。
+             只查询所需的列并直接编码为 JSON，不逐行构造 Employee 模型；不指定 fields 时返回全部字段。
     @param conference_id 会议 ID。
+    @param limit 每页条数。
+    @param cursor 分页游标。
+    @param sort 排序字段。
+    @param fields 逗号分隔的返回字段。
     @param db 数据库会话。
-    @return List[Employee] 会议的所有与会人员列表。
+    @return List[Employee] 会议的与会人员列表；指定 fields 时为只含这些字段的 JSON 数组。
+    @exception HTTPException 如果会议未找到 (404)，或字段、游标无效 (400)。
     """
     # 检查会议是否存在
     conference = await db.get(ConferenceDB, conference_id)
     if conference is None:
         raise HTTPException(status_code=404, detail="Conference not found")
 
+    selected = list(ATTENDEE_FIELDS)
+    if fields is not None:
+        selected = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in selected if name not in ATTENDEE_FIELDS]
+        if not selected or unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    # 所选字段在前，排序列只用于生成游标，编码时按 selected 截断
+    sort_columns = list(dict.fromkeys([ATTENDEE_SORTS[sort], EmployeeDB.id]))
+    query = select(*dict.fromkeys([ATTENDEE_FIELDS[name] for name in selected] + sort_columns))
+
     # 通过关联表查询员工
-    query = select(EmployeeDB).join(
+    query = query.join(
         EmployeeConferenceDB,
         EmployeeDB.id == EmployeeConferenceDB.employee_id
     ).where(EmployeeConferenceDB.conference_id == conference_id)
-    
+    query = apply_cursor(query, sort_columns, cursor, limit)
+
     result = await db.execute(query)
-    employees = result.scalars().all()
-    return [emp.to_pydantic() for emp in employees]
+    rows = result.all()
+    headers = {}
+    if limit is not None and len(rows) == limit:
+        last = rows[-1]._mapping
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*jsonable_encoder([last[column.key] for column in sort_columns]))
+    return rows_response(rows, selected, headers)
+
+@router.get("/conferences/{conference_id}/attendees/count", response_model=AttendeeCount)
+async def count_conference_attendees(conference_id: int, db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 获取指定会议的与会人数。
+    @details 会议是否存在与 COUNT(*) 在同一条查询中完成，计数只扫描关联表的会议索引。
+    @param conference_id 会议 ID。
+    @param db 数据库会话。
+    @return AttendeeCount 与会人数。
+    @exception HTTPException 如果会议未找到 (404)。
+    """
+    attendee_count = select(func.count()).where(EmployeeConferenceDB.conference_id == conference_id).scalar_subquery()
+    found, count = (await db.execute(
+        select(exists().where(ConferenceDB.id == conference_id), attendee_count)
+    )).one()
+    if not found:
+        raise HTTPException(status_code=404, detail="Conference not found")
+    return AttendeeCount(conference_id=conference_id, count=count)
+
+# 预定详情列表的投影列，标签与 BookingDetail 的字段一致
+BOOKING_DETAIL_COLUMNS = (
+    EmployeeConferenceDB.conference_id,
+    ConferenceDB.name.label("conference_name"),
+    ConferenceDB.date.label("conference_date"),
+    EmployeeConferenceDB.employee_id,
+    EmployeeDB.name.label("employee_name"),
+    EmployeeDB.department.label("employee_department"),
+)
 
 @router.get("/conferences/bookings", response_model=List[EmployeeConference])
-async def get_all_bookings(db: AsyncSession = Depends(get_db)):
+async def get_all_bookings(request: Request, db: AsyncSession = Depends(get_db)):
     """!
     @brief 获取所有会议预定记录。
+    @details 响应带有由预定数、预定版本号和会议的最后修改时间构造的弱 ETag，校验一致时返回 304。
+             预定与取消都会以条件 UPDATE 调整会议的 booked_count 并刷新其 updated_at（见 app.models.capacity），
+             因此不在预定事务中另外递增版本号；版本号只在级联删除预定的删除会议时递增。
+             预定记录按列查询后直接编码为 JSON。
+    @param request FastAPI 请求对象，用于读取条件请求头。
     @param db 数据库会话。
     @return List[EmployeeConference] 所有预定记录列表。
     """
-    result = await db.execute(select(EmployeeConferenceDB).order_by(EmployeeConferenceDB.conference_id))
-    bookings = result.scalars().all()
-    return [booking.to_pydantic() for booking in bookings]
+    count, version, last_modified = await collection_state(
+        db, "bookings", EmployeeConferenceDB, select(func.max(ConferenceDB.updated_at)).scalar_subquery()
+    )
+    headers = validator_headers(weak_etag(count, version, last_modified), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+
+    result = await db.execute(
+        select(EmployeeConferenceDB.employee_id, EmployeeConferenceDB.conference_id)
+        .order_by(EmployeeConferenceDB.conference_id)
+    )
+    return rows_response(result.all(), result.keys(), headers)
+
+def booking_details_query() -> Select:
+    """!
+    @brief 预定详情查询：关联表与会议表、员工表按主键连接，只投影 BOOKING_DETAIL_COLUMNS。
+    @return Select 查询。
+    """
+    return select(*BOOKING_DETAIL_COLUMNS).select_from(EmployeeConferenceDB).join(
+        ConferenceDB, ConferenceDB.id == EmployeeConferenceDB.conference_id
+    ).join(
+        EmployeeDB, EmployeeDB.id == EmployeeConferenceDB.employee_id
+    )
+
+@router.get("/bookings", response_model=List[BookingDetail])
+async def get_booking_details(
+    conference_id: Optional[int] = Query(None, description="只返回该会议的预定"),
+    employee_id: Optional[int] = Query(None, description="只返回该员工的预定"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页条数，不传则返回全部"),
+    cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 中的游标"),
+    stream: bool = Query(False, description="以 NDJSON 流式返回"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取带会议名称、日期与员工姓名、部门的预定列表，支持按会议或员工筛选和游标分页。
+    @details 关联表与会议表、员工表在一条查询中按主键连接，只投影所需的列。
+             按员工筛选时沿主键 (employee_id, conference_id) 排序，否则沿索引 (conference_id, employee_id) 排序，
+             排序键即索引顺序，keyset 分页无需排序，每页的代价与总预定数无关。
+    @param conference_id 会议 ID。
+    @param employee_id 员工 ID。
+    @param limit 每页条数。
+    @param cursor 分页游标。
+    @param stream 是否以 NDJSON 流式返回。
+    @param db 数据库会话。
+    @return List[BookingDetail] 预定列表。
+    @exception HTTPException 如果游标无效 (400)。
+    """
+    query = booking_details_query()
+    if conference_id is not None:
+        query = query.where(EmployeeConferenceDB.conference_id == conference_id)
+    if employee_id is not None:
+        query = query.where(EmployeeConferenceDB.employee_id == employee_id)
+
+    if employee_id is not None and conference_id is None:
+        sort_columns = [EmployeeConferenceDB.employee_id, EmployeeConferenceDB.conference_id]
+    else:
+        sort_columns = [EmployeeConferenceDB.conference_id, EmployeeConferenceDB.employee_id]
+    query = apply_cursor(query, sort_columns, cursor, limit)
+    if stream:
+        return ndjson_response(AsyncSessionLocal, query)
+
+    result = await db.execute(query)
+    rows = result.all()
+    headers = {}
+    if limit is not None and len(rows) == limit:
+        last = rows[-1]._mapping
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*[last[column.key] for column in sort_columns])
+    return rows_response(rows, result.keys(), headers)
+
+@router.get("/bookings/export")
+async def export_bookings(
+    format: Literal["csv", "ndjson"] = Query("csv", description="导出格式"),
+    gzip: bool = Query(False, description="以 gzip 文件返回"),
+):
+    """!
+    @brief 流式导出全部预定，字段同 GET /bookings（会议名称、日期与员工姓名、部门）。
+    @details 沿索引 (conference_id, employee_id) 分批读取，会议与员工按主键连接，边读边发送，内存占用与预定数无关。
+    @param format 导出格式。
+    @param gzip 是否以 gzip 文件返回。
+    @return StreamingResponse 预定详情的 CSV 或 NDJSON 附件。
+    """
+    query = booking_details_query().order_by(EmployeeConferenceDB.conference_id, EmployeeConferenceDB.employee_id)
+    return export_response(AsyncSessionLocal, query, format, "bookings", gzip)
+
+@router.get("/conferences/{conference_id}/waitlist", response_model=List[WaitlistEntry])
+async def get_conference_waitlist(conference_id: int, db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 获取指定会议的候补名单。
+    @param conference_id 会议 ID。
+    @param db 数据库会话。
+    @return List[WaitlistEntry] 按候补顺序排列的候补名单。
+    @exception HTTPException 如果会议未找到 (404)。
+    """
+    conference = await db.get(ConferenceDB, conference_id)
+    if conference is None:
+        raise HTTPException(status_code=404, detail="Conference not found")
+
+    result = await db.execute(
+        select(WaitlistDB.employee_id).where(WaitlistDB.conference_id == conference_id).order_by(WaitlistDB.id)
+    )
+    return [
+        WaitlistEntry(conference_id=conference_id, employee_id=employee_id, position=position)
+        for position, employee_id in enumerate(result.scalars().all(), start=1)
+    ]
 
 @router.delete("/conferences/{conference_id}/bookings/{employee_id}", response_model=dict)
 async def cancel_booking(conference_id: int, employee_id: int, db: AsyncSession = Depends(get_db)):
     """!
-    @brief 取消员工的会议预定。
+    @brief 取消员工的会议预定或候补。
+    @details 取消正式预定时释放名额，并按候补顺序把空出的名额分配给候补员工。
     @param conference_id 会议 ID。
     @param employee_id 员工 ID。
     @param db 数据库会话。
-    @return dict 包含成功消息的 dictionary。
+    @return dict 包含成功消息和转为正式预定的候补员工 ID 的 dictionary。
+    @exception HTTPException 如果预定记录和候补记录均未找到 (404)。
     """
-    # 检查预定记录是否存在
-    query = select(EmployeeConferenceDB).where(
-        EmployeeConferenceDB.conference_id == conference_id,
-        EmployeeConferenceDB.employee_id == employee_id
-    )
-    result = await db.execute(query)
-    booking = result.scalar_one_or_none()
-    
-    if booking is None:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    await db.delete(booking)
-    await db.commit()
-    return {"message": f"Booking cancelled successfully"} 
\ No newline at end of file
+    async def cancel(session: AsyncSession) -> Tuple[bool, List[int]]:
+        result = await session.execute(
+            delete(EmployeeConferenceDB).where(
+                EmployeeConferenceDB.conference_id == conference_id,
+                EmployeeConferenceDB.employee_id == employee_id
+            )
+        )
+        if result.rowcount == 1:
+            await add_seats(session, conference_id, -1)
+            promoted = await fill_from_waitlist(session, conference_id)
+            return True, promoted
+
+        result = await session.execute(
+            delete(WaitlistDB).where(WaitlistDB.conference_id == conference_id, WaitlistDB.employee_id == employee_id)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        return False, []
+
+    async with seat_lock(db, conference_id):
+        cancelled, promoted = await run_write(db, cancel)
+        await cache.delete(entity_key("conference", conference_id))
+        if cancelled:
+            publish_booking_changes(conference_id, cancelled=[employee_id], booked=promoted, left_waitlist=promoted)
+        else:
+            publish_booking_changes(conference_id, left_waitlist=[employee_id])
+        return {"message": f"Booking cancelled successfully", "promoted": promoted}
@@ -1,73 +1,294 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import contextlib
+import datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.database import get_db
+from app.core.cache import cache, entity_key
+from app.core.etag import weak_etag, validator_headers, is_not_modified
+from app.core.events import events, publish_booking_changes
+from app.core.config import MAX_PAGE_SIZE, BATCH_CHUNK_SIZE
+from app.core.exports import export_response
+from app.core.pagination import apply_keyset, set_next_cursor, ndjson_response
+from app.core.responses import row_dicts, rows_response
+from app.models.capacity import fill_from_waitlist, lock_conference, seat_lock
+from app.models.coalescer import run_write
+from app.models.database import get_db, AsyncSessionLocal, chunked
 from app.models.conference import ConferenceDB
-from app.schemas.conference import Conference, ConferenceCreate, ConferenceUpdate
+from app.models.schedule import RoomSchedule, booked_employees_with_conflicts, find_conflict, lock_rooms
+from app.models.search import apply_search
+from app.models.version import bump_version, collection_state
+from app.schemas.batch import BatchItemResult
+from app.schemas.conference import Conference, ConferenceCreate, ConferenceUpdate, check_schedule
 
 router = APIRouter()
 
+async def check_room_available(
+    db: AsyncSession,
+    room_id: int,
+    date: datetime.date,
+    start_time: datetime.time,
+    end_time: datetime.time,
+    exclude_id: Optional[int] = None,
+) -> None:
+    """!
+    @brief 锁定会议室并检查给定时段是否空闲，需在写入会议之前调用。
+    @param db 数据库会话。
+    @param room_id 会议室 ID。
+    @param date 日期。
+    @param start_time 开始时间。
+    @param end_time 结束时间。
+    @param exclude_id 不参与检测的会议 ID。
+    @exception HTTPException 如果会议室未找到 (404)，或该时段已被其他会议占用 (409)。
+    """
+    if not await lock_rooms(db, [room_id]):
+        raise HTTPException(status_code=404, detail="Room not found")
+    conflict = await find_conflict(db, room_id, date, start_time, end_time, exclude_id)
+    if conflict is not None:
+        raise HTTPException(status_code=409, detail=f"Room is already booked by conference {conflict} at that time")
+
 @router.get("/", response_model=List[Conference])
-async def get_conferences(db: AsyncSession = Depends(get_db)):
+async def get_conferences(
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0, description="上一页最后一条会议的 ID"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页条数，不传则返回全部"),
+    stream: bool = Query(False, description="以 NDJSON 流式返回"),
+    date_from: Optional[datetime.date] = Query(None, description="会议日期下限（含）"),
+    date_to: Optional[datetime.date] = Query(None, description="会议日期上限（含）"),
+    location: Optional[str] = Query(None, description="按地点筛选"),
+    room_id: Optional[int] = Query(None, description="按会议室筛选"),
+    q: Optional[str] = Query(None, max_length=100, description="按名称或描述检索，多个词以空格分隔，每个词匹配其中任意位置的片段"),
+    db: AsyncSession = Depends(get_db)
+):
     """!
-    @brief 获取所有会议的列表。
+    @brief 获取会议列表，支持筛选、全文检索、游标分页和 NDJSON 流式输出。
+    @details 日期范围、地点和会议室走各自的索引；q 经全文索引检索（见 app.models.search）。
+             分页时若还有下一页，在 X-Next-Cursor 响应头中返回下一页的 after_id。
+             响应带有由行数、最大 updated_at 和版本号构造的弱 ETag，校验一致时返回 304。
+             只查询表中的列并直接编码为 JSON（见 app.core.responses），不逐行构造 Pydantic 模型。
+    @param request FastAPI 请求对象，用于读取条件请求头。
+    @param after_id 上一页最后一条会议的 ID。
+    @param limit 每页条数。
+    @param stream 是否以 NDJSON 流式返回。
+    @param date_from 会议日期下限。
+    @param date_to 会议日期上限。
+    @param location 地点。
+    @param room_id 会议室 ID。
+    @param q 检索关键字。
     @param db 数据库会话，通过依赖注入获取。
-    @return List[Conference] 包含所有会议信息的列表。
+    @return List[Conference] 包含会议信息的列表。
     """
-    from sqlalchemy import select
-    result = await db.execute(select(ConferenceDB).order_by(ConferenceDB.id))
-    conferences_db_models = result.scalars().all()
-    return [conf.to_pydantic() for conf in conferences_db_models]
+    count, version, last_modified = await collection_state(db, "conferences", ConferenceDB, ConferenceDB.updated_at)
+    headers = validator_headers(weak_etag(count, version, last_modified, request.url.query), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+
+    query = select(*ConferenceDB.__table__.columns)
+    if date_from is not None:
+        query = query.where(ConferenceDB.date >= date_from)
+    if date_to is not None:
+        query = query.where(ConferenceDB.date <= date_to)
+    if location is not None:
+        query = query.where(ConferenceDB.location == location)
+    if room_id is not None:
+        query = query.where(ConferenceDB.room_id == room_id)
+    query, id_column = apply_search(db, query, ConferenceDB, q)
+    query = apply_keyset(query, id_column, after_id, limit)
+    if stream:
+        return ndjson_response(AsyncSessionLocal, query, headers)
+
+    result = await db.execute(query)
+    rows = result.all()
+    response = rows_response(rows, result.keys(), headers)
+    set_next_cursor(response, rows, limit)
+    return response
 
 @router.post("/", response_model=Conference, status_code=201)
 async def create_conference(conference_in: ConferenceCreate, db: AsyncSession = Depends(get_db)):
     """!
     @brief 创建一个新的会议。
+    @details 指定会议室时，该会议室在会议当天的起止时段内不能已有其他会议。
     @param conference_in ConferenceCreate Pydantic 模型，包含新会议的数据。
     @param db 数据库会话。
     @return Conference 新创建的会议对象。
+    @exception HTTPException 如果会议室未找到 (404)，或会议室在该时段已被占用 (409)。
+    """
+    async def create(session: AsyncSession) -> Conference:
+        if conference_in.room_id is not None:
+            await check_room_available(
+                session, conference_in.room_id, conference_in.date, conference_in.start_time, conference_in.end_time
+            )
+        db_conference = ConferenceDB(**conference_in.model_dump())
+        session.add(db_conference)
+        await session.flush()
+        await session.refresh(db_conference)
+        return db_conference.to_pydantic()
+
+    conference = await run_write(db, create)
+    events.publish("conference.created", {"items": [conference.model_dump(mode="json")]})
+    return conference
+
+@router.post("/batch", response_model=List[BatchItemResult])
+async def create_conferences_batch(
+    items: List[Dict[str, Any]] = Body(..., example=[{"name": "会议名称", "date": "2008-1-1", "location": "会议地点"}]),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 批量创建会议。
+    @details 每条数据单独校验；通过校验的数据按块以带 RETURNING 的多行 INSERT 写入，
+             全部写入作为一个写操作在同一事务中完成（开启 WRITE_COALESCING 时与其他写操作合并提交），
+             不再逐行 refresh。RETURNING 返回完整的行，用于发布变更事件。
+             指定了会议室的数据先锁定会议室，再与已有会议及同批次中排在前面的会议检测冲突，
+             冲突的数据状态为 conflict，会议室不存在的数据状态为 invalid。
+    @param items 会议数据列表，字段同 ConferenceCreate。
+    @param db 数据库会话。
+    @return List[BatchItemResult] 与请求顺序一致的逐条处理结果。
+    """
+    results: List[Optional[BatchItemResult]] = [None] * len(items)
+    valid: List[Tuple[int, ConferenceCreate]] = []
+    for index, raw in enumerate(items):
+        try:
+            valid.append((index, ConferenceCreate.model_validate(raw)))
+        except ValidationError as e:
+            results[index] = BatchItemResult.invalid(index, e)
+
+    async def create_all(session: AsyncSession) -> Tuple[Dict[int, BatchItemResult], List[Dict[str, Any]]]:
+        outcomes: Dict[int, BatchItemResult] = {}
+        rooms = await lock_rooms(session, [conference.room_id for _, conference in valid if conference.room_id is not None])
+        schedule = RoomSchedule()
+        accepted: List[Tuple[int, ConferenceCreate]] = []
+        for index, conference in valid:
+            if conference.room_id is not None:
+                if conference.room_id not in rooms:
+                    outcomes[index] = BatchItemResult(index=index, status="invalid", detail="room_id: Room not found")
+                    continue
+                schedule_args = (conference.room_id, conference.date, conference.start_time, conference.end_time)
+                if await find_conflict(session, *schedule_args) is not None or not schedule.add(*schedule_args):
+                    outcomes[index] = BatchItemResult(index=index, status="conflict", detail="Room is already booked at that time")
+                    continue
+            accepted.append((index, conference))
+
+        statement = insert(ConferenceDB).returning(*ConferenceDB.__table__.columns, sort_by_parameter_order=True)
+        created = []
+        for chunk in chunked(accepted, BATCH_CHUNK_SIZE):
+            result = await session.execute(statement, [conference.model_dump() for _, conference in chunk])
+            rows = result.all()
+            for (index, _), row in zip(chunk, rows):
+                outcomes[index] = BatchItemResult(index=index, status="created", id=row.id)
+            created += row_dicts(rows, result.keys())
+        return outcomes, created
+
+    outcomes, created = await run_write(db, create_all)
+    for index, outcome in outcomes.items():
+        results[index] = outcome
+    if created:
+        events.publish("conference.created", {"items": created})
+    return results
+
+@router.get("/export")
+async def export_conferences(
+    format: Literal["csv", "ndjson"] = Query("csv", description="导出格式"),
+    gzip: bool = Query(False, description="以 gzip 文件返回"),
+):
+    """!
+    @brief 流式导出全部会议，按 ID 排序。
+    @details 沿主键分批读取，边读边发送，内存占用与会议数无关（见 app.core.exports）。
+    @param format 导出格式。
+    @param gzip 是否以 gzip 文件返回。
+    @return StreamingResponse 会议表各列的 CSV 或 NDJSON 附件。
     """
-    db_conference = ConferenceDB(**conference_in.model_dump())
-    db.add(db_conference)
-    await db.commit()
-    await db.refresh(db_conference)
-    return db_conference.to_pydantic()
+    query = select(*ConferenceDB.__table__.columns).order_by(ConferenceDB.id)
+    return export_response(AsyncSessionLocal, query, format, "conferences", gzip)
 
 @router.get("/{conference_id}", response_model=Conference)
 async def get_conference(conference_id: int, db: AsyncSession = Depends(get_db)):
     """!
     @brief 获取指定 ID 的会议信息。
+    @details 经过读缓存；未命中时读取数据库后回填，读取期间该会议被修改或删除则不回填（见 app.core.cache）。
     @param conference_id 要获取的会议的 ID。
     @param db 数据库会话。
     @return Conference 指定 ID 的会议对象。
     @exception HTTPException 如果会议未找到 (404)。
     """
-    db_conference = await db.get(ConferenceDB, conference_id)
-    if db_conference is None:
-        raise HTTPException(status_code=404, detail="Conference not found")
-    return db_conference.to_pydantic()
+    key = entity_key("conference", conference_id)
+    cached = await cache.get(key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    with cache.filling(key) as fill:
+        db_conference = await db.get(ConferenceDB, conference_id)
+        if db_conference is None:
+            raise HTTPException(status_code=404, detail="Conference not found")
+        conference = db_conference.to_pydantic()
+        await fill(conference.model_dump_json())
+    return conference
 
 @router.put("/{conference_id}", response_model=Conference)
 async def update_conference(conference_id: int, conference_in: ConferenceUpdate, db: AsyncSession = Depends(get_db)):
     """!
     @brief 更新指定 ID 的会议信息。
+    @details 调整人数上限时与预定、取消一样在 seat_lock 中先锁定会议行，上限低于已预定人数则返回 409，
+             不会留下超额的会议；新增的名额按候补顺序分配给候补员工。
+             修改会议室、日期或起止时间时，按修改后的值检查组合是否有效，并检测会议室冲突（不含会议自身）；
+             修改日期或起止时间时还复查已预定的员工，有员工已预定了与新时段重叠的其他会议则返回 409，
+             响应的 detail.employee_ids 为这些员工。
     @param conference_id 要更新的会议的 ID。
     @param conference_in ConferenceUpdate Pydantic 模型，包含要更新的会议数据。
     @param db 数据库会话。
     @return Conference 更新后的会议对象。
-    @exception HTTPException 如果会议未找到 (404)。
+    @exception HTTPException 如果会议或会议室未找到 (404)，会议室在该时段已被占用、已预定的员工日程冲突
+               或人数上限低于已预定人数 (409)，或会议室与起止时间的组合无效 (422)。
     """
-    db_conference = await db.get(ConferenceDB, conference_id)
-    if db_conference is None:
-        raise HTTPException(status_code=404, detail="Conference not found")
-
     update_data = conference_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_conference, key, value)
 
-    await db.commit()
-    await db.refresh(db_conference)
-    return db_conference.to_pydantic()
+    async def update(session: AsyncSession) -> Tuple[Conference, List[int]]:
+        if "capacity" in update_data:
+            seats = await lock_conference(session, conference_id)
+            capacity = update_data["capacity"]
+            if seats is not None and capacity is not None and capacity < seats.booked_count:
+                raise HTTPException(
+                    status_code=409,
+                    detail={"message": "Capacity below booked count", "booked_count": seats.booked_count}
+                )
+        db_conference = await session.get(ConferenceDB, conference_id)
+        if db_conference is None:
+            raise HTTPException(status_code=404, detail="Conference not found")
+
+        if update_data.keys() & {"room_id", "date", "start_time", "end_time"}:
+            room_id, date, start_time, end_time = (
+                update_data.get(key, getattr(db_conference, key)) for key in ("room_id", "date", "start_time", "end_time")
+            )
+            try:
+                check_schedule(room_id, start_time, end_time)
+            except ValueError as e:
+                raise HTTPException(status_code=422, detail=str(e))
+            if room_id is not None:
+                await check_room_available(session, room_id, date, start_time, end_time, exclude_id=conference_id)
+
+        for key, value in update_data.items():
+            setattr(db_conference, key, value)
+        await session.flush()
+        if update_data.keys() & {"date", "start_time", "end_time"}:
+            conflicting = await booked_employees_with_conflicts(session, conference_id)
+            if conflicting:
+                raise HTTPException(
+                    status_code=409,
+                    detail={"message": "Schedule conflict", "employee_ids": sorted(conflicting)}
+                )
+        promoted = []
+        if "capacity" in update_data:
+            promoted = await fill_from_waitlist(session, conference_id)
+        await session.refresh(db_conference)
+        return db_conference.to_pydantic(), promoted
+
+    lock = seat_lock(db, conference_id) if "capacity" in update_data else contextlib.nullcontext()
+    async with lock:
+        conference, promoted = await run_write(db, update)
+        await cache.delete(entity_key("conference", conference_id))
+        events.publish("conference.updated", {"items": [conference.model_dump(mode="json")]})
+        publish_booking_changes(conference_id, booked=promoted, left_waitlist=promoted)
+        return conference
 
 @router.delete("/{conference_id}", response_model=dict)
 async def delete_conference(conference_id: int, db: AsyncSession = Depends(get_db)):
@@ -78,10 +299,16 @@ async def delete_conference(conference_id: int, db: AsyncSession = Depends(get_d
     @return dict 包含成功消息的 dictionary。
     @exception HTTPException 如果会议未找到 (404)。
     """
-    db_conference = await db.get(ConferenceDB, conference_id)
-    if db_conference is None:
-        raise HTTPException(status_code=404, detail="Conference not found")
+    async def remove(session: AsyncSession) -> None:
+        db_conference = await session.get(ConferenceDB, conference_id)
+        if db_conference is None:
+            raise HTTPException(status_code=404, detail="Conference not found")
+
+        await session.delete(db_conference)
+        await bump_version(session, "conferences")
+        await bump_version(session, "bookings")
 
-    await db.delete(db_conference)
-    await db.commit()
+    await run_write(db, remove)
+    await cache.delete(entity_key("conference", conference_id))
+    events.publish("conference.deleted", {"ids": [conference_id]})
     return {"message": f"Conference with id {conference_id} deleted successfully"} 
\ No newline at end of file
@@ -1,50 +1,286 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.database import get_db
+from app.core.cache import cache, entity_key
+from app.core.etag import weak_etag, validator_headers, is_not_modified
+from app.core.events import events, publish_booking_changes
+from app.core.exports import export_response
+from app.core.config import MAX_PAGE_SIZE
+from app.core.pagination import apply_keyset, set_next_cursor, ndjson_response
+from app.core.responses import rows_response
+from app.models.capacity import release_employee_seats
+from app.models.coalescer import run_write
+from app.models.database import get_db, AsyncSessionLocal
 from app.models.employee import EmployeeDB
+from app.models.importer import IMPORT_FORMATS, ImportFormatError, ImportJob, import_employees, imports, write_employees
+from app.models.search import apply_search
+from app.models.version import bump_version, collection_state
+from app.schemas.batch import BatchItemResult, ImportJobStatus
 from app.schemas.employee import Employee, EmployeeCreate, EmployeeUpdate
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Employee])
-async def get_employees(db: AsyncSession = Depends(get_db)):
+async def get_employees(
+    request: Request,
+    after_id: Optional[int] = Query(None, ge=0, description="上一页最后一名员工的 ID"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页条数，不传则返回全部"),
+    stream: bool = Query(False, description="以 NDJSON 流式返回"),
+    department: Optional[str] = Query(None, description="按部门筛选"),
+    position: Optional[str] = Query(None, description="按职位筛选"),
+    q: Optional[str] = Query(None, max_length=100, description="按姓名或邮箱检索，多个词以空格分隔，每个词匹配其中任意位置的片段"),
+    db: AsyncSession = Depends(get_db)
+):
     """!
-    @brief 获取所有员工的列表。
+    @brief 获取员工列表，支持筛选、全文检索、游标分页和 NDJSON 流式输出。
+    @details 部门和职位为精确匹配，走各自的索引；q 经全文索引检索（见 app.models.search）。
+             分页时若还有下一页，在 X-Next-Cursor 响应头中返回下一页的 after_id。
+             响应带有由行数、最大 updated_at 和版本号构造的弱 ETag，校验一致时返回 304。
+             只查询表中的列并直接编码为 JSON（见 app.core.responses），不逐行构造 Pydantic 模型。
+    @param request FastAPI 请求对象，用于读取条件请求头。
+    @param after_id 上一页最后一名员工的 ID。
+    @param limit 每页条数。
+    @param stream 是否以 NDJSON 流式返回。
+    @param department 部门。
+    @param position 职位。
+    @param q 检索关键字。
     @param db 数据库会话。
-    @return List[Employee] 包含所有员工信息的列表。
+    @return List[Employee] 包含员工信息的列表。
     """
-    from sqlalchemy import select
-    result = await db.execute(select(EmployeeDB).order_by(EmployeeDB.id))
-    employees = result.scalars().all()
-    return [emp.to_pydantic() for emp in employees]
+    count, version, last_modified = await collection_state(db, "employees", EmployeeDB, EmployeeDB.updated_at)
+    headers = validator_headers(weak_etag(count, version, last_modified, request.url.query), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return Response(status_code=304, headers=headers)
+
+    query = select(*EmployeeDB.__table__.columns)
+    if department is not None:
+        query = query.where(EmployeeDB.department == department)
+    if position is not None:
+        query = query.where(EmployeeDB.position == position)
+    query, id_column = apply_search(db, query, EmployeeDB, q)
+    query = apply_keyset(query, id_column, after_id, limit)
+    if stream:
+        return ndjson_response(AsyncSessionLocal, query, headers)
+
+    result = await db.execute(query)
+    rows = result.all()
+    response = rows_response(rows, result.keys(), headers)
+    set_next_cursor(response, rows, limit)
+    return response
+
+async def flush_unique_email(session: AsyncSession) -> None:
+    """!
+    @brief 写出待写入的员工，邮箱违反唯一约束时返回 409 而不是 500。
+    @details 员工表只有邮箱一个唯一约束，各数据库的错误信息中都带有该列名或约束名（employees_email_key），
+             其他完整性错误原样抛出。
+    @param session 数据库会话。
+    @exception HTTPException 邮箱已被其他员工使用 (409)。
+    """
+    try:
+        await session.flush()
+    except IntegrityError as e:
+        if "email" not in str(e.orig).lower():
+            raise
+        raise HTTPException(status_code=409, detail="Email already exists")
 
 @router.post("/", response_model=Employee, status_code=201)
 async def create_employee(employee_in: EmployeeCreate, db: AsyncSession = Depends(get_db)):
     """!
     @brief 创建一个新的员工。
+    @details 邮箱唯一由数据库约束保证，并发创建同一邮箱时同样只有一个成功。
     @param employee_in EmployeeCreate Pydantic 模型。
     @param db 数据库会话。
     @return Employee 新创建的员工对象。
+    @exception HTTPException 如果邮箱已被其他员工使用 (409)。
+    """
+    async def create(session: AsyncSession) -> Employee:
+        db_employee = EmployeeDB(**employee_in.model_dump())
+        session.add(db_employee)
+        await flush_unique_email(session)
+        await session.refresh(db_employee)
+        return db_employee.to_pydantic()
+
+    employee = await run_write(db, create)
+    events.publish("employee.created", {"items": [employee.model_dump(mode="json")]})
+    return employee
+
+@router.post("/batch", response_model=List[BatchItemResult])
+async def create_employees_batch(
+    items: List[Dict[str, Any]] = Body(..., example=[{"name": "张三", "email": "zhangsan@example.com", "department": "技术部", "position": "工程师"}]),
+    upsert: bool = Query(False, description="邮箱已存在时更新该员工"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 批量创建或按邮箱 upsert 员工。
+    @details 每条数据单独校验，校验失败的数据不影响其余数据；全部写入作为一个写操作在同一事务中完成，
+             开启 WRITE_COALESCING 时与其他写操作合并提交。同一批次内邮箱重复时，创建模式保留第一条，upsert 模式保留最后一条。
+    @param items 员工数据列表，字段同 EmployeeCreate。
+    @param upsert 是否更新已存在的员工。
+    @param db 数据库会话。
+    @return List[BatchItemResult] 与请求顺序一致的逐条处理结果。
     """
-    db_employee = EmployeeDB(**employee_in.model_dump())
-    db.add(db_employee)
-    await db.commit()
-    await db.refresh(db_employee)
-    return db_employee.to_pydantic()
+    results: List[Optional[BatchItemResult]] = [None] * len(items)
+    valid: Dict[str, Tuple[int, EmployeeCreate]] = {}
+    for index, raw in enumerate(items):
+        try:
+            employee = EmployeeCreate.model_validate(raw)
+        except ValidationError as e:
+            results[index] = BatchItemResult.invalid(index, e)
+            continue
+
+        previous = valid.get(employee.email)
+        if previous is None:
+            valid[employee.email] = (index, employee)
+        elif upsert:
+            results[previous[0]] = BatchItemResult(index=previous[0], status="duplicate", detail=f"superseded by item {index}")
+            valid[employee.email] = (index, employee)
+        else:
+            results[index] = BatchItemResult(index=index, status="conflict", detail=f"duplicate email of item {previous[0]}")
+
+    async def write(session: AsyncSession) -> List[Tuple[int, str, Optional[Dict[str, Any]]]]:
+        return await write_employees(session, list(valid.values()), upsert)
+
+    written: Dict[str, List[Dict[str, Any]]] = {"created": [], "updated": []}
+    for index, status, row in await run_write(db, write):
+        if row is None:
+            results[index] = BatchItemResult(index=index, status=status, detail="email already exists")
+        else:
+            results[index] = BatchItemResult(index=index, status=status, id=row["id"])
+            written[status].append(row)
+
+    await cache.delete(*(entity_key("employee", row["id"]) for row in written["updated"]))
+    for status, rows in written.items():
+        if rows:
+            events.publish(f"employee.{status}", {"items": rows})
+    return results
+
+@router.get("/export")
+async def export_employees(
+    format: Literal["csv", "ndjson"] = Query("csv", description="导出格式"),
+    gzip: bool = Query(False, description="以 gzip 文件返回"),
+):
+    """!
+    @brief 流式导出全部员工，按 ID 排序。
+    @details 沿主键分批读取，边读边发送，内存占用与员工数无关（见 app.core.exports）。
+             导出的 CSV 可直接经 /import 重新导入，多出的 id 等列被忽略。
+    @param format 导出格式。
+    @param gzip 是否以 gzip 文件返回。
+    @return StreamingResponse 员工表各列的 CSV 或 NDJSON 附件。
+    """
+    query = select(*EmployeeDB.__table__.columns).order_by(EmployeeDB.id)
+    return export_response(AsyncSessionLocal, query, format, "employees", gzip)
+
+def import_status(request: Request, job: ImportJob) -> ImportJobStatus:
+    """!
+    @brief 导入任务的进度与结果，附带错误报告的下载地址。
+    @param request FastAPI 请求对象，用于生成下载地址。
+    @param job 导入任务。
+    @return ImportJobStatus 导入任务的进度与结果。
+    """
+    return job.to_pydantic(str(request.url_for("get_employee_import_errors", job_id=job.id)))
+
+def import_event(job: ImportJob) -> Dict[str, Any]:
+    """!
+    @brief employee.imported 事件的数据：任务 ID、状态与计数，不含写入的行。
+    @param job 导入任务。
+    @return Dict[str, Any] 事件数据。
+    """
+    return {"id": job.id, "status": job.status, "chunks": job.chunks, **job.counts}
+
+@router.post("/import", response_model=ImportJobStatus)
+async def import_employees_stream(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="数据格式，不传则按 Content-Type 判断"),
+    upsert: bool = Query(True, description="邮箱已存在时更新该员工"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 从请求体流式导入员工，格式为 CSV（首行为列名）或 NDJSON，字段同 EmployeeCreate。
+    @details 请求体边接收边解析，不整体读入内存；每 IMPORT_CHUNK_SIZE 条有效数据写入并提交一次事务（见 app.models.importer）。
+             每提交一个事务发布一条 employee.imported 进度事件，导入过程中也可用 GET /imports/{job_id} 查询进度；
+             未写入的行列在 errors_url 指向的 CSV 错误报告中。事件中不含写入的行，客户端在导入结束后重新加载员工列表。
+    @param request FastAPI 请求对象，从中读取请求体流。
+    @param format 数据格式。
+    @param upsert 是否更新已存在的员工。
+    @param db 数据库会话。
+    @return ImportJobStatus 导入结果。
+    @exception HTTPException 如果无法判断数据格式 (415)，或数据流无法继续解析 (422，detail 中附带已提交部分的导入结果)。
+    """
+    if format is None:
+        format = IMPORT_FORMATS.get(request.headers.get("content-type", "").split(";")[0].strip().lower())
+        if format is None:
+            raise HTTPException(status_code=415, detail="Unsupported import format, use text/csv or application/x-ndjson")
+
+    async def after_chunk(job: ImportJob, written: Dict[str, List[Dict[str, Any]]]) -> None:
+        await cache.delete(*(entity_key("employee", row["id"]) for row in written["updated"]))
+        events.publish("employee.imported", import_event(job))
+
+    job = imports.start(format, upsert)
+    try:
+        await import_employees(db, request.stream(), job, after_chunk)
+    except ImportFormatError:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": job.error, "import": jsonable_encoder(import_status(request, job))}
+        )
+    finally:
+        events.publish("employee.imported", import_event(job))
+    return import_status(request, job)
+
+@router.get("/imports/{job_id}", response_model=ImportJobStatus)
+async def get_employee_import(job_id: str, request: Request):
+    """!
+    @brief 获取导入任务的进度与结果。
+    @param job_id 导入任务 ID。
+    @param request FastAPI 请求对象。
+    @return ImportJobStatus 导入任务的进度与结果。
+    @exception HTTPException 如果任务不存在或已被清理 (404)。
+    """
+    job = imports.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return import_status(request, job)
+
+@router.get("/imports/{job_id}/errors")
+async def get_employee_import_errors(job_id: str):
+    """!
+    @brief 下载导入任务的 CSV 错误报告，列为 line、status、email、detail。
+    @details 导入过程中下载时只包含已提交事务中的未写入行。
+    @param job_id 导入任务 ID。
+    @return FileResponse 错误报告文件。
+    @exception HTTPException 如果任务不存在或已被清理 (404)。
+    """
+    job = imports.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return FileResponse(job.report_path, media_type="text/csv", filename=f"employee-import-{job.id}-errors.csv")
 
 @router.get("/{employee_id}", response_model=Employee)
 async def get_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
     """!
     @brief 获取指定 ID 的员工信息。
+    @details 经过读缓存；未命中时读取数据库后回填，读取期间该员工被修改或删除则不回填（见 app.core.cache）。
     @param employee_id 要获取的员工的 ID。
     @param db 数据库会话。
     @return Employee 指定 ID 的员工对象。
     """
-    db_employee = await db.get(EmployeeDB, employee_id)
-    if db_employee is None:
-        raise HTTPException(status_code=404, detail="Employee not found")
-    return db_employee.to_pydantic()
+    key = entity_key("employee", employee_id)
+    cached = await cache.get(key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    with cache.filling(key) as fill:
+        db_employee = await db.get(EmployeeDB, employee_id)
+        if db_employee is None:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        employee = db_employee.to_pydantic()
+        await fill(employee.model_dump_json())
+    return employee
 
 @router.put("/{employee_id}", response_model=Employee)
 async def update_employee(employee_id: int, employee_in: EmployeeUpdate, db: AsyncSession = Depends(get_db)):
@@ -54,31 +290,49 @@ async def update_employee(employee_id: int, employee_in: EmployeeUpdate, db: Asy
     @param employee_in EmployeeUpdate Pydantic 模型。
     @param db 数据库会话。
     @return Employee 更新后的员工对象。
+    @exception HTTPException 如果员工未找到 (404)，或新邮箱已被其他员工使用 (409)。
     """
-    db_employee = await db.get(EmployeeDB, employee_id)
-    if db_employee is None:
-        raise HTTPException(status_code=404, detail="Employee not found")
+    async def update(session: AsyncSession) -> Employee:
+        db_employee = await session.get(EmployeeDB, employee_id)
+        if db_employee is None:
+            raise HTTPException(status_code=404, detail="Employee not found")
 
-    update_data = employee_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_employee, key, value)
+        update_data = employee_in.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_employee, key, value)
+        await flush_unique_email(session)
+        await session.refresh(db_employee)
+        return db_employee.to_pydantic()
 
-    await db.commit()
-    await db.refresh(db_employee)
-    return db_employee.to_pydantic()
+    employee = await run_write(db, update)
+    await cache.delete(entity_key("employee", employee_id))
+    events.publish("employee.updated", {"items": [employee.model_dump(mode="json")]})
+    return employee
 
 @router.delete("/{employee_id}", response_model=dict)
 async def delete_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
     """!
     @brief 删除指定 ID 的员工。
+    @details 删除前释放该员工占用的会议名额，空出的名额按候补顺序补位。
+             employee.deleted 事件隐含该员工的全部预定与候补一并删除。
     @param employee_id 要删除的员工的 ID。
     @param db 数据库会话。
     @return dict 包含成功消息的 dictionary。
     """
-    db_employee = await db.get(EmployeeDB, employee_id)
-    if db_employee is None:
-        raise HTTPException(status_code=404, detail="Employee not found")
+    async def remove(session: AsyncSession) -> Dict[int, List[int]]:
+        db_employee = await session.get(EmployeeDB, employee_id)
+        if db_employee is None:
+            raise HTTPException(status_code=404, detail="Employee not found")
+
+        promoted = await release_employee_seats(session, employee_id)
+        await session.delete(db_employee)
+        await bump_version(session, "employees")
+        return promoted
 
-    await db.delete(db_employee)
-    await db.commit()
+    promoted = await run_write(db, remove)
+    await cache.delete(entity_key("employee", employee_id))
+    for conference_id, employee_ids in promoted.items():
+        await cache.delete(entity_key("conference", conference_id))
+        publish_booking_changes(conference_id, booked=employee_ids, left_waitlist=employee_ids)
+    events.publish("employee.deleted", {"ids": [employee_id]})
     return {"message": f"Employee with id {employee_id} deleted successfully"} 
\ No newline at end of file
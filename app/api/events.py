@@ -0,0 +1,67 @@
+import time
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from app.core.config import EVENTS_HEARTBEAT_SECONDS, EVENTS_MAX_STREAM_SECONDS
+from app.core.events import events
+from app.core.responses import dumps
+
+router = APIRouter()
+
+# 客户端断线后的重连间隔（毫秒）
+RETRY_MS = 3000
+
+def format_event(event_id: str, event_type: str, data: Dict[str, Any]) -> bytes:
+    """!
+    @brief 按 SSE 格式编码一条事件。
+    @param event_id 事件 ID，客户端重连时通过 Last-Event-ID 回传。
+    @param event_type 事件类型。
+    @param data 事件数据。
+    @return bytes 以空行结尾的事件文本。
+    """
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event_type.encode(), dumps(data))
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Query(None, description="上次收到的事件 ID，浏览器重连时自动以 Last-Event-ID 请求头提供"),
+):
+    """!
+    @brief 以 Server-Sent Events 推送数据变更事件。
+    @details 新连接先收到 ready 事件，其 ID 为当前位置；之后按序号推送 conference.*、employee.*、room.*、
+             booking.*、waitlist.* 事件。携带 Last-Event-ID 重连时从该事件之后补发；
+             补发所需的事件已不在缓冲区中或 ID 无效时推送 reset 事件，客户端应重新加载完整列表。
+             连接保持 EVENTS_MAX_STREAM_SECONDS 秒后由服务端结束，浏览器的 EventSource 会自动重连并续传。
+    @param request FastAPI 请求对象，用于读取 Last-Event-ID 请求头。
+    @param last_event_id 上次收到的事件 ID，供无法设置请求头的客户端使用。
+    @return StreamingResponse text/event-stream 响应。
+    """
+    resume_from = request.headers.get("last-event-id") or last_event_id
+
+    async def generate():
+        deadline = time.monotonic() + EVENTS_MAX_STREAM_SECONDS
+        yield b"retry: %d\n\n" % RETRY_MS
+        cursor = events.last_seq
+        if resume_from is None:
+            yield format_event(events.event_id(cursor), "ready", {"seq": cursor})
+        else:
+            parsed = events.parse_event_id(resume_from)
+            if parsed is None:
+                yield format_event(events.event_id(cursor), "reset", {"seq": cursor})
+            else:
+                cursor = parsed
+
+        while not events.closed and time.monotonic() < deadline:
+            batch = events.since(cursor)
+            if batch is None:
+                cursor = events.last_seq
+                yield format_event(events.event_id(cursor), "reset", {"seq": cursor})
+            elif batch:
+                yield b"".join(format_event(events.event_id(event.seq), event.type, event.data) for event in batch)
+                cursor = batch[-1].seq
+            elif not await events.wait(min(EVENTS_HEARTBEAT_SECONDS, deadline - time.monotonic())):
+                yield b": keepalive\n\n"
+
+    return StreamingResponse(
+        generate(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,147 @@
+import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import MAX_PAGE_SIZE
+from app.core.events import events
+from app.core.pagination import apply_keyset, set_next_cursor
+from app.core.responses import rows_response
+from app.models.coalescer import run_write
+from app.models.conference import ConferenceDB
+from app.models.database import get_db
+from app.models.room import RoomDB
+from app.models.schedule import available_rooms_query, busy_intervals, free_slots
+from app.schemas.room import Room, RoomCreate, TimeSlot
+
+router = APIRouter()
+
+@router.get("/", response_model=List[Room])
+async def get_rooms(
+    after_id: Optional[int] = Query(None, ge=0, description="上一页最后一个会议室的 ID"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页条数，不传则返回全部"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取会议室列表，按 ID 游标分页。
+    @details 若还有下一页，在 X-Next-Cursor 响应头中返回下一页的 after_id。
+    @param after_id 上一页最后一个会议室的 ID。
+    @param limit 每页条数。
+    @param db 数据库会话。
+    @return List[Room] 会议室列表。
+    """
+    result = await db.execute(apply_keyset(select(*RoomDB.__table__.columns), RoomDB.id, after_id, limit))
+    rows = result.all()
+    response = rows_response(rows, result.keys())
+    set_next_cursor(response, rows, limit)
+    return response
+
+@router.post("/", response_model=Room, status_code=201)
+async def create_room(room_in: RoomCreate, db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 创建一个新的会议室。
+    @param room_in RoomCreate Pydantic 模型，包含新会议室的数据。
+    @param db 数据库会话。
+    @return Room 新创建的会议室对象。
+    @exception HTTPException 如果同名会议室已存在 (409)。
+    """
+    async def create(session: AsyncSession) -> Room:
+        if await session.scalar(select(RoomDB.id).where(RoomDB.name == room_in.name)) is not None:
+            raise HTTPException(status_code=409, detail="Room name already exists")
+        db_room = RoomDB(**room_in.model_dump())
+        session.add(db_room)
+        await session.flush()
+        await session.refresh(db_room)
+        return db_room.to_pydantic()
+
+    room = await run_write(db, create)
+    events.publish("room.created", {"items": [room.model_dump(mode="json")]})
+    return room
+
+@router.get("/available", response_model=List[Room])
+async def get_available_rooms(
+    date: datetime.date = Query(..., description="日期"),
+    start_time: datetime.time = Query(..., description="开始时间"),
+    end_time: datetime.time = Query(..., description="结束时间"),
+    min_capacity: Optional[int] = Query(None, ge=0, description="座位数下限"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取给定时段空闲的会议室。
+    @details 每个会议室沿 (room_id, date, start_time, end_time) 索引检测冲突，只读取该会议室当天的会议。
+    @param date 日期。
+    @param start_time 开始时间。
+    @param end_time 结束时间。
+    @param min_capacity 座位数下限，不限座位数的会议室总是满足。
+    @param db 数据库会话。
+    @return List[Room] 按 ID 排序的空闲会议室。
+    @exception HTTPException 如果结束时间不晚于开始时间 (422)。
+    """
+    if end_time <= start_time:
+        raise HTTPException(status_code=422, detail="end_time must be later than start_time")
+    result = await db.execute(available_rooms_query(date, start_time, end_time, min_capacity))
+    return rows_response(result.all(), result.keys())
+
+@router.get("/{room_id}", response_model=Room)
+async def get_room(room_id: int, db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 获取指定 ID 的会议室信息。
+    @param room_id 要获取的会议室的 ID。
+    @param db 数据库会话。
+    @return Room 指定 ID 的会议室对象。
+    @exception HTTPException 如果会议室未找到 (404)。
+    """
+    db_room = await db.get(RoomDB, room_id)
+    if db_room is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return db_room.to_pydantic()
+
+@router.get("/{room_id}/slots", response_model=List[TimeSlot])
+async def get_free_slots(
+    room_id: int,
+    date: datetime.date = Query(..., description="日期"),
+    day_start: datetime.time = Query(datetime.time(8, 0), description="可用时间窗口的开始"),
+    day_end: datetime.time = Query(datetime.time(20, 0), description="可用时间窗口的结束"),
+    min_minutes: int = Query(0, ge=0, le=24 * 60, description="空闲时段的最短分钟数"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取会议室某一天的空闲时段。
+    @details 沿 (room_id, date, start_time, end_time) 索引按开始时间读取当天的占用时段，无需排序，再计算其间的空闲时段。
+    @param room_id 会议室 ID。
+    @param date 日期。
+    @param day_start 可用时间窗口的开始。
+    @param day_end 可用时间窗口的结束。
+    @param min_minutes 空闲时段的最短分钟数。
+    @param db 数据库会话。
+    @return List[TimeSlot] 按时间排序的空闲时段。
+    @exception HTTPException 如果会议室未找到 (404)，或时间窗口无效 (422)。
+    """
+    if day_end <= day_start:
+        raise HTTPException(status_code=422, detail="day_end must be later than day_start")
+    if await db.get(RoomDB, room_id) is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    busy = await busy_intervals(db, room_id, date)
+    slots = free_slots(busy, day_start, day_end, datetime.timedelta(minutes=min_minutes))
+    return [TimeSlot(start_time=start, end_time=end) for start, end in slots]
+
+@router.delete("/{room_id}", response_model=dict)
+async def delete_room(room_id: int, db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 删除指定 ID 的会议室。
+    @param room_id 要删除的会议室的 ID。
+    @param db 数据库会话。
+    @return dict 包含成功消息的 dictionary。
+    @exception HTTPException 如果会议室未找到 (404)，或仍有会议使用该会议室 (409)。
+    """
+    async def remove(session: AsyncSession) -> None:
+        db_room = await session.get(RoomDB, room_id)
+        if db_room is None:
+            raise HTTPException(status_code=404, detail="Room not found")
+        if await session.scalar(select(ConferenceDB.id).where(ConferenceDB.room_id == room_id).limit(1)) is not None:
+            raise HTTPException(status_code=409, detail="Room is used by conferences")
+        await session.delete(db_room)
+
+    await run_write(db, remove)
+    events.publish("room.deleted", {"ids": [room_id]})
+    return {"message": f"Room with id {room_id} deleted successfully"}
@@ -0,0 +1,88 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import MAX_PAGE_SIZE
+from app.core.pagination import apply_keyset, set_next_cursor
+from app.core.responses import rows_response
+from app.models.conference import ConferenceDB
+from app.models.database import get_db
+from app.models.stats import department_stats_query, monthly_stats_query
+from app.schemas.stats import ConferenceAttendance, DepartmentStats, MonthlyStats
+
+router = APIRouter()
+
+# 会议统计返回的列
+ATTENDANCE_COLUMNS = (
+    ConferenceDB.id, ConferenceDB.name, ConferenceDB.date, ConferenceDB.capacity, ConferenceDB.booked_count
+)
+
+# 月份参数格式
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+@router.get("/departments", response_model=List[DepartmentStats])
+async def get_department_stats(db: AsyncSession = Depends(get_db)):
+    """!
+    @brief 获取各部门的员工数与预定数。
+    @details 读取随写入增量维护的汇总表（见 app.models.stats），不扫描预定表。
+    @param db 数据库会话。
+    @return List[DepartmentStats] 按部门名称排序的统计。
+    """
+    result = await db.execute(department_stats_query())
+    return rows_response(result.all(), result.keys())
+
+@router.get("/months", response_model=List[MonthlyStats])
+async def get_monthly_stats(
+    month_from: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="起始月份（含），如 2025-01"),
+    month_to: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="结束月份（含），如 2025-12"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取按会议月份统计的会议数与预定数。
+    @details 读取随写入增量维护的汇总表（见 app.models.stats），不扫描预定表。
+    @param month_from 起始月份。
+    @param month_to 结束月份。
+    @param db 数据库会话。
+    @return List[MonthlyStats] 按月份排序的统计。
+    """
+    result = await db.execute(monthly_stats_query(month_from, month_to))
+    return rows_response(result.all(), result.keys())
+
+@router.get("/conferences", response_model=List[ConferenceAttendance])
+async def get_conference_attendance(
+    after_id: Optional[int] = Query(None, ge=0, description="上一页最后一个会议的 ID"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="每页条数，不传则返回全部"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取每个会议的预定人数，按会议 ID 游标分页。
+    @details 预定人数即随预定增减维护的 booked_count，不对预定表计数。
+             若还有下一页，在 X-Next-Cursor 响应头中返回下一页的 after_id。
+    @param after_id 上一页最后一个会议的 ID。
+    @param limit 每页条数。
+    @param db 数据库会话。
+    @return List[ConferenceAttendance] 会议预定人数列表。
+    """
+    result = await db.execute(apply_keyset(select(*ATTENDANCE_COLUMNS), ConferenceDB.id, after_id, limit))
+    rows = result.all()
+    response = rows_response(rows, result.keys())
+    set_next_cursor(response, rows, limit)
+    return response
+
+@router.get("/conferences/top", response_model=List[ConferenceAttendance])
+async def get_top_conferences(
+    limit: int = Query(10, ge=1, le=100, description="返回的会议数"),
+    db: AsyncSession = Depends(get_db)
+):
+    """!
+    @brief 获取预定人数最多的会议。
+    @details 扫描一遍会议表，数据库在排序时只保留前 limit 个会议（不排序整张表），人数相同时 ID 大者在前。
+             booked_count 每次预定都会改写，不为排名单独建索引，避免增加预定路径上的写入。
+    @param limit 返回的会议数。
+    @param db 数据库会话。
+    @return List[ConferenceAttendance] 按预定人数降序排列的会议。
+    """
+    result = await db.execute(
+        select(*ATTENDANCE_COLUMNS).order_by(ConferenceDB.booked_count.desc(), ConferenceDB.id.desc()).limit(limit)
+    )
+    return rows_response(result.all(), result.keys())
@@ -0,0 +1,116 @@
+"""!
+@file cli.py
+@brief 命令行工具
+@details 提供数据库初始化、员工导入等运维命令，用法：python -m app.cli init-db、
+         python -m app.cli import-employees employees.csv
+@date 2025.5.25
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import AsyncIterator, BinaryIO, Optional
+
+# create_schema 返回的对象类型对应的输出
+SCHEMA_OBJECT_MESSAGES = {
+    "column": "已添加列",
+    "index": "已添加索引",
+    "dropped_index": "已删除索引",
+    "search_index": "已创建全文索引表",
+    "stats_table": "已重建汇总表",
+}
+
+async def init_db() -> None:
+    """!
+    @brief 创建数据库表，并为已存在的表补齐新增的列、索引、全文索引表和统计触发器。
+    """
+    from app.models.database import engine
+    from app.models.schema import create_schema
+    added = await create_schema(engine)
+    await engine.dispose()
+    for kind, name in added:
+        print(f"{SCHEMA_OBJECT_MESSAGES[kind]} {name}")
+    print("数据库表已初始化。")
+
+async def read_file(file: BinaryIO, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """!
+    @brief 分块读取文件，供流式导入使用。
+    @param file 以二进制模式打开的文件。
+    @param size 每块的字节数。
+    @return AsyncIterator[bytes] 数据块。
+    """
+    while True:
+        chunk = file.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+async def import_employees_file(path: str, format: Optional[str], upsert: bool, report_path: Optional[str]) -> int:
+    """!
+    @brief 从 CSV 或 NDJSON 文件流式导入员工，每提交一个事务输出一次进度。
+    @param path 文件路径，- 表示标准输入。
+    @param format 数据格式，不传则按扩展名判断。
+    @param upsert 是否更新已存在的员工。
+    @param report_path 错误报告路径，不传则写入临时目录。
+    @return int 进程退出码，导入终止时为 1。
+    """
+    from app.models.coalescer import coalescer
+    from app.models.database import AsyncSessionLocal, engine
+    from app.models.importer import ImportFormatError, ImportJob, import_employees
+
+    if format is None:
+        format = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            print("无法根据扩展名判断数据格式，请指定 --format。", file=sys.stderr)
+            return 2
+
+    async def progress(job: ImportJob, written) -> None:
+        counts = job.counts
+        print(f"已提交 {job.chunks} 个事务：解析 {counts['rows']} 行，新建 {counts['created']}，更新 {counts['updated']}，"
+              f"未写入 {counts['invalid'] + counts['conflict'] + counts['duplicate']}", file=sys.stderr)
+
+    job = ImportJob(format, upsert, report_path)
+    file = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        async with AsyncSessionLocal() as session:
+            await import_employees(session, read_file(file), job, progress)
+    except ImportFormatError:
+        pass
+    finally:
+        if file is not sys.stdin.buffer:
+            file.close()
+        if coalescer is not None:
+            await coalescer.close()
+        await engine.dispose()
+
+    counts = job.counts
+    print(f"导入{'完成' if job.error is None else '终止：' + job.error}。解析 {counts['rows']} 行，新建 {counts['created']}，"
+          f"更新 {counts['updated']}，校验失败 {counts['invalid']}，冲突 {counts['conflict']}，被覆盖 {counts['duplicate']}。")
+    print(f"错误报告：{job.report_path}")
+    return 0 if job.error is None else 1
+
+def main(argv=None) -> int:
+    """!
+    @brief 命令行入口。
+    @param argv 命令行参数，默认取 sys.argv。
+    @return int 进程退出码。
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="会议管理系统命令行工具")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("init-db", help="创建数据库表，并为已存在的表补齐新增的列和索引")
+    importer = subcommands.add_parser("import-employees", help="从 CSV 或 NDJSON 文件流式导入员工，邮箱已存在时更新")
+    importer.add_argument("path", help="文件路径，- 表示标准输入")
+    importer.add_argument("--format", choices=["csv", "ndjson"], help="数据格式，默认按扩展名判断")
+    importer.add_argument("--no-upsert", dest="upsert", action="store_false", help="邮箱已存在时不更新，记为冲突")
+    importer.add_argument("--errors", help="错误报告路径，默认写入临时目录")
+
+    args = parser.parse_args(argv)
+    if args.command == "init-db":
+        asyncio.run(init_db())
+    elif args.command == "import-employees":
+        return asyncio.run(import_employees_file(args.path, args.format, args.upsert, args.errors))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
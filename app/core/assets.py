@@ -0,0 +1,105 @@
+"""!
+@file assets.py
+@brief 静态资源指纹模块
+@details 为 static 与 source 目录下的文件计算内容摘要，生成带指纹的文件名（如 bg.3f2a9c1d0b7e.png）。
+         页面通过 asset_url() 引用带指纹的地址，这类地址的内容永不改变，响应带一年的 immutable 缓存头，
+         重复访问无需任何请求；文件内容变化后指纹随之变化，页面自然引用到新地址。
+         摘要在首次用到某个文件时才计算并缓存（asset_url() 或请求其带指纹的地址），导入时不读取任何文件。
+         不带指纹的原始地址仍可访问，响应带 no-cache，由 ETag 重新验证。
+@date 2025.5.25
+"""
+
+import hashlib
+import re
+import stat
+from pathlib import Path, PurePosixPath
+from typing import Dict, Optional
+from fastapi.staticfiles import StaticFiles
+from app.core.config import BASE_DIR
+
+# 带指纹地址的缓存策略：内容与地址一一对应，可以永久缓存
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 带指纹的文件名：原文件名的主干、12 位十六进制摘要与扩展名
+HASHED_NAME = re.compile(r"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{12})(?P<suffix>\.[^.]*)?$")
+
+class HashedStaticFiles(StaticFiles):
+    """!
+    @brief 同时提供原始文件名和带指纹文件名的静态文件应用。
+    """
+
+    def __init__(self, directory: Path, mount_path: str):
+        super().__init__(directory=directory)
+        self.mount_path = mount_path.rstrip("/")
+        # 已计算的摘要，键为相对于目录的文件路径；不存在的文件不缓存，任意请求路径不会使其增长
+        self.digests: Dict[str, str] = {}
+
+    def digest(self, path: str) -> Optional[str]:
+        """!
+        @brief 获取文件内容的摘要，首次调用时读取文件并缓存。
+        @param path 相对于目录的文件路径。
+        @return Optional[str] 12 位十六进制摘要，文件不存在或不在目录内时为 None。
+        """
+        digest = self.digests.get(path)
+        if digest is None:
+            full_path, stat_result = self.lookup_path(path)
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                return None
+            digest = self.digests[path] = hashlib.sha256(Path(full_path).read_bytes()).hexdigest()[:12]
+        return digest
+
+    def url(self, path: str) -> str:
+        """!
+        @brief 获取文件带指纹的地址。
+        @param path 相对于目录的文件路径。
+        @return str 带指纹的地址，文件不存在时为原始地址。
+        """
+        digest = self.digest(path)
+        if digest is None:
+            return f"{self.mount_path}/{path}"
+        relative = PurePosixPath(path)
+        return f"{self.mount_path}/{relative.with_name(f'{relative.stem}.{digest}{relative.suffix}')}"
+
+    def original(self, path: str) -> Optional[str]:
+        """!
+        @brief 由带指纹的路径得到原始文件路径。
+        @param path 请求的文件路径。
+        @return Optional[str] 原始文件路径；不是带指纹的路径或摘要与文件当前内容不符时为 None。
+        """
+        relative = PurePosixPath(path)
+        match = HASHED_NAME.match(relative.name)
+        if match is None:
+            return None
+        original = relative.with_name(match["stem"] + (match["suffix"] or "")).as_posix()
+        return original if self.digest(original) == match["digest"] else None
+
+    async def get_response(self, path: str, scope):
+        """!
+        @brief 返回文件并按地址是否带指纹设置 Cache-Control。
+        @param path 请求的文件路径。
+        @param scope ASGI scope。
+        @return Response 文件响应。
+        """
+        original = self.original(PurePosixPath(path).as_posix())
+        if original is not None:
+            response = await super().get_response(original, scope)
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response = await super().get_response(path, scope)
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+# 挂载点到静态文件应用的映射
+ASSET_MOUNTS: Dict[str, HashedStaticFiles] = {
+    "static": HashedStaticFiles(BASE_DIR / "static", "/static"),
+    "source": HashedStaticFiles(BASE_DIR / "source", "/source"),
+}
+
+def asset_url(path: str) -> str:
+    """!
+    @brief 获取静态资源带指纹的地址，供模板使用。
+    @param path 形如 source/bg.png 的路径，第一段为挂载点。
+    @return str 形如 /source/bg.3f2a9c1d0b7e.png 的地址。
+    """
+    mount, _, relative = path.lstrip("/").partition("/")
+    return ASSET_MOUNTS[mount].url(relative)
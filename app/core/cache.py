@@ -0,0 +1,238 @@
+"""!
+@file cache.py
+@brief 单实体读缓存模块
+@details 提供可插拔的缓存后端：默认的进程内 LRU（带 TTL），以及兼容 Redis 协议的外部存储。
+         缓存值为实体序列化后的 JSON 字符串，命中时可直接作为响应体返回。
+         未命中时的回填经 filling() 进行：从数据库读取期间该键被 delete() 失效（写操作在读取之后提交）时，
+         读到的旧值不再写入缓存，避免旧值在 TTL 内一直被返回。在途的回填只在本进程内登记，
+         Redis 后端下其他进程的写操作与本进程回填之间的竞争仍由 TTL 兜底。
+@date 2025.5.25
+"""
+
+import contextlib
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+from app.core.config import CACHE_BACKEND, CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, CACHE_REDIS_URL
+
+class CacheFill:
+    """!
+    @brief 一次未命中后的回填，由 CacheBackend.filling() 创建。
+    """
+    __slots__ = ("backend", "key", "valid")
+
+    def __init__(self, backend: "CacheBackend", key: str):
+        self.backend = backend
+        self.key = key
+        # 读取期间键被失效时置为 False
+        self.valid = True
+
+    async def __call__(self, value: str) -> None:
+        """!
+        @brief 写入从数据库读到的值；读取期间键已被失效时不写入。
+        @param value 缓存值。
+        """
+        if self.valid:
+            await self.backend.set(self.key, value)
+
+class CacheBackend:
+    """!
+    @brief 缓存后端接口。
+    @details 所有后端都需统计命中、未命中和淘汰次数。子类的 delete() 需先调用 _invalidate_fills()。
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # 正在从数据库读取的键 -> 在途的回填
+        self._fills: Dict[str, List[CacheFill]] = {}
+
+    @contextlib.contextmanager
+    def filling(self, key: str) -> Iterator[CacheFill]:
+        """!
+        @brief 登记一次回填，应在未命中后、读取数据库之前进入。
+        @param key 缓存键。
+        @yields CacheFill 以读到的值调用即写入缓存。
+        """
+        fill = CacheFill(self, key)
+        fills = self._fills.setdefault(key, [])
+        fills.append(fill)
+        try:
+            yield fill
+        finally:
+            fills.remove(fill)
+            if not fills:
+                del self._fills[key]
+
+    def _invalidate_fills(self, keys) -> None:
+        """!
+        @brief 作废这些键上在途的回填。
+        @param keys 被删除的缓存键。
+        """
+        for key in keys:
+            for fill in self._fills.get(key, ()):
+                fill.valid = False
+
+    async def get(self, key: str) -> Optional[str]:
+        """!
+        @brief 读取缓存。
+        @param key 缓存键。
+        @return Optional[str] 缓存值，不存在或已过期时返回 None。
+        """
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str) -> None:
+        """!
+        @brief 写入缓存。
+        @param key 缓存键。
+        @param value 缓存值。
+        """
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        """!
+        @brief 删除缓存，用于写操作后的失效。
+        @param keys 要删除的缓存键。
+        """
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """!
+        @brief 获取缓存统计信息。
+        @return Dict[str, int] 命中、未命中和淘汰次数。
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+class NullCacheBackend(CacheBackend):
+    """!
+    @brief 不缓存任何内容的后端，用于关闭缓存。
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        self._invalidate_fills(keys)
+
+class LRUCacheBackend(CacheBackend):
+    """!
+    @brief 进程内 LRU 缓存，每个条目带有 TTL。
+    @details 超出容量时淘汰最久未使用的条目；过期条目在读取时移除，同样计入淘汰次数。
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        self._invalidate_fills(keys)
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        stats["size"] = len(self._entries)
+        return stats
+
+class RedisCacheBackend(CacheBackend):
+    """!
+    @brief 基于 Redis 协议的外部缓存后端。
+    @details 需要安装 redis 包（redis.asyncio）。过期由服务端 TTL 负责，淘汰次数无法在客户端统计。
+             访问出错时按未命中处理，不影响请求本身。
+    """
+
+    def __init__(self, url: str, ttl: float, prefix: str = "conference:"):
+        super().__init__()
+        import redis.asyncio as redis
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception:
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(self, key: str, value: str) -> None:
+        try:
+            await self.client.set(self.prefix + key, value, px=int(self.ttl * 1000))
+        except Exception:
+            self.errors += 1
+
+    async def delete(self, *keys: str) -> None:
+        self._invalidate_fills(keys)
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self.prefix + key for key in keys))
+        except Exception:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        stats["errors"] = self.errors
+        return stats
+
+def create_cache(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """!
+    @brief 根据配置创建缓存后端。
+    @param backend 后端名称：memory、redis 或 none。
+    @return CacheBackend 缓存后端实例。
+    @exception ValueError 未知的后端名称。
+    """
+    if backend == "memory":
+        return LRUCacheBackend(CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS)
+    if backend == "redis":
+        return RedisCacheBackend(CACHE_REDIS_URL, CACHE_TTL_SECONDS)
+    if backend == "none":
+        return NullCacheBackend()
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+def entity_key(kind: str, entity_id: int) -> str:
+    """!
+    @brief 生成实体缓存键。
+    @param kind 实体类型，如 conference、employee。
+    @param entity_id 实体 ID。
+    @return str 缓存键。
+    """
+    return f"{kind}:{entity_id}"
+
+# 全局缓存实例
+cache = create_cache()
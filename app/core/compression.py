@@ -0,0 +1,181 @@
+"""!
+@file compression.py
+@brief 响应压缩模块
+@details 按请求的 Accept-Encoding 选择 brotli（安装 brotli 包时）或 gzip 压缩响应体。
+         只压缩状态码为 200 的文本类响应：已编码的响应、部分内容（206 或带 Content-Range）、图片等二进制内容、
+         事件流以及小于阈值的完整响应原样返回。
+         分块发送的流式响应（如 NDJSON）逐块压缩并立即刷新，不会因压缩而被缓冲到结束。
+@date 2025.5.25
+"""
+
+import zlib
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 可压缩的媒体类型前缀
+COMPRESSIBLE_TYPES: Tuple[str, ...] = (
+    "text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml",
+)
+
+# 需要逐条实时送达、不做压缩的媒体类型
+EXCLUDED_TYPES: Tuple[str, ...] = ("text/event-stream",)
+
+def available_encodings() -> Tuple[str, ...]:
+    """!
+    @brief 服务端支持的编码，按优先级排列。
+    @return Tuple[str, ...] 编码名称。
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """!
+    @brief 按 Accept-Encoding 选择压缩编码。
+    @param accept_encoding 请求头的值，如 "gzip, deflate, br;q=0.9"。
+    @return Optional[str] "br"、"gzip"，客户端不接受任何一种时为 None。
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    for encoding in available_encodings():
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+def is_compressible(headers: Headers) -> bool:
+    """!
+    @brief 判断响应是否适合压缩。
+    @param headers 响应头。
+    @return bool 未编码的文本类响应返回 True。
+    """
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(EXCLUDED_TYPES)
+
+class Compressor:
+    """!
+    @brief 单个响应的增量压缩器。
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._gzip = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        """!
+        @brief 压缩一块数据。
+        @param data 原始数据。
+        @param flush 是否立即输出已压缩的全部数据，流式响应的每一块都需要刷新。
+        @return bytes 压缩后的数据，可能为空。
+        """
+        if self.encoding == "br":
+            output = self._brotli.process(data)
+            return output + self._brotli.flush() if flush else output
+        output = self._gzip.compress(data)
+        return output + self._gzip.flush(zlib.Z_SYNC_FLUSH) if flush else output
+
+    def finish(self) -> bytes:
+        """!
+        @brief 结束压缩流。
+        @return bytes 剩余的压缩数据。
+        """
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._gzip.flush(zlib.Z_FINISH)
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """!
+    @brief 一次性压缩完整的数据。
+    @param data 原始数据。
+    @param encoding "br" 或 "gzip"。
+    @return bytes 压缩后的数据。
+    """
+    compressor = Compressor(encoding)
+    return compressor.compress(data) + compressor.finish()
+
+class CompressionMiddleware:
+    """!
+    @brief 压缩响应体的 ASGI 中间件。
+    @details 等到第一块响应体才决定是否压缩：完整响应按阈值判断，流式响应一律压缩。
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if (
+                    start_message["status"] != 200
+                    or "content-range" in headers
+                    or not is_compressible(headers)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+
+            if more_body:
+                await send({"type": "http.response.body", "body": compressor.compress(body, flush=True), "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.compress(body) + compressor.finish()})
+
+        await self.app(scope, receive, send_wrapper)
@@ -6,14 +6,89 @@
 """
 
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
+def env_bool(name: str, default: bool) -> bool:
+    """!
+    @brief 读取布尔型环境变量。
+    @param name 环境变量名。
+    @param default 未设置时的默认值。
+    @return bool 取值为 1/true/yes/on（不区分大小写）时为 True。
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 # 数据库配置
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./conference.db")
 
+# 引擎与连接池配置（默认值面向生产环境：不打印 SQL）
+DB_ECHO = env_bool("DB_ECHO", False)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite 连接参数，每个新连接建立时以 PRAGMA 形式设置
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# 写操作合并提交（见 app.models.coalescer）：开启后预定、取消及会议、员工的增删改由一个写入任务
+# 收集 WRITE_BATCH_WINDOW_MS 毫秒内至多 WRITE_BATCH_MAX_SIZE 个写操作，合并为一个事务提交
+WRITE_COALESCING = env_bool("WRITE_COALESCING", False)
+WRITE_BATCH_MAX_SIZE = int(os.getenv("WRITE_BATCH_MAX_SIZE", "64"))
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "2"))
+
+# 启动时自动建表（仅用于开发环境，生产环境请使用 python -m app.cli init-db）
+AUTO_CREATE_SCHEMA = env_bool("AUTO_CREATE_SCHEMA", False)
+
+# 项目根目录，用于定位 static、source 和 templates 目录
+BASE_DIR = Path(__file__).resolve().parents[2]
+
 # 应用配置
 APP_TITLE = "会议管理系统"
-APP_DESCRIPTION = "简易的会议管理系统 API" 
\ No newline at end of file
+APP_DESCRIPTION = "简易的会议管理系统 API"
+
+# 列表分页配置
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+
+# 批量写入配置（单条 SQL 中的最大参数行数，需低于 SQLite 变量上限）
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "500"))
+
+# 员工流式导入配置（每 IMPORT_CHUNK_SIZE 条有效数据提交一次事务；单行超过 IMPORT_MAX_LINE_LENGTH 个字符时终止导入；
+# 进程内保留最近 IMPORT_JOBS_KEPT 个导入任务的进度与错误报告，报告写入 IMPORT_REPORT_DIR，默认为系统临时目录）
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "5000"))
+IMPORT_MAX_LINE_LENGTH = int(os.getenv("IMPORT_MAX_LINE_LENGTH", str(1024 * 1024)))
+IMPORT_JOBS_KEPT = int(os.getenv("IMPORT_JOBS_KEPT", "20"))
+IMPORT_REPORT_DIR = os.getenv("IMPORT_REPORT_DIR") or None
+
+# 单实体读缓存配置（CACHE_BACKEND 可选 memory、redis、none）
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+# 日志配置（DB_SESSION_LOG_SAMPLE_RATE 为会话明细日志的采样比例，错误日志始终输出）
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+DB_SESSION_LOG_LEVEL = os.getenv("DB_SESSION_LOG_LEVEL", "INFO")
+DB_SESSION_LOG_SAMPLE_RATE = float(os.getenv("DB_SESSION_LOG_SAMPLE_RATE", "0.01"))
+
+# 响应压缩配置（小于 COMPRESSION_MIN_SIZE 字节的完整响应不压缩；安装 brotli 包后优先使用 brotli）
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+# 变更事件推送配置（缓冲区内的事件可在断线重连后补发；空闲时按心跳间隔发送注释行保持连接；
+# 单个连接最长保持 EVENTS_MAX_STREAM_SECONDS 秒后结束，由客户端带 Last-Event-ID 自动重连，避免长连接阻塞服务器平滑关闭）
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "10000"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_MAX_STREAM_SECONDS = float(os.getenv("EVENTS_MAX_STREAM_SECONDS", "300"))
@@ -0,0 +1,61 @@
+"""!
+@file etag.py
+@brief 条件请求工具模块
+@details 构造弱 ETag 与 Last-Modified 响应头，并处理 If-None-Match / If-Modified-Since，
+         命中时返回 304，使未变化的集合只消耗一次聚合查询。
+@date 2025.5.25
+"""
+
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+from fastapi import Request
+
+def weak_etag(*parts) -> str:
+    """!
+    @brief 由若干状态值生成弱 ETag。
+    @param parts 参与计算的状态值，例如行数、版本号、最后修改时间和查询参数。
+    @return str 形如 W/"..." 的弱 ETag。
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+def validator_headers(etag: str, last_modified: Optional[datetime.datetime]) -> Dict[str, str]:
+    """!
+    @brief 生成缓存校验相关的响应头。
+    @details 使用 no-cache 让浏览器每次都带上校验头重新验证，未变化时由 304 复用本地副本。
+    @param etag 弱 ETag。
+    @param last_modified 最后修改时间（UTC，不带时区）。
+    @return Dict[str, str] 响应头。
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=datetime.timezone.utc), usegmt=True)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime.datetime]) -> bool:
+    """!
+    @brief 判断请求携带的校验信息是否与当前状态一致。
+    @details If-None-Match 优先；只有未携带 If-None-Match 时才比较 If-Modified-Since。
+    @param request FastAPI 请求对象。
+    @param etag 当前的弱 ETag。
+    @param last_modified 当前的最后修改时间（UTC，不带时区）。
+    @return bool 一致时返回 True，应响应 304。
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = etag.removeprefix("W/")
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or current in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is not None:
+        since = since.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return last_modified.replace(microsecond=0) <= since
@@ -0,0 +1,149 @@
+"""!
+@file events.py
+@brief 数据变更事件总线模块
+@details 写操作提交后发布紧凑的变更事件（类型与受影响的数据），事件按递增序号保存在固定长度的环形缓冲区中，
+         由 /api/events 以 Server-Sent Events 推送给客户端。客户端断线重连时通过 Last-Event-ID
+         从上次收到的序号之后继续；序号已不在缓冲区中（或服务重启过）时收到 reset 事件，需重新加载完整列表。
+         事件类型为 conference.created/updated（data.items 为完整的行）、conference.deleted（data.ids），
+         employee.* 同理，流式导入每提交一个事务另发布 employee.imported（data 为导入任务的状态与计数，不含写入的行）；
+         会议室为 room.created、room.deleted；预定相关为 booking.created/deleted、waitlist.added/removed（data 为会议 ID 与员工 ID 列表）。
+         总线位于进程内，多工作进程部署时每个进程只推送本进程处理的写操作。
+@date 2025.5.25
+"""
+
+import asyncio
+import collections
+import itertools
+import uuid
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence
+from app.core.config import EVENTS_BUFFER_SIZE
+
+class ChangeEvent(NamedTuple):
+    """!
+    @brief 一条变更事件。
+    @details type 形如 conference.created、booking.deleted；data 为客户端增量更新所需的字段。
+    """
+    seq: int
+    type: str
+    data: Dict[str, Any]
+
+class EventBus:
+    """!
+    @brief 进程内的变更事件总线。
+    """
+
+    def __init__(self, buffer_size: int = EVENTS_BUFFER_SIZE):
+        # 进程标识，写入事件 ID，使服务重启后旧的序号不会被误认为有效
+        self.epoch = uuid.uuid4().hex[:8]
+        self._buffer: Deque[ChangeEvent] = collections.deque(maxlen=buffer_size)
+        self._seq = 0
+        self._changed = asyncio.Event()
+        self.closed = False
+
+    @property
+    def last_seq(self) -> int:
+        """!
+        @brief 最近一条事件的序号，尚无事件时为 0。
+        """
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        """!
+        @brief 生成 SSE 事件 ID。
+        @param seq 事件序号。
+        @return str 形如 epoch:seq 的 ID。
+        """
+        return f"{self.epoch}:{seq}"
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """!
+        @brief 解析客户端回传的 Last-Event-ID。
+        @param event_id event_id() 生成的 ID。
+        @return Optional[int] 本进程内的序号；ID 无效、来自其他进程或超出当前序号时为 None。
+        """
+        epoch, _, seq = (event_id or "").partition(":")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        return int(seq)
+
+    def publish(self, type: str, data: Dict[str, Any]) -> ChangeEvent:
+        """!
+        @brief 发布一条事件并唤醒所有订阅者。
+        @details 应在事务提交之后调用，使客户端收到事件时数据已可见。
+        @param type 事件类型。
+        @param data 事件数据，需可编码为 JSON。
+        @return ChangeEvent 发布的事件。
+        """
+        self._seq += 1
+        event = ChangeEvent(self._seq, type, data)
+        self._buffer.append(event)
+        self._wake()
+        return event
+
+    def since(self, seq: int) -> Optional[List[ChangeEvent]]:
+        """!
+        @brief 获取指定序号之后的事件。
+        @param seq 已收到的最后一条事件的序号。
+        @return Optional[List[ChangeEvent]] 按序号排列的事件；其中一部分已被缓冲区淘汰时为 None。
+        """
+        if seq >= self._seq:
+            return []
+        first = self._buffer[0].seq if self._buffer else self._seq + 1
+        if seq + 1 < first:
+            return None
+        return list(itertools.islice(self._buffer, seq + 1 - first, None))
+
+    async def wait(self, timeout: float) -> bool:
+        """!
+        @brief 等待新事件。
+        @param timeout 最长等待时间（秒）。
+        @return bool 有新事件或总线关闭时为 True，超时为 False。
+        """
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def close(self) -> None:
+        """!
+        @brief 关闭总线，结束所有订阅，应用关闭时调用。
+        """
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        """!
+        @brief 唤醒当前所有等待者，并为之后的等待换上新的 asyncio.Event。
+        """
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+# 全局事件总线
+events = EventBus()
+
+def publish_booking_changes(
+    conference_id: int,
+    booked: Sequence[int] = (),
+    cancelled: Sequence[int] = (),
+    waitlisted: Sequence[int] = (),
+    left_waitlist: Sequence[int] = (),
+) -> None:
+    """!
+    @brief 发布一个会议的预定与候补变化，员工 ID 为空的类型不发布。
+    @details 候补转为正式预定的员工同时出现在 booked 与 left_waitlist 中。
+    @param conference_id 会议 ID。
+    @param booked 新增正式预定的员工 ID（booking.created）。
+    @param cancelled 取消正式预定的员工 ID（booking.deleted）。
+    @param waitlisted 加入候补名单的员工 ID（waitlist.added）。
+    @param left_waitlist 离开候补名单的员工 ID（waitlist.removed）。
+    """
+    for event_type, employee_ids in (
+        ("booking.deleted", cancelled),
+        ("waitlist.removed", left_waitlist),
+        ("booking.created", booked),
+        ("waitlist.added", waitlisted),
+    ):
+        if employee_ids:
+            events.publish(event_type, {"conference_id": conference_id, "employee_ids": list(employee_ids)})
@@ -0,0 +1,212 @@
+"""!
+@file exports.py
+@brief 流式导出模块
+@details 在独立会话中通过 AsyncSession.stream() 分批读取查询结果，每批编码为 CSV、NDJSON 或 iCalendar 后立即作为一个分块发送，
+         内存占用只与批大小（STREAM_CHUNK_SIZE）有关，与表大小无关，客户端收到响应头后即可开始读取。
+         gzip 为真时响应体本身是 gzip 文件（application/gzip），逐批压缩并刷新；否则按 Accept-Encoding 由
+         CompressionMiddleware 在传输时压缩。
+@date 2025.5.25
+"""
+
+import csv
+import datetime
+import io
+from typing import AsyncIterator, Callable, List, Optional, Sequence
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, Select
+from sqlalchemy.engine import Row
+from app.core.compression import Compressor
+from app.core.config import STREAM_CHUNK_SIZE
+from app.core.pagination import NDJSON_MEDIA_TYPE
+from app.core.responses import dumps, row_dicts
+
+# 导出格式对应的媒体类型与扩展名
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": (NDJSON_MEDIA_TYPE, "ndjson"),
+    "ical": ("text/calendar; charset=utf-8", "ics"),
+}
+
+# 编码一批行的函数：(列名, 行) -> 字节串
+Encoder = Callable[[List[str], Sequence[Row]], bytes]
+
+def _csv_records(*rows: Sequence) -> bytes:
+    """!
+    @brief 把若干行原样编码为 CSV 记录。
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\r\n").writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+def csv_encoder(query: Select) -> Encoder:
+    """!
+    @brief 构造把一批行编码为 CSV 记录（不含列名行）的函数。
+    @details 日期时间列按 ISO 8601 输出，与 JSON 输出一致；日期与时间列的 str() 即 ISO 8601，
+             其余的值交给 csv.writer 原样写出（None 为空字符串），不逐个检查类型。
+    @param query 要导出的查询，用于确定日期时间列。
+    @return Encoder 编码函数，输出 UTF-8 字节串。
+    """
+    datetime_columns = [index for index, column in enumerate(query.selected_columns) if isinstance(column.type, DateTime)]
+
+    def encode(keys: List[str], rows: Sequence[Row]) -> bytes:
+        if datetime_columns:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for index in datetime_columns:
+                    if row[index] is not None:
+                        row[index] = row[index].isoformat()
+        return _csv_records(*rows)
+
+    return encode
+
+def encode_ndjson(keys: List[str], rows: Sequence[Row]) -> bytes:
+    """!
+    @brief 把一批行编码为 NDJSON，每行一个对象。
+    @param keys 列名。
+    @param rows 行。
+    @return bytes NDJSON 字节串。
+    """
+    return b"".join(dumps(row) + b"\n" for row in row_dicts(rows, keys))
+
+def _ical_text(value: Optional[str]) -> str:
+    """!
+    @brief 按 RFC 5545 转义文本属性值。
+    """
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+def _ical_line(line: str) -> str:
+    """!
+    @brief 把一行内容按 75 字节折行（续行以空格开头），不拆开 UTF-8 字符，行尾为 CRLF。
+    """
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+    parts, current, size = [], "", 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > 75:
+            parts.append(current)
+            current, size = " ", 1
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n".join(parts) + "\r\n"
+
+def encode_ical_events(keys: List[str], rows: Sequence[Row]) -> bytes:
+    """!
+    @brief 把一批会议编码为 VEVENT。
+    @details 行需包含会议表的 id、name、date、location、description、start_time、end_time、updated_at 列，
+             以及可选的 room_name（与地点不同时附在地点之后）。有起止时间的会议以不带时区的本地时间表示，否则为全天事件。
+    @param keys 列名。
+    @param rows 会议行。
+    @return bytes UTF-8 编码的 VEVENT 序列。
+    """
+    lines = []
+    for conference in row_dicts(rows, keys):
+        date = conference["date"]
+        if conference["start_time"] is not None and conference["end_time"] is not None:
+            start = f"DTSTART:{datetime.datetime.combine(date, conference['start_time']):%Y%m%dT%H%M%S}"
+            end = f"DTEND:{datetime.datetime.combine(date, conference['end_time']):%Y%m%dT%H%M%S}"
+        else:
+            start = f"DTSTART;VALUE=DATE:{date:%Y%m%d}"
+            end = f"DTEND;VALUE=DATE:{date + datetime.timedelta(days=1):%Y%m%d}"
+        location = conference["location"]
+        room_name = conference.get("room_name")
+        if room_name and room_name not in location:
+            location = f"{location} {room_name}"
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:conference-{conference['id']}@coference",
+            f"DTSTAMP:{conference['updated_at']:%Y%m%dT%H%M%SZ}",
+            start,
+            end,
+            f"SUMMARY:{_ical_text(conference['name'])}",
+            f"LOCATION:{_ical_text(location)}",
+        ]
+        if conference["description"]:
+            lines.append(f"DESCRIPTION:{_ical_text(conference['description'])}")
+        lines.append("END:VEVENT")
+    return "".join(_ical_line(line) for line in lines).encode("utf-8")
+
+def ical_header(calendar_name: str) -> bytes:
+    """!
+    @brief iCalendar 文件开头的 VCALENDAR 属性。
+    @param calendar_name 日历名称，显示在订阅客户端中。
+    @return bytes UTF-8 编码的属性行。
+    """
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Coference//Conference Management//ZH",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_ical_text(calendar_name)}",
+    ]
+    return "".join(_ical_line(line) for line in lines).encode("utf-8")
+
+async def _encoded_chunks(
+    session_factory,
+    query: Select,
+    encode: Encoder,
+    header: Optional[Callable[[List[str]], bytes]],
+    footer: bytes
+) -> AsyncIterator[bytes]:
+    """!
+    @brief 分批读取查询结果并逐批编码。
+    @details 会话由生成器自身管理，不依赖请求级的 get_db；开头部分与第一批数据一起发送。
+    """
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+        keys = list(result.keys())
+        head = header(keys) if header is not None else b""
+        async for partition in result.partitions():
+            yield head + encode(keys, partition)
+            head = b""
+        if head or footer:
+            yield head + footer
+
+async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """!
+    @brief 逐块压缩为一个 gzip 文件，每块压缩后立即刷新。
+    """
+    compressor = Compressor("gzip")
+    async for chunk in chunks:
+        yield compressor.compress(chunk, flush=True)
+    yield compressor.finish()
+
+def export_response(
+    session_factory,
+    query: Select,
+    format: str,
+    filename: str,
+    gzip: bool = False,
+    calendar_name: Optional[str] = None
+) -> StreamingResponse:
+    """!
+    @brief 以 CSV、NDJSON 或 iCalendar 格式流式导出查询结果，作为附件下载。
+    @details CSV 第一行为列名；iCalendar 的查询需返回会议行（见 encode_ical_events）。
+    @param session_factory 异步会话工厂。
+    @param query 要执行的按列查询，应沿索引排序，避免数据库先排序全部结果。
+    @param format csv、ndjson 或 ical。
+    @param filename 不含扩展名的下载文件名。
+    @param gzip 是否以 gzip 文件返回。
+    @param calendar_name iCalendar 的日历名称。
+    @return StreamingResponse 分块发送的流式响应。
+    """
+    media_type, extension = EXPORT_FORMATS[format]
+    if format == "csv":
+        chunks = _encoded_chunks(session_factory, query, csv_encoder(query), _csv_records, b"")
+    elif format == "ndjson":
+        chunks = _encoded_chunks(session_factory, query, encode_ndjson, None, b"")
+    else:
+        chunks = _encoded_chunks(
+            session_factory, query, encode_ical_events,
+            lambda keys: ical_header(calendar_name or filename), _ical_line("END:VCALENDAR").encode("utf-8")
+        )
+
+    filename = f"{filename}.{extension}"
+    if gzip:
+        chunks = _gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
@@ -0,0 +1,134 @@
+"""!
+@file log.py
+@brief 日志配置与数据库会话追踪模块
+@details 应用日志经 QueueHandler 写入内存队列，由后台 QueueListener 线程负责实际输出，
+         请求路径不会阻塞在日志 I/O 上。数据库会话的获取耗时、持有时间和回滚次数以结构化字段记录，
+         并按采样比例输出。
+@date 2025.5.25
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from typing import Optional
+from app.core.config import LOG_LEVEL, DB_SESSION_LOG_LEVEL, DB_SESSION_LOG_SAMPLE_RATE
+
+class StructuredFormatter(logging.Formatter):
+    """!
+    @brief 以 key=value 形式追加结构化字段的日志格式。
+    @details 结构化字段通过 extra={"fields": {...}} 传入。
+    """
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return message
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging() -> None:
+    """!
+    @brief 为 "app" 日志器配置非阻塞输出，可重复调用。
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(StructuredFormatter())
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
+    logging.getLogger("app.db.session").setLevel(DB_SESSION_LOG_LEVEL)
+    # SQLAlchemy 以连接池类所在模块命名连接池日志器，自定义连接池的日志会落在 app 之下
+    logging.getLogger("app.models.pool").setLevel(logging.WARNING)
+
+class SessionTrace:
+    """!
+    @brief 单个数据库会话的追踪记录。
+    """
+
+    def __init__(self, tracer: "SessionTracer"):
+        self.tracer = tracer
+        self.sampled = random.random() < tracer.sample_rate
+        self.started_at = time.perf_counter()
+        self.acquired_at = self.started_at
+
+    def acquired(self) -> None:
+        """!
+        @brief 标记会话已获取。
+        """
+        self.acquired_at = time.perf_counter()
+
+    def rolled_back(self, error: BaseException) -> None:
+        """!
+        @brief 记录一次回滚，始终输出（不受采样影响）。
+        @details 仅在 DEBUG 级别附带异常堆栈。
+        @param error 导致回滚的异常。
+        """
+        self.tracer.rollbacks += 1
+        logger = self.tracer.logger
+        logger.warning(
+            "db session rolled back",
+            extra={"fields": {
+                "error": type(error).__name__,
+                "held_ms": self._held_ms(),
+                "rollbacks_total": self.tracer.rollbacks,
+            }},
+            exc_info=error if logger.isEnabledFor(logging.DEBUG) else None,
+        )
+
+    def released(self) -> None:
+        """!
+        @brief 标记会话已释放，按采样输出获取耗时与持有时间。
+        """
+        logger = self.tracer.logger
+        if self.sampled and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "db session released",
+                extra={"fields": {
+                    "acquire_ms": round((self.acquired_at - self.started_at) * 1000, 3),
+                    "held_ms": self._held_ms(),
+                    "rollbacks_total": self.tracer.rollbacks,
+                }},
+            )
+
+    def _held_ms(self) -> float:
+        return round((time.perf_counter() - self.acquired_at) * 1000, 3)
+
+class SessionTracer:
+    """!
+    @brief 数据库会话追踪器，记录会话生命周期并累计回滚次数。
+    """
+
+    def __init__(self, sample_rate: float, logger: logging.Logger):
+        self.sample_rate = sample_rate
+        self.logger = logger
+        self.rollbacks = 0
+
+    def begin(self) -> SessionTrace:
+        """!
+        @brief 开始追踪一个会话，并决定该会话是否被采样。
+        @return SessionTrace 会话追踪记录。
+        """
+        return SessionTrace(self)
+
+setup_logging()
+
+# 全局数据库会话追踪器
+session_tracer = SessionTracer(DB_SESSION_LOG_SAMPLE_RATE, logging.getLogger("app.db.session"))
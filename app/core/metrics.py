@@ -0,0 +1,301 @@
+"""!
+@file metrics.py
+@brief 请求级指标采集模块
+@details 提供计数器、仪表和直方图，以及记录每个路由延迟、并发请求数、响应大小、
+         SQL 执行次数与数据库耗时的 ASGI 中间件，并以 Prometheus 文本格式导出。
+@date 2025.5.25
+"""
+
+import bisect
+import contextlib
+import contextvars
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+
+# 延迟类直方图的默认分桶（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 响应大小直方图的分桶（字节）
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# 单个请求 SQL 执行次数直方图的分桶
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """!
+    @brief 生成 Prometheus 标签串。
+    @param names 标签名。
+    @param values 标签值。
+    @param extra 额外追加的标签（已格式化）。
+    @return str 形如 {a="1",b="2"} 的标签串，无标签时为空串。
+    """
+    parts = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{escaped}"')
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    """!
+    @brief 格式化指标值。
+    @param value 指标值。
+    @return str 整数值不带小数点。
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    """!
+    @brief 指标基类。
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+
+    def render(self) -> List[str]:
+        """!
+        @brief 以 Prometheus 文本格式输出指标。
+        @return List[str] 输出的各行。
+        """
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(Metric):
+    """!
+    @brief 单调递增的计数器。
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """!
+        @brief 增加计数。
+        @param label_values 标签值，顺序与 labels 一致。
+        @param amount 增加量。
+        """
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+class Gauge(Counter):
+    """!
+    @brief 可增可减的仪表。
+    """
+    kind = "gauge"
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        """!
+        @brief 减少数值。
+        @param label_values 标签值。
+        @param amount 减少量。
+        """
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values: str, value: float) -> None:
+        """!
+        @brief 设置数值。
+        @param label_values 标签值。
+        @param value 新数值。
+        """
+        self.values[label_values] = value
+
+class Histogram(Metric):
+    """!
+    @brief 分桶直方图。
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+        self.values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, *label_values: str, value: float) -> None:
+        """!
+        @brief 记录一次观测值。
+        @param label_values 标签值。
+        @param value 观测值。
+        """
+        state = self.values.get(label_values)
+        if state is None:
+            state = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+class Registry:
+    """!
+    @brief 指标注册表。
+    @details 除注册的指标外，还可以注册在导出时才采集的回调，用于缓存、连接池等已有统计。
+    """
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors = []
+
+    def register(self, metric: Metric) -> Metric:
+        """!
+        @brief 注册指标。
+        @param metric 指标对象。
+        @return Metric 注册的指标对象。
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector) -> None:
+        """!
+        @brief 注册导出时调用的采集回调。
+        @param collector 返回 Metric 列表的无参函数。
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        """!
+        @brief 以 Prometheus 文本格式导出全部指标。
+        @return str 导出文本。
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# 全局指标注册表
+registry = Registry()
+
+REQUESTS = registry.register(Counter("http_requests_total", "HTTP 请求总数", ("method", "route", "status")))
+REQUEST_LATENCY = registry.register(Histogram("http_request_duration_seconds", "HTTP 请求处理耗时", ("method", "route")))
+REQUESTS_IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "正在处理的 HTTP 请求数"))
+RESPONSE_SIZE = registry.register(Histogram("http_response_size_bytes", "HTTP 响应体大小", ("method", "route"), SIZE_BUCKETS))
+DB_QUERIES = registry.register(Counter("db_queries_total", "SQL 执行总次数", ("route",)))
+DB_QUERIES_PER_REQUEST = registry.register(Histogram("db_queries_per_request", "单个请求的 SQL 执行次数", ("route",), QUERY_COUNT_BUCKETS))
+DB_TIME = registry.register(Histogram("db_query_duration_seconds", "单个请求的数据库总耗时", ("route",)))
+
+class RequestStats:
+    """!
+    @brief 单个请求内的数据库统计。
+    """
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+_current_request: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("current_request", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    """!
+    @brief 当前请求的数据库统计。
+    @return Optional[RequestStats] 不在请求中时为 None。
+    """
+    return _current_request.get()
+
+@contextlib.contextmanager
+def attributed_to(stats: Optional[RequestStats]):
+    """!
+    @brief 把块内执行的 SQL 计入指定请求。
+    @details 供代替请求执行 SQL 的后台任务（如写入任务）使用，stats 为 None 时块内的 SQL 不计入任何请求。
+    @param stats 提交工作的请求的统计，由 current_request_stats() 取得。
+    """
+    token = _current_request.set(stats)
+    try:
+        yield
+    finally:
+        _current_request.reset(token)
+
+def instrument_engine(engine) -> None:
+    """!
+    @brief 为引擎注册 SQL 执行计时。
+    @details 异步会话中的同步事件运行在 greenlet 里，greenlet 继承调用方协程的上下文，
+             因此可以通过 contextvars 把耗时归到当前请求。
+    @param engine SQLAlchemy 同步引擎（AsyncEngine.sync_engine）。
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += time.perf_counter() - started
+
+class MetricsMiddleware:
+    """!
+    @brief 记录请求级指标的 ASGI 中间件。
+    @details 路由标签使用路由模板（如 /api/conferences/{conference_id}），避免标签基数随 ID 增长。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            _current_request.reset(token)
+
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            REQUESTS.inc(method, route, str(status_code))
+            REQUEST_LATENCY.observe(method, route, value=elapsed)
+            RESPONSE_SIZE.observe(method, route, value=body_size)
+            DB_QUERIES.inc(route, amount=stats.queries)
+            DB_QUERIES_PER_REQUEST.observe(route, value=stats.queries)
+            DB_TIME.observe(route, value=stats.db_seconds)
+
+# Prometheus 文本格式的媒体类型
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -0,0 +1,120 @@
+"""!
+@file pagination.py
+@brief 列表分页与流式输出工具模块
+@details 提供基于主键游标（id > last_id）的 keyset 分页、按任意列排序的不透明游标分页，
+         以及基于 AsyncSession.stream() 的 NDJSON 流式输出
+@date 2025.5.25
+"""
+
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, tuple_
+from app.core.config import STREAM_CHUNK_SIZE
+from app.core.responses import dumps, row_dicts
+
+# 下一页游标所在的响应头
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# NDJSON 媒体类型
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def apply_keyset(query: Select, id_column, after_id: Optional[int], limit: Optional[int]) -> Select:
+    """!
+    @brief 为查询附加 keyset 分页条件。
+    @details 使用 id > after_id 定位起点并按主键排序，避免 OFFSET 带来的逐行跳过。
+    @param query 原始查询。
+    @param id_column 作为游标的主键列。
+    @param after_id 上一页最后一条记录的 ID，为 None 时从头开始。
+    @param limit 每页条数，为 None 时不限制。
+    @return Select 附加分页条件后的查询。
+    """
+    if after_id is not None:
+        query = query.where(id_column > after_id)
+    query = query.order_by(id_column)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def set_next_cursor(response: Response, items: Sequence, limit: Optional[int]) -> None:
+    """!
+    @brief 在响应头中写入下一页游标。
+    @details 仅当本页已取满 limit 条时才可能存在下一页。
+    @param response FastAPI 响应对象。
+    @param items 本页数据，元素需带有 id 属性。
+    @param limit 每页条数。
+    """
+    if limit is not None and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(items[-1].id)
+
+def encode_cursor(*values) -> str:
+    """!
+    @brief 将排序键编码为不透明游标。
+    @param values 上一页最后一条记录的排序键。
+    @return str URL 安全的 base64 字符串。
+    """
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List:
+    """!
+    @brief 解码不透明游标。
+    @param cursor encode_cursor() 生成的游标。
+    @param size 排序键的个数。
+    @return List 排序键。
+    @exception HTTPException 游标格式错误 (400)。
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def apply_cursor(query: Select, columns: Sequence, cursor: Optional[str], limit: Optional[int]) -> Select:
+    """!
+    @brief 按多列排序键附加 keyset 分页条件。
+    @details 排序键的最后一列应为主键以保证唯一，条件形如 (name, id) > (:name, :id)。
+    @param query 原始查询。
+    @param columns 排序列。
+    @param cursor 上一页响应中的游标，为 None 时从头开始。
+    @param limit 每页条数，为 None 时不限制。
+    @return Select 附加分页条件后的查询。
+    """
+    if cursor is not None:
+        values = decode_cursor(cursor, len(columns))
+        if len(columns) == 1:
+            query = query.where(columns[0] > values[0])
+        else:
+            query = query.where(tuple_(*columns) > tuple_(*values))
+    query = query.order_by(*columns)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+def ndjson_response(
+    session_factory,
+    query: Select,
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """!
+    @brief 以 NDJSON 格式流式返回查询结果。
+    @details 在独立会话中通过 AsyncSession.stream() 分批读取，每批的行直接转换为 dict 并编码后立即发送，
+             不构造 ORM 对象和 Pydantic 模型，内存占用与表大小无关。会话由生成器自身管理，不依赖请求级的 get_db。
+    @param session_factory 异步会话工厂。
+    @param query 要执行的按列查询，每列对应输出对象的一个字段。
+    @param headers 额外的响应头。
+    @return StreamingResponse 流式响应。
+    """
+    async def generate():
+        async with session_factory() as session:
+            result = await session.stream(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+            keys = list(result.keys())
+            async for partition in result.partitions():
+                yield b"".join(dumps(row) + b"\n" for row in row_dicts(partition, keys))
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -0,0 +1,70 @@
+"""!
+@file responses.py
+@brief 列表接口的快速 JSON 序列化模块
+@details 列表接口逐行构造 Pydantic 模型后，FastAPI 还会按 response_model 再校验一遍并用 jsonable_encoder
+         转换，行数多时这两步占据了大部分 CPU 时间。数据库中的行已经过写入时的校验，这里直接把 Row
+         转换为 dict 并编码为 JSON，路由返回 Response 实例后 FastAPI 不再做响应校验；response_model 仍保留
+         在路由上，用于生成 OpenAPI 文档。安装 orjson 时使用 orjson 编码，否则退化为标准库 json。
+@date 2025.5.25
+"""
+
+import datetime
+import json
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """!
+    @brief 标准库 json 无法直接编码的值。
+    @param value 待编码的值。
+    @return 可编码的值。
+    @exception TypeError 不支持的类型。
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """!
+    @brief 将内容编码为 UTF-8 JSON。
+    @details 日期和时间编码为 ISO 8601 字符串，与 Pydantic 的输出一致。
+    @param content dict、list 及其嵌套的基本类型。
+    @return bytes JSON 字节串。
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """!
+    @brief 使用 dumps() 编码的 JSON 响应。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def row_dicts(rows: Iterable[Row], keys: Iterable[str]) -> List[Dict[str, Any]]:
+    """!
+    @brief 将查询结果行转换为 dict 列表。
+    @param rows 查询结果行。
+    @param keys 列名，顺序与行中的值一致。
+    @return List[Dict[str, Any]] 每行一个 dict。
+    """
+    keys = list(keys)
+    return [dict(zip(keys, row)) for row in rows]
+
+def rows_response(rows: List[Row], keys: Iterable[str], headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """!
+    @brief 将查询结果行直接编码为 JSON 数组响应。
+    @param rows 按列查询（如 select(*Model.__table__.columns)）得到的行。
+    @param keys 列名，通常为 Result.keys()。
+    @param headers 额外的响应头。
+    @return FastJSONResponse 响应。
+    """
+    return FastJSONResponse(row_dicts(rows, keys), headers=headers)
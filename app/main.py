@@ -5,44 +5,154 @@
 @date 2025.5.25
 """
 
-import os
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from app.core.config import APP_TITLE, APP_DESCRIPTION
-from app.models.database import engine, Base
-from app.api import conference, employee, booking
+import contextlib
+import functools
+import hashlib
+import logging
+from typing import Dict, NamedTuple, Optional
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from app.core.assets import ASSET_MOUNTS, asset_url
+from app.core.cache import cache
+from app.core.compression import CompressionMiddleware, available_encodings, choose_encoding, compress
+from app.core.config import APP_TITLE, APP_DESCRIPTION, AUTO_CREATE_SCHEMA, BASE_DIR
+from app.core.etag import is_not_modified
+from app.core.events import events as event_bus
+from app.core.metrics import Counter, Gauge, MetricsMiddleware, PROMETHEUS_CONTENT_TYPE, instrument_engine, registry
+from app.models.coalescer import coalescer
+from app.models.database import engine
+from app.models.pool import pool_metrics
+from app.api import conference, employee, booking, events, stats, room
+
+logger = logging.getLogger("app")
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """!
+    @brief 应用的启动与关闭流程。
+    @details 启动时渲染首页（见 render_index_page）。默认不做任何数据库操作，数据表由 python -m app.cli init-db 创建；
+             仅在开发环境设置 AUTO_CREATE_SCHEMA 时自动建表。
+             关闭时关闭事件总线，结束仍在推送的 /api/events 连接；开启写操作合并时等待已提交的写操作完成。
+    @param app FastAPI 实例。
+    """
+    app.state.index_page = render_index_page()
+    if AUTO_CREATE_SCHEMA:
+        from app.models.schema import create_schema
+        await create_schema(engine)
+        logger.info("数据库表已初始化。")
+    yield
+    event_bus.close()
+    if coalescer is not None:
+        await coalescer.close()
 
 # FastAPI 实例
-app = FastAPI(title=APP_TITLE, description=APP_DESCRIPTION)
+app = FastAPI(title=APP_TITLE, description=APP_DESCRIPTION, lifespan=lifespan)
 
-# 挂载静态文件目录
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# 响应压缩；指标中间件在其外层，记录的响应大小为实际发送的字节数
+app.add_middleware(CompressionMiddleware)
 
-# 配置模板目录
-templates = Jinja2Templates(directory="templates")
+# 请求级指标与 SQL 计时
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine.sync_engine)
+
+# 挂载静态文件目录（同时提供带内容指纹的文件名，见 app.core.assets）
+for mount, files in ASSET_MOUNTS.items():
+    app.mount(files.mount_path, files, name=mount)
+
+@functools.lru_cache(maxsize=None)
+def get_templates():
+    """!
+    @brief 获取模板引擎。
+    @details 启动时渲染首页才导入 Jinja2 并加载模板目录，不计入导入应用的耗时。
+    @return Jinja2Templates 模板引擎。
+    """
+    from fastapi.templating import Jinja2Templates
+    return Jinja2Templates(directory=BASE_DIR / "templates")
 
 # 注册路由
+# 预定路由需先于会议路由注册，否则 /api/conferences/bookings 会被 /api/conferences/{conference_id} 匹配
+app.include_router(booking.router, prefix="/api", tags=["bookings"])
 app.include_router(conference.router, prefix="/api/conferences", tags=["conferences"])
 app.include_router(employee.router, prefix="/api/employees", tags=["employees"])
-app.include_router(booking.router, prefix="/api", tags=["bookings"])
+app.include_router(events.router, prefix="/api", tags=["events"])
+app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
+app.include_router(room.router, prefix="/api/rooms", tags=["rooms"])
+
+class IndexPage(NamedTuple):
+    """!
+    @brief 渲染完成的首页及其预压缩版本。
+    """
+    etag: str
+    bodies: Dict[Optional[str], bytes]
+
+def render_index_page() -> IndexPage:
+    """!
+    @brief 渲染首页，并按支持的每种编码各压缩一次。
+    @details 首页不依赖请求内容，在应用启动时渲染一次并保存在 app.state.index_page 中，
+             首个请求不承担模板加载与压缩的开销。静态资源通过 asset_url() 引用带指纹的地址。
+    @return IndexPage 首页内容、ETag 与各编码的响应体。
+    """
+    html = get_templates().get_template("index.html").render(asset_url=asset_url).encode("utf-8")
+    bodies = {None: html}
+    for encoding in available_encodings():
+        bodies[encoding] = compress(html, encoding)
+    return IndexPage(etag='"%s"' % hashlib.sha256(html).hexdigest()[:16], bodies=bodies)
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     """!
     @brief 提供前端 HTML 页面。
+    @details 返回启动时渲染的首页，按 Accept-Encoding 选择预压缩的版本；ETag 一致时返回 304。
     @param request FastAPI 的请求对象。
-    @return HTMLResponse 渲染后的 index.html 页面。
+    @return HTMLResponse index.html 页面。
+    """
+    page = request.app.state.index_page
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if is_not_modified(request, page.etag, None):
+        return Response(status_code=304, headers=headers)
+
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(page.bodies[encoding], headers=headers)
+
+@app.get("/api/cache/stats", response_model=dict, tags=["cache"])
+async def get_cache_stats():
+    """!
+    @brief 获取单实体读缓存的统计信息。
+    @return dict 命中、未命中和淘汰次数等统计。
+    """
+    return cache.stats()
+
+@app.get("/api/db/pool", response_model=dict, tags=["database"])
+async def get_pool_stats():
+    """!
+    @brief 获取数据库连接池的统计信息。
+    @return dict 连接获取等待时间、持有时间和当前连接池状态。
     """
-    return templates.TemplateResponse("index.html", {"request": request})
+    return pool_metrics.snapshot(engine.sync_engine.pool)
+
+def collect_runtime_metrics():
+    """!
+    @brief 导出 /metrics 时采集缓存与连接池的统计。
+    @return list 指标列表。
+    """
+    cache_stats = cache.stats()
+    cache_events = Counter("cache_operations_total", "单实体读缓存的命中、未命中和淘汰次数", ("result",))
+    for result in ("hits", "misses", "evictions"):
+        cache_events.inc(result, amount=cache_stats.get(result, 0))
+
+    pool = Gauge("db_pool_stat", "数据库连接池统计（等待与持有时间单位为秒）", ("stat",))
+    for stat, value in pool_metrics.snapshot(engine.sync_engine.pool).items():
+        pool.set(stat, value=value)
+    return [cache_events, pool]
+
+registry.register_collector(collect_runtime_metrics)
 
-@app.on_event("startup")
-async def startup_event():
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
     """!
-    @brief 应用启动时执行的事件。
-    @details 创建数据库表（如果不存在）。
+    @brief 以 Prometheus 文本格式导出指标。
+    @return PlainTextResponse 指标文本。
     """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("数据库表已初始化。") 
\ No newline at end of file
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -6,14 +6,15 @@
 """
 
 import datetime
-from sqlalchemy import Integer, DateTime, ForeignKeyConstraint
+from sqlalchemy import Integer, DateTime, ForeignKeyConstraint, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.database import Base
 
 class EmployeeConferenceDB(Base):
     """!
     @brief SQLAlchemy 模型，数据库中的 'employee_conference' 表。
-    @details 存储员工和会议之间的关联关系。
+    @details 存储员工和会议之间的关联关系。主键 (employee_id, conference_id) 服务按员工的查询，
+             反向索引 (conference_id, employee_id) 服务按会议的查询，两者都是覆盖索引。
     """
     __tablename__ = "employee_conference"
 
@@ -23,6 +24,7 @@ class EmployeeConferenceDB(Base):
     __table_args__ = (
         ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
         ForeignKeyConstraint(['conference_id'], ['conferences.id'], ondelete='CASCADE'),
+        Index('ix_employee_conference_conference_id', 'conference_id', 'employee_id'),
     )
 
     def to_pydantic(self) -> "EmployeeConference":
@@ -36,6 +38,27 @@ class EmployeeConferenceDB(Base):
             conference_id=self.conference_id
         )
 
+class WaitlistDB(Base):
+    """!
+    @brief SQLAlchemy 模型，数据库中的 'conference_waitlist' 表。
+    @details 会议已满时的候补名单，按自增 ID 先到先得；有空位时由 app.models.capacity 转为正式预定。
+             索引 (conference_id, id) 使按候补顺序读取无需排序。
+    """
+    __tablename__ = "conference_waitlist"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    conference_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    employee_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        ForeignKeyConstraint(['conference_id'], ['conferences.id'], ondelete='CASCADE'),
+        UniqueConstraint('conference_id', 'employee_id'),
+        Index('ix_conference_waitlist_conference_id', 'conference_id', 'id'),
+        Index('ix_conference_waitlist_employee_id', 'employee_id'),
+    )
+
 class ConferenceBookingDB(Base):
     """!
     @brief SQLAlchemy 模型，数据库中的 'conference_bookings' 表。
@@ -48,6 +71,11 @@ class ConferenceBookingDB(Base):
     employee_id: Mapped[int] = mapped_column(Integer, nullable=False)
     booking_date: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_conference_bookings_conference_id', 'conference_id', 'employee_id'),
+        Index('ix_conference_bookings_employee_id', 'employee_id', 'conference_id'),
+    )
+
     def to_pydantic(self) -> "ConferenceBooking":
         """! 
         @brief 将 SQLAlchemy 模型转换为 Pydantic 模型。
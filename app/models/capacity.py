@@ -0,0 +1,207 @@
+"""!
+@file capacity.py
+@brief 会议名额分配模块
+@details 会议的已预定人数 booked_count 只通过带条件的 UPDATE 增减，由数据库保证并发下不超额：
+         单个预定执行 UPDATE ... SET booked_count = booked_count + 1 WHERE booked_count < capacity，
+         命中 0 行即表示已满。UPDATE 会先取得写锁（SQLite 的数据库写锁、其他数据库的行锁），
+         同一事务中随后的读取和写入不会与其他预定交错。这些 UPDATE 同时刷新会议的 updated_at，
+         会议列表的 ETag 随名额变化。这里的函数都不提交事务。
+         SQLite 只有一个写锁，大量连接同时争用时会在 busy_timeout 中轮询等待，尾延迟很高，
+         因此 SQLite 下同一会议的名额变更还会先在进程内按会议排队（seat_lock）；开启 WRITE_COALESCING 时
+         写操作已由同一个写入任务串行执行（见 app.models.coalescer），不再排队。
+@date 2025.5.25
+"""
+
+import asyncio
+import contextlib
+import weakref
+from typing import Dict, List, Optional
+from sqlalchemy import delete, exists, func, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import WRITE_COALESCING
+from app.models.booking import EmployeeConferenceDB, WaitlistDB
+from app.models.conference import ConferenceDB
+from app.models.database import insert_ignore
+from app.models.employee import EmployeeDB
+from app.models.schedule import EMPLOYEE_CONFLICT, WAITLIST_CONFLICT, conflict_params
+
+# 各会议的进程内锁，没有请求持有时自动回收
+_seat_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+@contextlib.asynccontextmanager
+async def seat_lock(db: AsyncSession, conference_id: int):
+    """!
+    @brief 会议名额变更的临界区。
+    @details 需在第一条 SQL 之前进入、提交之后退出；等待期间不占用连接池中的连接。
+             SQLite 下按会议在进程内排队（开启 WRITE_COALESCING 时除外），其他数据库依靠行锁排队。块内抛出异常（包括 404/409）时
+             在离开临界区前回滚，及早释放数据库写锁。
+    @param db 数据库会话，用于确定方言和回滚。
+    @param conference_id 会议 ID。
+    """
+    lock = contextlib.nullcontext()
+    if db.get_bind().dialect.name == "sqlite" and not WRITE_COALESCING:
+        lock = _seat_locks.get(conference_id)
+        if lock is None:
+            lock = _seat_locks[conference_id] = asyncio.Lock()
+    async with lock:
+        try:
+            yield
+        except BaseException:
+            await db.rollback()
+            raise
+
+def seat_available():
+    """!
+    @brief 会议仍有空位的条件。
+    @return 用于 UPDATE/SELECT 的 WHERE 子句。
+    """
+    return or_(ConferenceDB.capacity.is_(None), ConferenceDB.booked_count < ConferenceDB.capacity)
+
+def is_booked(conference_id: int, employee_id: int):
+    """!
+    @brief 员工已预定会议的条件。
+    @param conference_id 会议 ID。
+    @param employee_id 员工 ID。
+    @return EXISTS 子句。
+    """
+    return exists().where(
+        EmployeeConferenceDB.conference_id == conference_id,
+        EmployeeConferenceDB.employee_id == employee_id
+    )
+
+async def take_seat(db: AsyncSession, conference_id: int, employee_id: int) -> bool:
+    """!
+    @brief 为员工占用一个名额。
+    @details 会议存在、员工存在、尚未预定、有空位且员工在会议时段没有其他预定时 booked_count 加一，否则不修改任何行。
+    @param db 数据库会话。
+    @param conference_id 会议 ID。
+    @param employee_id 员工 ID。
+    @return bool 是否占到名额。
+    """
+    statement = (
+        update(ConferenceDB)
+        .where(
+            ConferenceDB.id == conference_id,
+            seat_available(),
+            exists().where(EmployeeDB.id == employee_id),
+            ~is_booked(conference_id, employee_id),
+            ~EMPLOYEE_CONFLICT
+        )
+        .values(booked_count=ConferenceDB.booked_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(statement, conflict_params(conference_id, [employee_id]))
+    return result.rowcount == 1
+
+async def lock_conference(db: AsyncSession, conference_id: int) -> Optional[Row]:
+    """!
+    @brief 锁定会议行并读取名额状态。
+    @details 执行一次不改变名额的 UPDATE 以取得写锁，之后在同一事务中按返回值分配名额。
+    @param db 数据库会话。
+    @param conference_id 会议 ID。
+    @return Optional[Row] (capacity, booked_count)，会议不存在时为 None。
+    """
+    statement = (
+        update(ConferenceDB)
+        .where(ConferenceDB.id == conference_id)
+        .values(booked_count=ConferenceDB.booked_count)
+        .returning(ConferenceDB.capacity, ConferenceDB.booked_count)
+        .execution_options(synchronize_session=False)
+    )
+    return (await db.execute(statement)).one_or_none()
+
+async def add_seats(db: AsyncSession, conference_id: int, amount: int) -> None:
+    """!
+    @brief 调整会议的已预定人数。
+    @param db 数据库会话。
+    @param conference_id 会议 ID。
+    @param amount 变化量，释放名额时为负数。
+    """
+    await db.execute(
+        update(ConferenceDB)
+        .where(ConferenceDB.id == conference_id)
+        .values(booked_count=ConferenceDB.booked_count + amount)
+        .execution_options(synchronize_session=False)
+    )
+
+async def fill_from_waitlist(db: AsyncSession, conference_id: int) -> List[int]:
+    """!
+    @brief 按候补顺序把空出的名额分配给候补员工。
+    @details 应在释放名额或调整容量的写操作之后调用，此时事务已持有写锁。
+             已预定了与该会议时段重叠的其他会议的候补员工不转正，也不占用空出的名额，
+             留在候补名单中原来的位置，由其后的候补员工依次补位。
+    @param db 数据库会话。
+    @param conference_id 会议 ID。
+    @return List[int] 转为正式预定的员工 ID。
+    """
+    row = (await db.execute(
+        select(ConferenceDB.capacity, ConferenceDB.booked_count).where(ConferenceDB.id == conference_id)
+    )).one_or_none()
+    if row is None:
+        return []
+
+    query = select(WaitlistDB.id, WaitlistDB.employee_id).where(
+        WaitlistDB.conference_id == conference_id, ~WAITLIST_CONFLICT
+    ).order_by(WaitlistDB.id)
+    if row.capacity is not None:
+        free = row.capacity - row.booked_count
+        if free <= 0:
+            return []
+        query = query.limit(free)
+    waiting = (await db.execute(query, {"conference_id": conference_id})).all()
+    if not waiting:
+        return []
+
+    result = await db.execute(
+        insert_ignore(EmployeeConferenceDB, db).returning(EmployeeConferenceDB.employee_id),
+        [{"employee_id": entry.employee_id, "conference_id": conference_id} for entry in waiting]
+    )
+    promoted = result.scalars().all()
+    await db.execute(
+        delete(WaitlistDB).where(WaitlistDB.id.in_([entry.id for entry in waiting])).execution_options(synchronize_session=False)
+    )
+    if promoted:
+        await add_seats(db, conference_id, len(promoted))
+    return promoted
+
+async def waitlist_position(db: AsyncSession, conference_id: int, employee_id: int) -> int:
+    """!
+    @brief 查询员工在候补名单中的位置。
+    @param db 数据库会话。
+    @param conference_id 会议 ID。
+    @param employee_id 员工 ID。
+    @return int 从 1 开始的位置，不在候补名单中时为 0。
+    """
+    own_id = select(WaitlistDB.id).where(
+        WaitlistDB.conference_id == conference_id, WaitlistDB.employee_id == employee_id
+    ).scalar_subquery()
+    result = await db.execute(
+        select(func.count()).where(WaitlistDB.conference_id == conference_id, WaitlistDB.id <= own_id)
+    )
+    return result.scalar_one()
+
+async def release_employee_seats(db: AsyncSession, employee_id: int) -> Dict[int, List[int]]:
+    """!
+    @brief 删除员工前释放其占用的全部名额并补位。
+    @details 外键级联只删除关联行，不会更新 booked_count，因此需要在删除员工之前调用。
+    @param db 数据库会话。
+    @param employee_id 员工 ID。
+    @return Dict[int, List[int]] 受影响的会议 ID 到因补位转为正式预定的员工 ID 的映射。
+    """
+    result = await db.execute(
+        update(ConferenceDB)
+        .where(ConferenceDB.id.in_(
+            select(EmployeeConferenceDB.conference_id).where(EmployeeConferenceDB.employee_id == employee_id)
+        ))
+        .values(booked_count=ConferenceDB.booked_count - 1)
+        .returning(ConferenceDB.id)
+        .execution_options(synchronize_session=False)
+    )
+    conference_ids = result.scalars().all()
+    if not conference_ids:
+        return {}
+
+    await db.execute(delete(EmployeeConferenceDB).where(EmployeeConferenceDB.employee_id == employee_id))
+    await db.execute(delete(WaitlistDB).where(WaitlistDB.employee_id == employee_id))
+    return {conference_id: await fill_from_waitlist(db, conference_id) for conference_id in conference_ids}
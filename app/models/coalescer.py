@@ -0,0 +1,179 @@
+"""!
+@file coalescer.py
+@brief 写操作合并提交模块
+@details SQLite 只有一个写锁，每个请求各自提交时，并发写入在写锁上排队，且每次提交都有一次 BEGIN/COMMIT 往返和日志同步。
+         开启 WRITE_COALESCING 后，预定、取消以及会议、员工的增删改不再各自提交，而是交给一个写入任务：
+         它收集 WRITE_BATCH_WINDOW_MS 毫秒内（至多 WRITE_BATCH_MAX_SIZE 个）到达的写操作，在同一个事务中依次执行后提交一次。
+         每个写操作在各自的 SAVEPOINT 中执行，抛出异常（包括 404/409 等 HTTPException）时只回滚该操作，
+         异常原样交还给调用方，其余操作照常提交；提交失败时同批次成功的操作都收到该异常。
+         写入任务使用独立的引擎，SQLite 下以 BEGIN IMMEDIATE 开始事务，并由 SQLAlchemy 而非 sqlite3 模块管理事务，
+         SAVEPOINT 才能正确嵌套。所有写操作都经同一个任务串行执行，seat_lock 的进程内排队不再需要。
+         写入任务的引擎同样注册了 SQL 计时，每个写操作执行的 SQL 计入提交它的请求；BEGIN 与 COMMIT 由整批共享，不计入任何请求。
+@date 2025.5.25
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import DATABASE_URL, WRITE_COALESCING, WRITE_BATCH_MAX_SIZE, WRITE_BATCH_WINDOW_MS
+from app.core.metrics import RequestStats, attributed_to, current_request_stats, instrument_engine
+from app.models.database import create_configured_engine
+
+# 写操作：在给定会话中执行写入但不提交，返回交给调用方的结果
+WriteOperation = Callable[[AsyncSession], Awaitable[Any]]
+
+# 排队中的写操作：(写操作, 等待结果的 Future, 提交它的请求的数据库统计)
+PendingWrite = Tuple[WriteOperation, asyncio.Future, Optional[RequestStats]]
+
+def _use_explicit_transactions(sync_engine) -> None:
+    """!
+    @brief 让 SQLAlchemy 自行发出 BEGIN IMMEDIATE，而不是由 sqlite3 模块在第一条写语句前隐式开始事务。
+    @details sqlite3 模块的隐式事务会使事务开始前的 SAVEPOINT 成为最外层事务，RELEASE 时即提交。
+             BEGIN IMMEDIATE 在事务开始时就取得写锁，整批写操作不会在中途因升级写锁失败。
+    @param sync_engine 同步引擎。
+    """
+    @event.listens_for(sync_engine, "connect")
+    def disable_implicit_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(sync_engine, "begin")
+    def begin_immediate(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+class WriteCoalescer:
+    """!
+    @brief 把并发到达的写操作合并到同一个事务中提交的写入任务。
+    """
+
+    def __init__(self, url: str = DATABASE_URL, max_batch: int = WRITE_BATCH_MAX_SIZE,
+                 window_ms: float = WRITE_BATCH_WINDOW_MS):
+        self.engine = create_configured_engine(url)
+        if self.engine.dialect.name == "sqlite":
+            _use_explicit_transactions(self.engine.sync_engine)
+        instrument_engine(self.engine.sync_engine)
+        self._sessions = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # 已提交的批次数与操作数，用于观察合并效果
+        self.batches = 0
+        self.operations = 0
+
+    async def submit(self, operation: WriteOperation) -> Any:
+        """!
+        @brief 提交一个写操作并等待其所在批次提交。
+        @param operation 写操作，不应自行提交，也不应在返回值中带出需要延迟加载的 ORM 对象。
+        @return Any 写操作的返回值，批次提交之后才返回。
+        @exception Exception 写操作抛出的异常，或批次提交失败的异常。
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((operation, future, current_request_stats()))
+        return await future
+
+    async def _collect(self, first) -> List[PendingWrite]:
+        """!
+        @brief 以第一个写操作为起点收集一批写操作。
+        @details 先取走队列中已有的操作，未满时再在窗口期内等待新到达的操作。
+        """
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """!
+        @brief 写入任务主循环：收集一批写操作，执行并提交，再交还各自的结果。
+        @details 任务创建时继承了第一个调用方的上下文，先清除其中的请求统计，SQL 只按写操作计入各自的请求。
+        """
+        with attributed_to(None):
+            while True:
+                first = await self._queue.get()
+                if first is None:
+                    return
+                batch = await self._collect(first)
+                closing = any(item is None for item in batch)
+                await self._apply([item for item in batch if item is not None])
+                if closing:
+                    return
+
+    async def _apply(self, batch: List[PendingWrite]) -> None:
+        """!
+        @brief 在一个事务中执行一批写操作。
+        @param batch 排队中的写操作列表。
+        """
+        outcomes = []
+        try:
+            async with self._sessions() as session:
+                async with session.begin():
+                    for operation, future, stats in batch:
+                        if future.done():
+                            # 调用方已取消，不再执行
+                            continue
+                        try:
+                            with attributed_to(stats):
+                                async with session.begin_nested():
+                                    outcomes.append((future, await operation(session), None))
+                        except Exception as e:
+                            outcomes.append((future, None, e))
+        except Exception as e:
+            for future, _, error in outcomes:
+                if not future.done():
+                    future.set_exception(error or e)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.operations += len(outcomes)
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """!
+        @brief 执行完已提交的写操作后结束写入任务并关闭引擎，应用关闭时调用。
+        """
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+        await self.engine.dispose()
+
+# 全局写入任务，未开启 WRITE_COALESCING 时为 None
+coalescer: Optional[WriteCoalescer] = WriteCoalescer() if WRITE_COALESCING else None
+
+async def run_write(db: AsyncSession, operation: WriteOperation) -> Any:
+    """!
+    @brief 执行一个写操作并提交。
+    @details 开启 WRITE_COALESCING 时交给写入任务与其他写操作合并提交，否则在请求的会话中执行并立即提交。
+             调用方在返回之后再做提交后的工作（失效缓存、发布变更事件、设置状态码）。
+    @param db 请求的数据库会话。
+    @param operation 写操作。
+    @return Any 写操作的返回值。
+    """
+    if coalescer is not None:
+        return await coalescer.submit(operation)
+    result = await operation(db)
+    await db.commit()
+    return result
@@ -6,25 +6,39 @@
 """
 
 import datetime
-from sqlalchemy import Integer, String, Date, Text, DateTime
+from sqlalchemy import Integer, String, Date, Text, DateTime, Time, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.database import Base
 
 class ConferenceDB(Base):
     """!
     @brief SQLAlchemy 模型，数据库中的 'conferences' 表。
-    @details 存储会议的基本信息，包括名称、日期、地点等。
+    @details 存储会议的基本信息，包括名称、日期、地点等。capacity 为空表示不限人数；
+             booked_count 为已预定人数，只通过条件 UPDATE 增减（见 app.models.capacity）；
+             它在每次预定时都会改写，不建索引，按预定人数排名时扫描会议表并只保留前若干个。
+             room_id 引用会议室，start_time 与 end_time 为会议在 date 当天的起止时间（左闭右开）；
+             三者都不为空的会议占用该会议室的对应时段。复合索引 (room_id, date, start_time, end_time)
+             使冲突检测与空闲时段查询只读取同一会议室当天的会议（见 app.models.schedule）。
     """
     __tablename__ = "conferences"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
-    date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
-    location: Mapped[str] = mapped_column(String(255), nullable=False)
+    date: Mapped[datetime.date] = mapped_column(Date, index=True, nullable=False)
+    location: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    capacity: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    room_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("rooms.id"), nullable=True)
+    start_time: Mapped[datetime.time | None] = mapped_column(Time, nullable=True)
+    end_time: Mapped[datetime.time | None] = mapped_column(Time, nullable=True)
+    booked_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.utcnow)
     updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_conferences_room_schedule', 'room_id', 'date', 'start_time', 'end_time'),
+    )
+
     def to_pydantic(self) -> "Conference":
         """! 
         @brief 将 SQLAlchemy 模型转换为 Pydantic 模型。
@@ -37,6 +51,11 @@ class ConferenceDB(Base):
             date=self.date,
             location=self.location,
             description=self.description,
+            capacity=self.capacity,
+            room_id=self.room_id,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            booked_count=self.booked_count,
             created_at=self.created_at,
             updated_at=self.updated_at
         ) 
\ No newline at end of file
@@ -5,12 +5,65 @@
 @date 2025.5.25
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import event, insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from app.core.config import DATABASE_URL
+from fastapi.exceptions import RequestValidationError
+from starlette.exceptions import HTTPException
+from app.core.log import session_tracer
+from app.core.config import (
+    DATABASE_URL, DB_ECHO, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_PRE_PING, DB_POOL_RECYCLE,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE
+)
+from app.models.pool import InstrumentedAsyncQueuePool, instrument_pool
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """!
+    @brief 在新建的 SQLite 连接上设置 PRAGMA。
+    @param dbapi_connection DBAPI 连接。
+    @param connection_record 连接池中的连接记录。
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    # SQLite 默认不检查外键，开启后 ON DELETE CASCADE 才会生效
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+def create_configured_engine(url: str = DATABASE_URL) -> AsyncEngine:
+    """!
+    @brief 按配置创建异步引擎。
+    @details 连接池大小、溢出、超时、预检和回收时间均来自环境变量；内存 SQLite 数据库
+             只能使用单连接的 StaticPool，因此不应用连接池参数。SQLite 连接建立时设置
+             WAL、synchronous、busy_timeout、mmap 和外键约束等 PRAGMA。
+    @param url 数据库连接 URL。
+    @return AsyncEngine 异步引擎。
+    """
+    database_url = make_url(url)
+    is_sqlite = database_url.get_backend_name() == "sqlite"
+    is_memory = is_sqlite and database_url.database in (None, "", ":memory:")
+
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if not is_memory:
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    async_engine = create_async_engine(database_url, **options)
+
+    if is_sqlite:
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    instrument_pool(async_engine.sync_engine)
+    return async_engine
 
 # SQLAlchemy 异步引擎
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_configured_engine()
 
 # SQLAlchemy 异步会话工厂
 AsyncSessionLocal = async_sessionmaker(
@@ -20,28 +73,89 @@ AsyncSessionLocal = async_sessionmaker(
 # SQLAlchemy 声明式基类
 Base = declarative_base()
 
+def insert_ignore(model, db: AsyncSession):
+    """!
+    @brief 构造“冲突时忽略”的 INSERT 语句。
+    @details 根据当前数据库方言生成 ON CONFLICT DO NOTHING（SQLite/PostgreSQL）
+             或 INSERT IGNORE（MySQL），其他方言退化为普通 INSERT。
+    @param model 目标 SQLAlchemy 模型。
+    @param db 数据库会话，用于确定方言。
+    @return Insert 对应的 INSERT 语句。
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(model).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(model).on_conflict_do_nothing()
+    if dialect in ("mysql", "mariadb"):
+        return insert(model).prefix_with("IGNORE")
+    return insert(model)
+
+def insert_upsert(model, db: AsyncSession, index_elements, update_columns, extra_values=None):
+    """!
+    @brief 构造“冲突时更新”的 INSERT 语句。
+    @details SQLite/PostgreSQL 生成 ON CONFLICT (...) DO UPDATE，MySQL 生成
+             ON DUPLICATE KEY UPDATE。冲突行的 update_columns 取本次插入的值，
+             extra_values 中的列取给定值（例如 updated_at，onupdate 不会在此路径触发）。
+    @param model 目标 SQLAlchemy 模型。
+    @param db 数据库会话，用于确定方言。
+    @param index_elements 冲突判定所用的唯一列名列表。
+    @param update_columns 冲突时需要更新的列名列表。
+    @param extra_values 冲突时额外写入的列值。
+    @return Insert 对应的 INSERT 语句。
+    @exception NotImplementedError 当前方言不支持 upsert。
+    """
+    extra_values = extra_values or {}
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        statement = dialect_insert(model)
+        set_ = {column: statement.excluded[column] for column in update_columns}
+        set_.update(extra_values)
+        return statement.on_conflict_do_update(index_elements=index_elements, set_=set_)
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        statement = mysql_insert(model)
+        set_ = {column: statement.inserted[column] for column in update_columns}
+        set_.update(extra_values)
+        return statement.on_duplicate_key_update(set_)
+    raise NotImplementedError(f"upsert is not supported for dialect '{dialect}'")
+
+def chunked(items, size: int):
+    """!
+    @brief 将序列按固定大小切分。
+    @param items 待切分的序列。
+    @param size 每块的大小。
+    @yields list 每一块数据。
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 # 数据库会话依赖
 async def get_db() -> AsyncSession:
     """!
     @brief FastAPI 依赖项，用于获取数据库会话。
-    @details 在每个请求开始时创建一个会话，在请求结束时关闭。
+    @details 在每个请求开始时创建一个会话，在请求结束时关闭。会话的获取耗时、持有时间
+             和回滚次数通过 session_tracer 以结构化日志记录。HTTPException 与请求参数校验失败属于正常的
+             客户端错误响应（如 404、409、422），不视为数据库错误：不显式回滚也不记录，未提交的事务随会话关闭释放。
     @yields AsyncSession 数据库会话。
-    @exception Exception 当数据库操作发生错误时抛出异常。
+    @exception Exception 当数据库操作发生错误时回滚并重新抛出异常。
     """
-    print("DB Session: Acquiring session from pool.")
+    trace = session_tracer.begin()
     async with AsyncSessionLocal() as session:
-        print("DB Session: Acquired. Yielding to endpoint.")
+        trace.acquired()
         try:
             yield session
-            print("DB Session: Endpoint finished. Transaction implicitly managed by 'async with' if committed.")
+        except (HTTPException, RequestValidationError):
+            raise
         except Exception as e_get_db:
-            print(f"!!! DB Session: Exception bubbled up to get_db or occurred during session handling. Rolling back. !!!")
-            print(f"get_db error type: {type(e_get_db)}")
-            print(f"get_db error message: {str(e_get_db)}")
-            print("get_db stack trace:")
-            import traceback
-            print(traceback.format_exc())
             await session.rollback()
+            trace.rolled_back(e_get_db)
             raise
         finally:
-            print("DB Session: Releasing session back to pool (implicitly by 'async with').") 
\ No newline at end of file
+            trace.released()
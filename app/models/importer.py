@@ -0,0 +1,402 @@
+"""!
+@file importer.py
+@brief 员工批量写入与流式导入模块
+@details write_employees() 按邮箱批量写入员工，供批量创建接口与流式导入共用。
+         流式导入接受 CSV（首行为列名）或 NDJSON（每行一个 JSON 对象）：数据按到达的数据块增量解码并切分成行，
+         每凑满 IMPORT_CHUNK_SIZE 条有效数据即写入并提交一次事务（经 run_write，开启 WRITE_COALESCING 时由写入任务提交），内存占用只与数据块大小和每个事务的行数有关，与文件大小无关。
+         未写入的行（校验失败、邮箱冲突、被同一事务中后续同邮箱的行覆盖）逐行写入磁盘上的 CSV 错误报告，不在内存中累积。
+         导入任务登记在进程内的 ImportRegistry 中，导入过程中即可查询进度；只保留最近 IMPORT_JOBS_KEPT 个任务，
+         更早任务的错误报告随之删除。
+@date 2025.5.25
+"""
+
+import codecs
+import collections
+import csv
+import datetime
+import json
+import os
+import tempfile
+import uuid
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import BATCH_CHUNK_SIZE, IMPORT_CHUNK_SIZE, IMPORT_JOBS_KEPT, IMPORT_MAX_LINE_LENGTH, IMPORT_REPORT_DIR
+from app.core.responses import row_dicts
+from app.models.coalescer import run_write
+from app.models.database import chunked, insert_ignore, insert_upsert
+from app.models.employee import EmployeeDB
+from app.schemas.batch import BatchItemResult, ImportJobStatus
+from app.schemas.employee import EmployeeCreate
+
+# 支持的导入格式及其对应的 Content-Type
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# CSV 必须包含的列
+REQUIRED_COLUMNS = ("name", "email", "department", "position")
+
+# 解析出的一行：(行号, 字段字典)，无法解析时字段字典换为错误说明
+ParsedRow = Tuple[int, Union[Dict[str, Any], str]]
+
+class ImportFormatError(ValueError):
+    """!
+    @brief 数据流无法继续解析（编码错误、CSV 缺少必需的列、单行过长），导入就此终止。
+    """
+
+async def write_employees(
+    db: AsyncSession,
+    items: List[Tuple[int, EmployeeCreate]],
+    upsert: bool
+) -> List[Tuple[int, str, Optional[Dict[str, Any]]]]:
+    """!
+    @brief 按邮箱批量写入员工，不提交事务。
+    @details 每块数据先用一次 IN 查询确认已存在的邮箱，再用一条带 RETURNING 的
+             多行 INSERT 写入，省去逐行 refresh；INSERT 直接在连接上执行，不经过 ORM 的批量写入处理。upsert 为真时已存在的员工被更新，
+             否则记为 conflict。RETURNING 返回完整的行，供调用方发布变更事件。
+             调用方需保证同一批次内邮箱不重复。
+    @param db 数据库会话。
+    @param items (下标, EmployeeCreate) 列表。
+    @param upsert 是否更新已存在的员工。
+    @return List[Tuple[int, str, Optional[Dict[str, Any]]]] 每条数据的 (下标, 状态, 写入后的行)，冲突时行为 None。
+    """
+    outcomes = []
+    for chunk in chunked(items, BATCH_CHUNK_SIZE):
+        index_by_email = {employee.email: index for index, employee in chunk}
+        result = await db.execute(select(EmployeeDB.email).where(EmployeeDB.email.in_(list(index_by_email))))
+        existing = set(result.scalars().all())
+
+        rows = [employee.model_dump() for _, employee in chunk]
+        if upsert:
+            statement = insert_upsert(
+                EmployeeDB, db, ["email"], ["name", "department", "position", "phone"],
+                {"updated_at": datetime.datetime.utcnow()}
+            )
+        else:
+            rows = [row for row in rows if row["email"] not in existing]
+            statement = insert_ignore(EmployeeDB, db)
+
+        returned = {}
+        if rows:
+            connection = await db.connection()
+            result = await connection.execute(statement.returning(*EmployeeDB.__table__.columns), rows)
+            returned = {row["email"]: row for row in row_dicts(result.all(), result.keys())}
+
+        for email, index in index_by_email.items():
+            if email not in returned:
+                outcomes.append((index, "conflict", None))
+            elif email in existing:
+                outcomes.append((index, "updated", returned[email]))
+            else:
+                outcomes.append((index, "created", returned[email]))
+    return outcomes
+
+async def read_lines(chunks: AsyncIterable[bytes], max_length: int = IMPORT_MAX_LINE_LENGTH) -> AsyncIterator[List[str]]:
+    """!
+    @brief 把字节数据块增量解码为 UTF-8 文本并按换行符切分。
+    @details 每个数据块产出一次其中完整的行（不含换行符），跨数据块的半行留到下一块拼接；
+             开头的 BOM 被去掉，CRLF 行尾的 \\r 由调用方的解析器处理。
+    @param chunks 字节数据块。
+    @param max_length 单行的最大字符数。
+    @return AsyncIterator[List[str]] 每个数据块中完整的行。
+    @exception ImportFormatError 数据不是有效的 UTF-8，或单行超过 max_length。
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    final = False
+    chunks = chunks.__aiter__()
+    while not final:
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            chunk, final = b"", True
+        try:
+            pending += decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            raise ImportFormatError("Data is not valid UTF-8")
+        lines = pending.split("\n")
+        pending = lines.pop()
+        if len(pending) > max_length:
+            raise ImportFormatError(f"Line exceeds {max_length} characters")
+        if final and pending:
+            lines.append(pending)
+        if lines:
+            yield lines
+
+async def csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[ParsedRow]]:
+    """!
+    @brief 增量解析 CSV，首行为列名。
+    @details 引号内的字段可以跨行：一条记录累计的引号数为奇数时继续拼接下一行。
+             空字段视为未提供，列数与列名行不一致的行记为无法解析，未知的列被忽略。
+    @param chunks 字节数据块。
+    @return AsyncIterator[List[ParsedRow]] 每个数据块中完整的记录，行号为记录开始的物理行号。
+    @exception ImportFormatError 列名行缺少必需的列。
+    """
+    header: Optional[List[str]] = None
+    line_number = 0
+    record: List[str] = []
+    record_start = record_length = quotes = 0
+    async for lines in read_lines(chunks):
+        complete = []
+        for line in lines:
+            line_number += 1
+            if not record:
+                record_start = line_number
+            record.append(line)
+            record_length += len(line)
+            quotes += line.count('"')
+            if quotes % 2 == 0:
+                complete.append((record_start, "\n".join(record)))
+                record, record_length, quotes = [], 0, 0
+            elif record_length > IMPORT_MAX_LINE_LENGTH:
+                raise ImportFormatError(f"Record starting at line {record_start} exceeds {IMPORT_MAX_LINE_LENGTH} characters")
+
+        parsed = []
+        for (number, _), values in zip(complete, csv.reader(text for _, text in complete)):
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip() for name in values]
+                missing = [name for name in REQUIRED_COLUMNS if name not in header]
+                if missing:
+                    raise ImportFormatError(f"CSV header is missing columns: {', '.join(missing)}")
+            elif len(values) != len(header):
+                parsed.append((number, f"expected {len(header)} columns, got {len(values)}"))
+            else:
+                parsed.append((number, {name: value for name, value in zip(header, values) if value != ""}))
+        if parsed:
+            yield parsed
+    if record:
+        yield [(record_start, "unterminated quoted field")]
+
+async def ndjson_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[List[ParsedRow]]:
+    """!
+    @brief 增量解析 NDJSON，每个非空行为一个 JSON 对象。
+    @param chunks 字节数据块。
+    @return AsyncIterator[List[ParsedRow]] 每个数据块中的行。
+    """
+    line_number = 0
+    async for lines in read_lines(chunks):
+        parsed = []
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                parsed.append((line_number, f"invalid JSON: {e}"))
+                continue
+            parsed.append((line_number, value if isinstance(value, dict) else "expected a JSON object"))
+        if parsed:
+            yield parsed
+
+PARSERS = {"csv": csv_rows, "ndjson": ndjson_rows}
+
+class ImportJob:
+    """!
+    @brief 一次流式导入的进度、计数与错误报告。
+    @details 错误报告为 CSV 文件，列为 line（数据所在的行号）、status、email、detail，每提交一个事务刷新一次。
+    """
+
+    def __init__(self, format: str, upsert: bool, report_path: Optional[str] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.format = format
+        self.upsert = upsert
+        self.status = "running"
+        self.counts = dict.fromkeys(("rows", "created", "updated", "duplicate", "conflict", "invalid"), 0)
+        self.chunks = 0
+        self.error: Optional[str] = None
+        self.started_at = datetime.datetime.utcnow()
+        self.finished_at: Optional[datetime.datetime] = None
+        if report_path is None:
+            fd, report_path = tempfile.mkstemp(prefix=f"employee-import-{self.id}-", suffix=".csv", dir=IMPORT_REPORT_DIR)
+            self._report = open(fd, "w", newline="", encoding="utf-8")
+        else:
+            self._report = open(report_path, "w", newline="", encoding="utf-8")
+        self.report_path = report_path
+        self._writer = csv.writer(self._report)
+        self._writer.writerow(("line", "status", "email", "detail"))
+
+    @property
+    def finished(self) -> bool:
+        """!
+        @brief 导入是否已结束（完成或失败）。
+        """
+        return self.status != "running"
+
+    def reject(self, line: int, status: str, email: Optional[str], detail: str) -> None:
+        """!
+        @brief 记录一条未写入的数据。
+        @param line 行号。
+        @param status invalid、conflict 或 duplicate。
+        @param email 数据中的邮箱，无法解析时为 None。
+        @param detail 原因。
+        """
+        self.counts[status] += 1
+        self._writer.writerow((line, status, email or "", detail))
+
+    def finish(self, error: Optional[str] = None) -> None:
+        """!
+        @brief 结束导入并关闭错误报告。
+        @param error 导入终止的原因，正常完成时为 None。
+        """
+        self.status = "completed" if error is None else "failed"
+        self.error = error
+        self.finished_at = datetime.datetime.utcnow()
+        self._report.close()
+
+    def discard(self) -> None:
+        """!
+        @brief 删除错误报告文件。
+        """
+        if not self._report.closed:
+            self._report.close()
+        try:
+            os.remove(self.report_path)
+        except FileNotFoundError:
+            pass
+
+    def to_pydantic(self, errors_url: Optional[str] = None) -> ImportJobStatus:
+        """!
+        @brief 转换为 Pydantic 模型。
+        @param errors_url 错误报告的下载地址。
+        @return ImportJobStatus 导入任务的进度与结果。
+        """
+        return ImportJobStatus(
+            id=self.id,
+            status=self.status,
+            format=self.format,
+            upsert=self.upsert,
+            chunks=self.chunks,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            error=self.error,
+            errors_url=errors_url,
+            **self.counts
+        )
+
+# 每提交一个事务后调用：(导入任务, {"created": [...], "updated": [...]} 本事务写入后的行)
+ChunkCallback = Callable[[ImportJob, Dict[str, List[Dict[str, Any]]]], Awaitable[None]]
+
+async def _write_chunk(db: AsyncSession, job: ImportJob, pending: Dict[str, Tuple[int, EmployeeCreate]]) -> Dict[str, List[Dict[str, Any]]]:
+    """!
+    @brief 写入一个事务的有效数据并提交。
+    @param db 数据库会话。
+    @param job 导入任务。
+    @param pending 邮箱到 (行号, EmployeeCreate) 的映射。
+    @return Dict[str, List[Dict[str, Any]]] 新建与更新后的行。
+    """
+    async def write(session: AsyncSession) -> List[Tuple[int, str, Optional[Dict[str, Any]]]]:
+        return await write_employees(session, list(pending.values()), job.upsert)
+
+    emails = {line: employee.email for line, employee in pending.values()}
+    written: Dict[str, List[Dict[str, Any]]] = {"created": [], "updated": []}
+    for line, status, row in await run_write(db, write):
+        if row is None:
+            job.reject(line, status, emails[line], "email already exists")
+        else:
+            job.counts[status] += 1
+            written[status].append(row)
+    job.chunks += 1
+    job._report.flush()
+    return written
+
+async def import_employees(
+    db: AsyncSession,
+    chunks: AsyncIterable[bytes],
+    job: ImportJob,
+    on_chunk: Optional[ChunkCallback] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> ImportJob:
+    """!
+    @brief 从字节数据流导入员工，每 chunk_size 条有效数据提交一次事务。
+    @details 每行单独校验，校验失败的行记入错误报告而不影响其余数据。同一事务内邮箱重复时，
+             创建模式保留第一条，upsert 模式保留最后一条（同批量创建接口）；跨事务的重复邮箱在创建模式下记为 conflict，
+             在 upsert 模式下由后面的行更新。数据流无法继续解析或写入出错时任务记为 failed 并重新抛出异常，
+             此前已提交的事务不回滚。
+    @param db 数据库会话，调用方不应有未提交的写入。
+    @param chunks 字节数据块，如请求体流或分块读取的文件。
+    @param job 导入任务，其 format 决定解析方式。
+    @param on_chunk 每提交一个事务后调用的回调，用于失效缓存、发布事件或输出进度。
+    @param chunk_size 每个事务的最大有效数据条数。
+    @return ImportJob 已结束的导入任务。
+    @exception ImportFormatError 数据流无法继续解析。
+    """
+    pending: Dict[str, Tuple[int, EmployeeCreate]] = {}
+    try:
+        async for rows in PARSERS[job.format](chunks):
+            for line, raw in rows:
+                job.counts["rows"] += 1
+                if isinstance(raw, str):
+                    job.reject(line, "invalid", None, raw)
+                    continue
+                try:
+                    employee = EmployeeCreate.model_validate(raw)
+                except ValidationError as e:
+                    job.reject(line, "invalid", raw.get("email"), BatchItemResult.invalid(line, e).detail)
+                    continue
+
+                previous = pending.get(employee.email)
+                if previous is None:
+                    pending[employee.email] = (line, employee)
+                elif job.upsert:
+                    job.reject(previous[0], "duplicate", employee.email, f"superseded by line {line}")
+                    pending[employee.email] = (line, employee)
+                else:
+                    job.reject(line, "conflict", employee.email, f"duplicate email of line {previous[0]}")
+
+                if len(pending) >= chunk_size:
+                    written = await _write_chunk(db, job, pending)
+                    pending = {}
+                    if on_chunk is not None:
+                        await on_chunk(job, written)
+        if pending:
+            written = await _write_chunk(db, job, pending)
+            if on_chunk is not None:
+                await on_chunk(job, written)
+    except Exception as e:
+        await db.rollback()
+        job.finish(str(e) if isinstance(e, ImportFormatError) else f"{type(e).__name__}: {e}")
+        raise
+    job.finish()
+    return job
+
+class ImportRegistry:
+    """!
+    @brief 进程内的导入任务登记表，只保留最近的若干个任务。
+    """
+
+    def __init__(self, keep: int = IMPORT_JOBS_KEPT):
+        self.keep = keep
+        self._jobs: "collections.OrderedDict[str, ImportJob]" = collections.OrderedDict()
+
+    def start(self, format: str, upsert: bool) -> ImportJob:
+        """!
+        @brief 登记一个新的导入任务，超出保留数量时删除最早的已结束任务及其错误报告。
+        @param format 导入格式。
+        @param upsert 是否更新已存在的员工。
+        @return ImportJob 新的导入任务。
+        """
+        job = ImportJob(format, upsert)
+        self._jobs[job.id] = job
+        for old in [old for old in self._jobs.values() if old.finished][:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[old.id]
+            old.discard()
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """!
+        @brief 按 ID 查找导入任务。
+        @param job_id 任务 ID。
+        @return Optional[ImportJob] 导入任务，不存在或已被清理时为 None。
+        """
+        return self._jobs.get(job_id)
+
+# 全局导入任务登记表
+imports = ImportRegistry()
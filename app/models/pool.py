@@ -0,0 +1,102 @@
+"""!
+@file pool.py
+@brief 数据库连接池监控模块
+@details 统计连接的获取等待时间与持有时间，用于根据真实负载调整连接池大小
+@date 2025.5.25
+"""
+
+import time
+from typing import Dict
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+class PoolMetrics:
+    """!
+    @brief 连接池统计数据。
+    @details 等待时间指从请求连接到拿到连接的耗时（池中无空闲连接时包含排队和新建连接的时间），
+             持有时间指连接从借出到归还的耗时。
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.hold_seconds_total = 0.0
+        self.hold_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        """!
+        @brief 记录一次连接获取的等待时间。
+        @param seconds 等待秒数。
+        """
+        self.waits += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def observe_hold(self, seconds: float) -> None:
+        """!
+        @brief 记录一次连接的持有时间。
+        @param seconds 持有秒数。
+        """
+        self.checkins += 1
+        self.hold_seconds_total += seconds
+        self.hold_seconds_max = max(self.hold_seconds_max, seconds)
+
+    def snapshot(self, pool) -> Dict[str, float]:
+        """!
+        @brief 获取当前统计数据与连接池状态。
+        @param pool SQLAlchemy 连接池。
+        @return Dict[str, float] 统计数据。
+        """
+        stats = {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_avg": self.wait_seconds_total / self.waits if self.waits else 0.0,
+            "hold_seconds_total": self.hold_seconds_total,
+            "hold_seconds_max": self.hold_seconds_max,
+            "hold_seconds_avg": self.hold_seconds_total / self.checkins if self.checkins else 0.0,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return stats
+
+# 全局连接池统计
+pool_metrics = PoolMetrics()
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """!
+    @brief 记录连接获取等待时间的异步队列连接池。
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            pool_metrics.observe_wait(time.perf_counter() - start)
+        return connection
+
+def instrument_pool(engine) -> None:
+    """!
+    @brief 为引擎的连接池注册持有时间统计。
+    @param engine SQLAlchemy 同步引擎（AsyncEngine.sync_engine）。
+    """
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            pool_metrics.observe_hold(time.perf_counter() - checked_out_at)
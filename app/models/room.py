@@ -0,0 +1,36 @@
+"""!
+@file room.py
+@brief 会议室数据库模型模块
+@details 定义会议室的数据库模型和转换方法。会议通过 room_id 引用会议室，占用时段的冲突检测见 app.models.schedule。
+@date 2025.5.25
+"""
+
+import datetime
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.database import Base
+
+class RoomDB(Base):
+    """!
+    @brief SQLAlchemy 模型，数据库中的 'rooms' 表。
+    @details 存储会议室的名称与座位数。capacity 为空表示不限座位数。
+    """
+    __tablename__ = "rooms"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    capacity: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+
+    def to_pydantic(self) -> "Room":
+        """!
+        @brief 将 SQLAlchemy 模型转换为 Pydantic 模型。
+        @return Room 转换后的 Pydantic 模型实例。
+        """
+        from app.schemas.room import Room
+        return Room(
+            id=self.id,
+            name=self.name,
+            capacity=self.capacity,
+            created_at=self.created_at
+        )
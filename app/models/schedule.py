@@ -0,0 +1,277 @@
+"""!
+@file schedule.py
+@brief 会议室占用与日程冲突检测模块
+@details 会议在 date 当天的 [start_time, end_time) 时段占用 room_id 指定的会议室，两个时段相交即冲突（首尾相接不算冲突）。
+         冲突检测与空闲时段查询都沿复合索引 (room_id, date, start_time, end_time) 定位到同一会议室当天的会议，
+         不扫描其他会议室或其他日期的会议。
+         先查再写需要与其他写入串行：写入前以 lock_rooms() 对涉及的会议室行执行一次空 UPDATE，
+         其他数据库由此取得行锁；SQLite 由此开始写事务并取得写锁，随后的冲突查询读到的是最新提交的数据。
+         批量创建时同批次的会议之间用进程内的 RoomSchedule（每个会议室每天一个按开始时间排序的列表）检测冲突。
+         员工预定会议时同样检测其已预定的会议与目标会议是否时段重叠：沿会议日期索引找到同一天的会议，
+         再以预定表索引 (conference_id, employee_id) 逐个确认，不读取员工的全部预定。
+         单个预定把检测作为 EMPLOYEE_CONFLICT 子句嵌入占用名额的条件 UPDATE（见 app.models.capacity），
+         成功路径不增加查询；SQLite 下该 UPDATE 持有写锁，同一员工的并发预定不会同时通过检测，
+         其他数据库先以 lock_employees() 锁定员工行。候补转为正式预定时以 WAITLIST_CONFLICT 跳过有冲突的候补，
+         修改会议的日期或起止时间时以 booked_employees_with_conflicts() 复查已预定的员工。
+         这里的函数都不提交事务。
+@date 2025.5.25
+"""
+
+import bisect
+import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import Select, and_, bindparam, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.models.booking import EmployeeConferenceDB, WaitlistDB
+from app.models.conference import ConferenceDB
+from app.models.employee import EmployeeDB
+from app.models.room import RoomDB
+
+def overlaps(room_id, date, start_time, end_time):
+    """!
+    @brief 会议与给定会议室时段冲突的条件。
+    @param room_id 会议室 ID（可为列，用于关联子查询）。
+    @param date 日期。
+    @param start_time 开始时间。
+    @param end_time 结束时间。
+    @return 用于 WHERE 的条件。
+    """
+    return and_(
+        ConferenceDB.room_id == room_id,
+        ConferenceDB.date == date,
+        ConferenceDB.start_time < end_time,
+        ConferenceDB.end_time > start_time,
+    )
+
+async def lock_rooms(db: AsyncSession, room_ids: Iterable[int]) -> Set[int]:
+    """!
+    @brief 锁定会议室行直到事务结束，使随后的冲突检测与写入不与其他写入交错。
+    @param db 数据库会话。
+    @param room_ids 会议室 ID。
+    @return Set[int] 存在的会议室 ID。
+    """
+    room_ids = sorted(set(room_ids))
+    if not room_ids:
+        return set()
+    result = await db.execute(
+        update(RoomDB).where(RoomDB.id.in_(room_ids)).values(id=RoomDB.id).returning(RoomDB.id),
+        execution_options={"synchronize_session": False},
+    )
+    return set(result.scalars())
+
+async def find_conflict(
+    db: AsyncSession,
+    room_id: int,
+    date: datetime.date,
+    start_time: datetime.time,
+    end_time: datetime.time,
+    exclude_id: Optional[int] = None,
+) -> Optional[int]:
+    """!
+    @brief 查找占用会议室给定时段的会议。
+    @param db 数据库会话。
+    @param room_id 会议室 ID。
+    @param date 日期。
+    @param start_time 开始时间。
+    @param end_time 结束时间。
+    @param exclude_id 不参与检测的会议 ID（更新会议时为其自身）。
+    @return Optional[int] 冲突会议的 ID，没有冲突时为 None。
+    """
+    query = select(ConferenceDB.id).where(overlaps(room_id, date, start_time, end_time))
+    if exclude_id is not None:
+        query = query.where(ConferenceDB.id != exclude_id)
+    return (await db.execute(query.limit(1))).scalar()
+
+def available_rooms_query(
+    date: datetime.date,
+    start_time: datetime.time,
+    end_time: datetime.time,
+    min_capacity: Optional[int] = None,
+) -> Select:
+    """!
+    @brief 给定时段空闲的会议室查询，按 ID 排序。
+    @details 每个会议室以关联子查询沿复合索引检测冲突。
+    @param date 日期。
+    @param start_time 开始时间。
+    @param end_time 结束时间。
+    @param min_capacity 座位数下限，不限座位数的会议室总是满足。
+    @return Select 列为会议室表各列的查询。
+    """
+    query = select(*RoomDB.__table__.columns).where(~exists().where(overlaps(RoomDB.id, date, start_time, end_time)))
+    if min_capacity is not None:
+        query = query.where(RoomDB.capacity.is_(None) | (RoomDB.capacity >= min_capacity))
+    return query.order_by(RoomDB.id)
+
+async def busy_intervals(db: AsyncSession, room_id: int, date: datetime.date) -> List[Tuple[datetime.time, datetime.time]]:
+    """!
+    @brief 获取会议室当天被占用的时段，按开始时间排序。
+    @param db 数据库会话。
+    @param room_id 会议室 ID。
+    @param date 日期。
+    @return List[Tuple[time, time]] (开始时间, 结束时间) 列表。
+    """
+    result = await db.execute(
+        select(ConferenceDB.start_time, ConferenceDB.end_time).where(
+            ConferenceDB.room_id == room_id, ConferenceDB.date == date, ConferenceDB.start_time.is_not(None)
+        ).order_by(ConferenceDB.start_time)
+    )
+    return [tuple(row) for row in result.all()]
+
+def free_slots(
+    busy: List[Tuple[datetime.time, datetime.time]],
+    day_start: datetime.time,
+    day_end: datetime.time,
+    min_duration: datetime.timedelta = datetime.timedelta(0),
+) -> List[Tuple[datetime.time, datetime.time]]:
+    """!
+    @brief 由按开始时间排序的占用时段计算空闲时段。
+    @param busy 占用时段，可以相互重叠。
+    @param day_start 可用时间窗口的开始。
+    @param day_end 可用时间窗口的结束。
+    @param min_duration 空闲时段的最短时长，更短的空闲时段不返回。
+    @return List[Tuple[time, time]] 窗口内的空闲时段。
+    """
+    day = datetime.date.min
+    slots = []
+    cursor = day_start
+    for start, end in busy + [(day_end, day_end)]:
+        start = min(max(start, day_start), day_end)
+        if start > cursor and datetime.datetime.combine(day, start) - datetime.datetime.combine(day, cursor) >= min_duration:
+            slots.append((cursor, start))
+        cursor = max(cursor, min(end, day_end))
+    return slots
+
+class RoomSchedule:
+    """!
+    @brief 进程内的会议室占用索引，用于检测同一批次中的会议相互冲突。
+    @details 每个 (会议室, 日期) 保存按开始时间排序、互不相交的时段列表，检测与加入都以二分查找定位。
+    """
+
+    def __init__(self):
+        self._intervals: Dict[Tuple[int, datetime.date], List[Tuple[datetime.time, datetime.time]]] = {}
+
+    def add(self, room_id: int, date: datetime.date, start_time: datetime.time, end_time: datetime.time) -> bool:
+        """!
+        @brief 与已加入的时段不冲突时加入该时段。
+        @param room_id 会议室 ID。
+        @param date 日期。
+        @param start_time 开始时间。
+        @param end_time 结束时间。
+        @return bool 是否加入；与已加入的时段冲突时为 False。
+        """
+        intervals = self._intervals.setdefault((room_id, date), [])
+        index = bisect.bisect_left(intervals, (start_time, end_time))
+        if index > 0 and intervals[index - 1][1] > start_time:
+            return False
+        if index < len(intervals) and intervals[index][0] < end_time:
+            return False
+        intervals.insert(index, (start_time, end_time))
+        return True
+
+def _employee_conflicts_query(employees, *columns) -> Select:
+    """!
+    @brief 构造员工已预定且与目标会议时段重叠的会议查询，参数为 conference_id。
+    @details 目标会议的日期与起止时间以按主键查找的标量子查询给出，查询沿会议日期索引读取当天的会议，
+             再按 (conference_id, employee_id) 索引确认员工是否预定，耗时与员工的历史预定数无关。
+             目标会议没有起止时间时查询结果为空。语句在导入时构造一次，预定时只绑定参数。
+    @param employees 限定员工的条件，作用于预定表的 employee_id 列。
+    @param columns 返回的列。
+    @return Select 查询。
+    """
+    target = aliased(ConferenceDB)
+    conference_id = bindparam("conference_id")
+
+    def target_value(column):
+        return select(column).where(target.id == conference_id).scalar_subquery()
+
+    return select(*columns).select_from(ConferenceDB).join(
+        EmployeeConferenceDB, EmployeeConferenceDB.conference_id == ConferenceDB.id
+    ).where(
+        ConferenceDB.date == target_value(target.date),
+        ConferenceDB.start_time < target_value(target.end_time),
+        ConferenceDB.end_time > target_value(target.start_time),
+        ConferenceDB.id != conference_id,
+        employees,
+    )
+
+def _booked_employees():
+    """!
+    @brief 已预定目标会议（conference_id 参数）的员工条件。
+    """
+    booked = aliased(EmployeeConferenceDB)
+    return EmployeeConferenceDB.employee_id.in_(
+        select(booked.employee_id).where(booked.conference_id == bindparam("conference_id"))
+    )
+
+# 参数 employee_ids 给出的员工
+_EMPLOYEE_IDS = EmployeeConferenceDB.employee_id.in_(bindparam("employee_ids", expanding=True))
+
+# 返回冲突会议各列、只返回员工 ID 与返回目标会议已预定员工中有冲突者的查询
+_CONFLICTING_CONFERENCE = _employee_conflicts_query(_EMPLOYEE_IDS, *ConferenceDB.__table__.columns).limit(1)
+_CONFLICTING_EMPLOYEES = _employee_conflicts_query(_EMPLOYEE_IDS, EmployeeConferenceDB.employee_id).distinct()
+_CONFLICTING_BOOKED_EMPLOYEES = _employee_conflicts_query(_booked_employees(), EmployeeConferenceDB.employee_id).distinct()
+
+# 员工有时段冲突的 EXISTS 子句，嵌入其他语句时需绑定 conference_id 与 employee_ids（见 conflict_params）
+EMPLOYEE_CONFLICT = _employee_conflicts_query(_EMPLOYEE_IDS, EmployeeConferenceDB.employee_id).correlate(None).exists()
+
+# 候补员工有时段冲突的 EXISTS 子句，关联外层查询的候补名单行，需绑定 conference_id
+WAITLIST_CONFLICT = _employee_conflicts_query(
+    EmployeeConferenceDB.employee_id == WaitlistDB.employee_id, EmployeeConferenceDB.employee_id
+).correlate(WaitlistDB).exists()
+
+def conflict_params(conference_id: int, employee_ids: List[int]) -> Dict:
+    """!
+    @brief 冲突查询与 EMPLOYEE_CONFLICT 的绑定参数。
+    @param conference_id 目标会议 ID。
+    @param employee_ids 员工 ID。
+    @return Dict 参数字典。
+    """
+    return {"conference_id": conference_id, "employee_ids": employee_ids}
+
+async def lock_employees(db: AsyncSession, employee_ids: Iterable[int]) -> None:
+    """!
+    @brief 在 SQLite 以外的数据库中锁定员工行直到事务结束，使同一员工的预定串行检测冲突。
+    @details SQLite 下事务的第一条写语句已取得整个数据库的写锁，不再额外查询。
+    @param db 数据库会话。
+    @param employee_ids 员工 ID。
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return
+    employee_ids = sorted(set(employee_ids))
+    if employee_ids:
+        await db.execute(select(EmployeeDB.id).where(EmployeeDB.id.in_(employee_ids)).with_for_update())
+
+async def find_employee_conflict(db: AsyncSession, conference_id: int, employee_id: int) -> Optional[Dict]:
+    """!
+    @brief 查找员工已预定且与目标会议时段重叠的会议。
+    @param db 数据库会话，需已持有写锁（见 lock_employees）。
+    @param conference_id 目标会议 ID。
+    @param employee_id 员工 ID。
+    @return Optional[Dict] 冲突会议的各列，没有冲突时为 None。
+    """
+    result = await db.execute(_CONFLICTING_CONFERENCE, conflict_params(conference_id, [employee_id]))
+    row = result.first()
+    return None if row is None else dict(row._mapping)
+
+async def employees_with_conflicts(db: AsyncSession, conference_id: int, employee_ids: List[int]) -> Set[int]:
+    """!
+    @brief 筛选出已预定了与目标会议时段重叠的会议的员工。
+    @param db 数据库会话，需已持有写锁。
+    @param conference_id 目标会议 ID。
+    @param employee_ids 员工 ID。
+    @return Set[int] 有冲突的员工 ID。
+    """
+    result = await db.execute(_CONFLICTING_EMPLOYEES, conflict_params(conference_id, employee_ids))
+    return set(result.scalars())
+
+async def booked_employees_with_conflicts(db: AsyncSession, conference_id: int) -> Set[int]:
+    """!
+    @brief 筛选出已预定目标会议、同时又预定了与其时段重叠的其他会议的员工。
+    @details 修改会议的日期或起止时间后（已 flush）调用，按修改后的时段检测。
+    @param db 数据库会话，需已持有写锁。
+    @param conference_id 目标会议 ID。
+    @return Set[int] 有冲突的员工 ID。
+    """
+    result = await db.execute(_CONFLICTING_BOOKED_EMPLOYEES, {"conference_id": conference_id})
+    return set(result.scalars())
@@ -0,0 +1,120 @@
+"""!
+@file schema.py
+@brief 数据库结构初始化模块
+@details 导入全部模型并创建数据表。应用启动时不再自动执行，由 python -m app.cli init-db 显式调用。
+         create_all 不会修改已存在的表，新增的列在这里以 ALTER TABLE ADD COLUMN 补齐，
+         新增的索引以 CREATE INDEX 补齐，模型中已移除的索引以 DROP INDEX 删除，SQLite 下的全文索引表及其同步触发器、统计汇总表的维护触发器在建表后补齐，可重复执行。
+@date 2025.5.25
+"""
+
+from typing import List, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateColumn
+from app.models.database import Base, engine
+from app.models import booking, conference, employee, room, stats, version  # noqa: F401  注册全部模型
+from app.models.search import create_search_indexes
+from app.models.stats import create_stats_triggers
+
+def _backfill_booked_count(connection) -> None:
+    """!
+    @brief 按已有预定记录回填会议的已预定人数。
+    @details 先分组统计再批量更新，避免逐个会议执行相关子查询。
+    @param connection 同步连接。
+    """
+    rows = connection.execute(text(
+        "SELECT conference_id, COUNT(*) FROM employee_conference GROUP BY conference_id"
+    )).all()
+    if rows:
+        connection.execute(
+            text("UPDATE conferences SET booked_count = :count WHERE id = :id"),
+            [{"id": conference_id, "count": count} for conference_id, count in rows]
+        )
+
+# 新增列补齐后执行的回填函数，键为 (表名, 列名)
+BACKFILLS = {
+    ("conferences", "booked_count"): _backfill_booked_count,
+}
+
+def _add_missing_columns(connection) -> List[str]:
+    """!
+    @brief 为已存在的表补齐模型中新增的列。
+    @param connection 同步连接。
+    @return List[str] 新增的列，形如 表名.列名。
+    """
+    inspector = inspect(connection)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column_ddl}"))
+            backfill = BACKFILLS.get((table.name, column.name))
+            if backfill is not None:
+                backfill(connection)
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+# 模型中已移除、升级时需删除的索引，键为表名
+OBSOLETE_INDEXES = {
+    "conferences": ("ix_conferences_booked_count",),
+}
+
+def _drop_obsolete_indexes(connection) -> List[str]:
+    """!
+    @brief 删除已存在的表上模型中已移除的索引。
+    @param connection 同步连接。
+    @return List[str] 删除的索引名。
+    """
+    inspector = inspect(connection)
+    dropped = []
+    for table_name, names in OBSOLETE_INDEXES.items():
+        if not inspector.has_table(table_name):
+            continue
+        for index in inspector.get_indexes(table_name):
+            if index["name"] not in names:
+                continue
+            if connection.dialect.name in ("mysql", "mariadb"):
+                connection.execute(text(f"DROP INDEX {index['name']} ON {table_name}"))
+            else:
+                connection.execute(text(f"DROP INDEX {index['name']}"))
+            dropped.append(index["name"])
+    return dropped
+
+def _add_missing_indexes(connection) -> List[str]:
+    """!
+    @brief 为已存在的表补齐模型中新增的索引。
+    @param connection 同步连接。
+    @return List[str] 新增的索引名。
+    """
+    inspector = inspect(connection)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                added.append(index.name)
+    return added
+
+async def create_schema(bind: AsyncEngine = engine) -> List[Tuple[str, str]]:
+    """!
+    @brief 创建尚不存在的数据表，并为已存在的表补齐新增的列、索引、全文索引表和统计触发器，删除已移除的索引。
+    @param bind 目标异步引擎。
+    @return List[Tuple[str, str]] 变更的对象，形如 (类型, 名称)：类型为 column（名称为 表名.列名）、index、
+            dropped_index（删除的索引）、search_index（新建或重建的全文索引表）或 stats_table（重建的汇总表）。
+    """
+    async with bind.begin() as conn:
+        added = [("column", name) for name in await conn.run_sync(_add_missing_columns)]
+        added += [("dropped_index", name) for name in await conn.run_sync(_drop_obsolete_indexes)]
+        added += [("index", name) for name in await conn.run_sync(_add_missing_indexes)]
+        await conn.run_sync(Base.metadata.create_all)
+        added += [("search_index", name) for name in await conn.run_sync(create_search_indexes)]
+        added += [("stats_table", name) for name in await conn.run_sync(create_stats_triggers)]
+    return added
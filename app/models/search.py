@@ -0,0 +1,140 @@
+"""!
+@file search.py
+@brief 员工与会议的全文检索模块
+@details SQLite 下为员工（name、email）和会议（name、description）各建一张 FTS5 外部内容表，
+         只保存倒排索引、不重复存储原文。分词器为 trigram：按每三个连续字符建索引，不依赖空格分词，
+         中文姓名、会议名称的任意片段都能检索（unicode61 把一串汉字视为一个词，只能整词或前缀匹配）。
+         trigram 只能检索至少三个字符的词，更短的词（如两个字的姓名）退化为对原表各列的子串 LIKE 匹配，
+         沿主键扫描，凑满一页即停止。
+         索引由 INSERT/UPDATE/DELETE 触发器与原表保持同步，ORM、批量 upsert 和级联删除都会经过触发器；
+         会议的 UPDATE 触发器只监听 name 和 description，名额变更不会改写索引。
+         其他数据库没有 FTS5，退化为对同样的列做前缀 LIKE 匹配。
+@date 2025.5.25
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Select, column, literal_column, or_, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.conference import ConferenceDB
+from app.models.employee import EmployeeDB
+
+class SearchIndex(NamedTuple):
+    """!
+    @brief 一张全文索引表的定义。
+    """
+    name: str
+    source: str
+    columns: tuple
+
+# 索引表的分词器；建表时写入表定义，分词器不同的旧索引表由 create_search_indexes() 重建
+TOKENIZER = "trigram"
+
+# trigram 能检索的最短词长（字符数）
+MIN_MATCH_LENGTH = 3
+
+# 参与全文检索的模型及其索引表
+SEARCH_INDEXES: Dict[type, SearchIndex] = {
+    EmployeeDB: SearchIndex("employees_fts", "employees", ("name", "email")),
+    ConferenceDB: SearchIndex("conferences_fts", "conferences", ("name", "description")),
+}
+
+def _ddl(index: SearchIndex) -> List[str]:
+    """!
+    @brief 生成索引表和同步触发器的 DDL。
+    @param index 索引表定义。
+    @return List[str] 可重复执行的建表与建触发器语句。
+    """
+    columns = ", ".join(index.columns)
+    new_values = ", ".join(f"new.{name}" for name in index.columns)
+    old_values = ", ".join(f"old.{name}" for name in index.columns)
+    insert_new = f"INSERT INTO {index.name}(rowid, {columns}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {index.name}({index.name}, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.name} USING fts5("
+        f"{columns}, content='{index.source}', content_rowid='id', tokenize='{TOKENIZER}')",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_ai AFTER INSERT ON {index.source} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_ad AFTER DELETE ON {index.source} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_au AFTER UPDATE OF {columns} ON {index.source} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+def create_search_indexes(connection) -> List[str]:
+    """!
+    @brief 创建尚不存在的全文索引表和同步触发器。
+    @details 新建的索引表从原表重建一次索引，之后由触发器维护；分词器不是 TOKENIZER 的旧索引表先删除再重建。
+             非 SQLite 数据库不做任何事。
+    @param connection 同步连接，原表需已存在。
+    @return List[str] 新建或重建的索引表名。
+    """
+    if connection.dialect.name != "sqlite":
+        return []
+    created = []
+    for index in SEARCH_INDEXES.values():
+        definition = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": index.name}
+        ).scalar()
+        if definition is not None and f"tokenize='{TOKENIZER}'" not in definition:
+            connection.execute(text(f"DROP TABLE {index.name}"))
+            definition = None
+        for statement in _ddl(index):
+            connection.execute(text(statement))
+        if definition is None:
+            connection.execute(text(f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')"))
+            created.append(index.name)
+    return created
+
+def search_terms(q: str) -> List[str]:
+    """!
+    @brief 把用户输入按空白拆分为检索词，去掉不含字母或数字的词。
+    @param q 用户输入。
+    @return List[str] 检索词。
+    """
+    return [term for term in q.split() if any(char.isalnum() for char in term)]
+
+def fts_query(terms: List[str]) -> str:
+    """!
+    @brief 将检索词转换为 FTS5 查询。
+    @details 每个词加引号转义后作为一个短语，trigram 分词下即子串匹配，词之间为 AND。
+    @param terms 至少 MIN_MATCH_LENGTH 个字符的检索词。
+    @return str FTS5 查询。
+    """
+    return " ".join('"%s"' % term.replace('"', '""') for term in terms)
+
+def apply_search(db: AsyncSession, query: Select, model, q: Optional[str]) -> Tuple[Select, Any]:
+    """!
+    @brief 为模型查询附加关键字检索条件。
+    @details SQLite 下至少 MIN_MATCH_LENGTH 个字符的词与索引表按 rowid 连接并以 MATCH 过滤，同时返回索引表的 rowid 作为分页列：
+             FTS5 按 rowid 升序产出匹配行，按它排序和定位游标时 LIMIT 可以提前结束，
+             不必先取出全部匹配行再排序。更短的词以各列子串 LIKE 过滤。其他数据库以各列前缀 LIKE 过滤。
+    @param db 数据库会话，用于确定方言。
+    @param query 以 model 为主体的查询。
+    @param model EmployeeDB 或 ConferenceDB。
+    @param q 用户输入的关键字，为 None 时不检索。
+    @return Tuple[Select, Any] 附加条件后的查询，以及分页应使用的 ID 列。
+    """
+    if q is None:
+        return query, model.id
+    index = SEARCH_INDEXES[model]
+    columns = [getattr(model, name) for name in index.columns]
+    if db.get_bind().dialect.name == "sqlite":
+        terms = search_terms(q)
+        matched = [term for term in terms if len(term) >= MIN_MATCH_LENGTH]
+        query = query.where(*(
+            or_(*(source.contains(term, autoescape=True) for source in columns))
+            for term in terms if len(term) < MIN_MATCH_LENGTH
+        ))
+        if not matched:
+            return query, model.id
+        fts = table(index.name, column("rowid"))
+        query = query.join(fts, fts.c.rowid == model.id).where(
+            literal_column(f"{index.name}.{index.name}").match(fts_query(matched))
+        )
+        return query, fts.c.rowid
+
+    terms = q.split()
+    if not terms:
+        return query, model.id
+    return query.where(*(
+        or_(*(source.startswith(term, autoescape=True) for source in columns))
+        for term in terms
+    )), model.id
@@ -0,0 +1,288 @@
+"""!
+@file stats.py
+@brief 预定统计汇总表模块
+@details 按部门（员工数、预定数）和按会议月份（会议数、预定数）维护汇总表，统计接口直接读取汇总行，
+         不再对整张 employee_conference 表执行 GROUP BY。每个会议的预定数即 conferences.booked_count。
+         汇总表由触发器随写入增量维护（SQLite、PostgreSQL 与 MySQL/MariaDB）：预定的增删、员工与会议的增删、
+         部门与会议日期的修改都会经过触发器，ORM、批量写入、upsert 和级联删除都不会遗漏。
+         员工与会议的删除在 BEFORE DELETE 中扣除其全部预定，级联删除预定时已看不到被删除的员工或会议，
+         关联表触发器对应的那一侧不会重复扣除；MySQL 的级联删除不触发关联表的触发器，由 BEFORE DELETE 一并扣除两侧。
+         其他数据库不受支持，建表时抛出 NotImplementedError，统计查询不会退化为对原表的聚合。
+@date 2025.5.25
+"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Integer, String, Select, select, text
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.database import Base
+
+class DepartmentStatsDB(Base):
+    """!
+    @brief SQLAlchemy 模型，数据库中的 'department_stats' 表。
+    @details 每个部门一行：员工数与该部门员工的预定总数。
+    """
+    __tablename__ = "department_stats"
+
+    department: Mapped[str] = mapped_column(String(100), primary_key=True)
+    employees: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bookings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+class MonthlyStatsDB(Base):
+    """!
+    @brief SQLAlchemy 模型，数据库中的 'monthly_stats' 表。
+    @details 每个月份（YYYY-MM，按会议日期）一行：会议数与这些会议的预定总数。
+    """
+    __tablename__ = "monthly_stats"
+
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    conferences: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bookings: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+# 各数据库中日期所在月份（YYYY-MM）的 SQL；SQLite 中 Date 列以 YYYY-MM-DD 文本存储
+MONTH_SQL = {
+    "sqlite": "substr({}, 1, 7)",
+    "postgresql": "to_char({}, 'YYYY-MM')",
+    "mysql": "DATE_FORMAT({}, '%Y-%m')",
+}
+
+def _dialect_name(connection) -> str:
+    """!
+    @brief 汇总表维护所用的方言名，MariaDB 与 MySQL 相同。
+    @exception NotImplementedError 不支持的数据库。
+    """
+    name = connection.dialect.name
+    name = "mysql" if name == "mariadb" else name
+    if name not in MONTH_SQL:
+        raise NotImplementedError(f"stats triggers are not supported for dialect '{name}'")
+    return name
+
+def _triggers(month, distinct: str) -> Dict[str, Tuple[str, Optional[str], str]]:
+    """!
+    @brief SQLite 与 PostgreSQL 共用的触发器定义。
+    @details 两者都支持 ON CONFLICT 形式的 upsert，级联删除也都会触发关联表上的触发器。
+    @param month 把日期表达式转为月份 SQL 的函数。
+    @param distinct 两个值不同（NULL 视为相等）的比较运算符。
+    @return Dict[str, Tuple[str, Optional[str], str]] 触发器名称到 (时机与事件, 条件, 语句体) 的映射。
+    """
+    return {
+        "stats_employee_conference_ai": ("AFTER INSERT ON employee_conference", None, f"""
+            INSERT INTO department_stats(department, employees, bookings)
+                SELECT department, 0, 1 FROM employees WHERE id = new.employee_id
+                ON CONFLICT(department) DO UPDATE SET bookings = department_stats.bookings + 1;
+            INSERT INTO monthly_stats(month, conferences, bookings)
+                SELECT {month("date")}, 0, 1 FROM conferences WHERE id = new.conference_id
+                ON CONFLICT(month) DO UPDATE SET bookings = monthly_stats.bookings + 1;"""),
+        "stats_employee_conference_ad": ("AFTER DELETE ON employee_conference", None, f"""
+            UPDATE department_stats SET bookings = bookings - 1
+                WHERE department = (SELECT department FROM employees WHERE id = old.employee_id);
+            UPDATE monthly_stats SET bookings = bookings - 1
+                WHERE month = (SELECT {month("date")} FROM conferences WHERE id = old.conference_id);"""),
+        "stats_employees_ai": ("AFTER INSERT ON employees", None, """
+            INSERT INTO department_stats(department, employees, bookings) VALUES (new.department, 1, 0)
+                ON CONFLICT(department) DO UPDATE SET employees = department_stats.employees + 1;"""),
+        "stats_employees_bd": ("BEFORE DELETE ON employees", None, """
+            UPDATE department_stats SET employees = employees - 1,
+                bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE employee_id = old.id)
+                WHERE department = old.department;"""),
+        "stats_employees_au": ("AFTER UPDATE OF department ON employees", f"old.department {distinct} new.department", """
+            UPDATE department_stats SET employees = employees - 1,
+                bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE employee_id = new.id)
+                WHERE department = old.department;
+            INSERT INTO department_stats(department, employees, bookings)
+                SELECT new.department, 1, COUNT(*) FROM employee_conference WHERE employee_id = new.id
+                ON CONFLICT(department) DO UPDATE SET employees = department_stats.employees + 1,
+                    bookings = department_stats.bookings + excluded.bookings;"""),
+        "stats_conferences_ai": ("AFTER INSERT ON conferences", None, f"""
+            INSERT INTO monthly_stats(month, conferences, bookings) VALUES ({month("new.date")}, 1, 0)
+                ON CONFLICT(month) DO UPDATE SET conferences = monthly_stats.conferences + 1;"""),
+        "stats_conferences_bd": ("BEFORE DELETE ON conferences", None, f"""
+            UPDATE monthly_stats SET conferences = conferences - 1,
+                bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE conference_id = old.id)
+                WHERE month = {month("old.date")};"""),
+        "stats_conferences_au": ("AFTER UPDATE OF date ON conferences", f"{month('old.date')} {distinct} {month('new.date')}", f"""
+            UPDATE monthly_stats SET conferences = conferences - 1,
+                bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE conference_id = new.id)
+                WHERE month = {month("old.date")};
+            INSERT INTO monthly_stats(month, conferences, bookings)
+                SELECT {month("new.date")}, 1, COUNT(*) FROM employee_conference WHERE conference_id = new.id
+                ON CONFLICT(month) DO UPDATE SET conferences = monthly_stats.conferences + 1,
+                    bookings = monthly_stats.bookings + excluded.bookings;"""),
+    }
+
+def _mysql_triggers() -> Dict[str, str]:
+    """!
+    @brief MySQL/MariaDB 的触发器定义。
+    @details 外键级联删除不会触发关联表上的触发器，员工与会议的 BEFORE DELETE 因此同时扣除另一侧汇总表中的预定；
+             UPDATE OF 列与 WHEN 条件不受支持，改在语句体中判断。
+    @return Dict[str, str] 触发器名称到 CREATE TRIGGER 名称之后部分的映射。
+    """
+    month = MONTH_SQL["mysql"].format
+    return {
+        "stats_employee_conference_ai": f"""AFTER INSERT ON employee_conference FOR EACH ROW BEGIN
+            INSERT INTO department_stats(department, employees, bookings)
+                SELECT department, 0, 1 FROM employees WHERE id = NEW.employee_id
+                ON DUPLICATE KEY UPDATE bookings = bookings + 1;
+            INSERT INTO monthly_stats(month, conferences, bookings)
+                SELECT {month("date")}, 0, 1 FROM conferences WHERE id = NEW.conference_id
+                ON DUPLICATE KEY UPDATE bookings = bookings + 1;
+        END""",
+        "stats_employee_conference_ad": f"""AFTER DELETE ON employee_conference FOR EACH ROW BEGIN
+            UPDATE department_stats SET bookings = bookings - 1
+                WHERE department = (SELECT department FROM employees WHERE id = OLD.employee_id);
+            UPDATE monthly_stats SET bookings = bookings - 1
+                WHERE month = (SELECT {month("date")} FROM conferences WHERE id = OLD.conference_id);
+        END""",
+        "stats_employees_ai": """AFTER INSERT ON employees FOR EACH ROW BEGIN
+            INSERT INTO department_stats(department, employees, bookings) VALUES (NEW.department, 1, 0)
+                ON DUPLICATE KEY UPDATE employees = employees + 1;
+        END""",
+        "stats_employees_bd": f"""BEFORE DELETE ON employees FOR EACH ROW BEGIN
+            UPDATE department_stats SET employees = employees - 1,
+                bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE employee_id = OLD.id)
+                WHERE department = OLD.department;
+            UPDATE monthly_stats JOIN (
+                SELECT {month("conferences.date")} AS month, COUNT(*) AS bookings
+                FROM employee_conference JOIN conferences ON conferences.id = employee_conference.conference_id
+                WHERE employee_conference.employee_id = OLD.id GROUP BY 1
+            ) AS deleted ON deleted.month = monthly_stats.month
+            SET monthly_stats.bookings = monthly_stats.bookings - deleted.bookings;
+        END""",
+        "stats_employees_au": """AFTER UPDATE ON employees FOR EACH ROW BEGIN
+            IF NOT (OLD.department <=> NEW.department) THEN
+                UPDATE department_stats SET employees = employees - 1,
+                    bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE employee_id = NEW.id)
+                    WHERE department = OLD.department;
+                INSERT INTO department_stats(department, employees, bookings)
+                    SELECT NEW.department, 1, COUNT(*) FROM employee_conference WHERE employee_id = NEW.id
+                    ON DUPLICATE KEY UPDATE employees = employees + 1, bookings = bookings + VALUES(bookings);
+            END IF;
+        END""",
+        "stats_conferences_ai": f"""AFTER INSERT ON conferences FOR EACH ROW BEGIN
+            INSERT INTO monthly_stats(month, conferences, bookings) VALUES ({month("NEW.date")}, 1, 0)
+                ON DUPLICATE KEY UPDATE conferences = conferences + 1;
+        END""",
+        "stats_conferences_bd": f"""BEFORE DELETE ON conferences FOR EACH ROW BEGIN
+            UPDATE monthly_stats SET conferences = conferences - 1,
+                bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE conference_id = OLD.id)
+                WHERE month = {month("OLD.date")};
+            UPDATE department_stats JOIN (
+                SELECT employees.department, COUNT(*) AS bookings
+                FROM employee_conference JOIN employees ON employees.id = employee_conference.employee_id
+                WHERE employee_conference.conference_id = OLD.id GROUP BY employees.department
+            ) AS deleted ON deleted.department = department_stats.department
+            SET department_stats.bookings = department_stats.bookings - deleted.bookings;
+        END""",
+        "stats_conferences_au": f"""AFTER UPDATE ON conferences FOR EACH ROW BEGIN
+            IF NOT ({month("OLD.date")} <=> {month("NEW.date")}) THEN
+                UPDATE monthly_stats SET conferences = conferences - 1,
+                    bookings = bookings - (SELECT COUNT(*) FROM employee_conference WHERE conference_id = NEW.id)
+                    WHERE month = {month("OLD.date")};
+                INSERT INTO monthly_stats(month, conferences, bookings)
+                    SELECT {month("NEW.date")}, 1, COUNT(*) FROM employee_conference WHERE conference_id = NEW.id
+                    ON DUPLICATE KEY UPDATE conferences = conferences + 1, bookings = bookings + VALUES(bookings);
+            END IF;
+        END""",
+    }
+
+def _create_trigger_statements(dialect: str) -> Dict[str, List[str]]:
+    """!
+    @brief 按方言生成创建各触发器的语句。
+    @param dialect sqlite、postgresql 或 mysql。
+    @return Dict[str, List[str]] 触发器名称到创建语句的映射；PostgreSQL 先创建同名的触发器函数。
+    """
+    if dialect == "mysql":
+        return {name: [f"CREATE TRIGGER {name} {body}"] for name, body in _mysql_triggers().items()}
+
+    statements = {}
+    if dialect == "sqlite":
+        for name, (event, condition, body) in _triggers(MONTH_SQL["sqlite"].format, "IS NOT").items():
+            when = f" WHEN {condition}" if condition else ""
+            statements[name] = [f"CREATE TRIGGER {name} {event}{when} BEGIN{body}\n        END"]
+        return statements
+
+    for name, (event, condition, body) in _triggers(MONTH_SQL["postgresql"].format, "IS DISTINCT FROM").items():
+        result = "old" if event.startswith("BEFORE") else "NULL"
+        when = f" WHEN ({condition})" if condition else ""
+        statements[name] = [
+            f"CREATE OR REPLACE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN{body}\n"
+            f"            RETURN {result};\n        END $$",
+            f"CREATE TRIGGER {name} {event} FOR EACH ROW{when} EXECUTE FUNCTION {name}()",
+        ]
+    return statements
+
+# 查询已有触发器名称的语句
+_EXISTING_TRIGGERS = {
+    "sqlite": "SELECT name FROM sqlite_master WHERE type = 'trigger'",
+    "postgresql": "SELECT trigger_name FROM information_schema.triggers WHERE trigger_schema = current_schema()",
+    "mysql": "SELECT trigger_name FROM information_schema.triggers WHERE trigger_schema = DATABASE()",
+}
+
+def _rebuild_statements(month) -> List[str]:
+    """!
+    @brief 从原表重建汇总表的语句。
+    @param month 把日期表达式转为月份 SQL 的函数。
+    """
+    return [
+        "DELETE FROM department_stats",
+        """INSERT INTO department_stats(department, employees, bookings)
+            SELECT department, COUNT(*),
+                COALESCE(SUM((SELECT COUNT(*) FROM employee_conference WHERE employee_id = employees.id)), 0)
+            FROM employees GROUP BY department""",
+        "DELETE FROM monthly_stats",
+        f"""INSERT INTO monthly_stats(month, conferences, bookings)
+            SELECT {month("date")}, COUNT(*),
+                COALESCE(SUM((SELECT COUNT(*) FROM employee_conference WHERE conference_id = conferences.id)), 0)
+            FROM conferences GROUP BY {month("date")}""",
+    ]
+
+def rebuild_stats(connection) -> None:
+    """!
+    @brief 从员工、会议和预定表重建汇总表。
+    @param connection 同步连接。
+    """
+    for statement in _rebuild_statements(MONTH_SQL[_dialect_name(connection)].format):
+        connection.execute(text(statement))
+
+def create_stats_triggers(connection) -> List[str]:
+    """!
+    @brief 创建尚不存在的汇总表维护触发器。
+    @details 首次创建触发器时从原表重建一次汇总表，之后由触发器维护。
+    @param connection 同步连接，汇总表与原表需已存在。
+    @return List[str] 重建的汇总表名。
+    @exception NotImplementedError 不支持的数据库。
+    """
+    dialect = _dialect_name(connection)
+    existing = set(connection.execute(text(_EXISTING_TRIGGERS[dialect])).scalars())
+    statements = _create_trigger_statements(dialect)
+    if existing.issuperset(statements):
+        return []
+    for name, creates in statements.items():
+        if name not in existing:
+            for statement in creates:
+                connection.execute(text(statement))
+    rebuild_stats(connection)
+    return [DepartmentStatsDB.__tablename__, MonthlyStatsDB.__tablename__]
+
+def department_stats_query() -> Select:
+    """!
+    @brief 按部门统计员工数与预定数的查询，按部门名称排序。
+    @return Select 列为 department、employees、bookings 的查询。
+    """
+    return select(DepartmentStatsDB.department, DepartmentStatsDB.employees, DepartmentStatsDB.bookings).where(
+        (DepartmentStatsDB.employees > 0) | (DepartmentStatsDB.bookings > 0)
+    ).order_by(DepartmentStatsDB.department)
+
+def monthly_stats_query(month_from: Optional[str] = None, month_to: Optional[str] = None) -> Select:
+    """!
+    @brief 按会议月份统计会议数与预定数的查询，按月份排序。
+    @param month_from 起始月份（含），形如 2025-01。
+    @param month_to 结束月份（含）。
+    @return Select 列为 month、conferences、bookings 的查询。
+    """
+    month = MonthlyStatsDB.month
+    query = select(month, MonthlyStatsDB.conferences, MonthlyStatsDB.bookings).where(MonthlyStatsDB.conferences > 0)
+    if month_from is not None:
+        query = query.where(month >= month_from)
+    if month_to is not None:
+        query = query.where(month <= month_to)
+    return query.order_by(month)
@@ -0,0 +1,70 @@
+"""!
+@file version.py
+@brief 数据版本号模型模块
+@details 为各数据集合维护单调递增的版本号及其修改时间，用于构造 ETag / Last-Modified。
+         行本身的 updated_at 无法反映删除的变化，这类写操作需在同一事务中递增版本号。
+         预定关系没有自己的修改时间，以会议的 updated_at 代替：每次预定与取消都会刷新会议的 updated_at。
+@date 2025.5.25
+"""
+
+import datetime
+from typing import Optional, Tuple
+from sqlalchemy import Integer, String, DateTime, ScalarSelect, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.database import Base, insert_upsert
+
+class DataVersionDB(Base):
+    """!
+    @brief SQLAlchemy 模型，数据库中的 'data_versions' 表。
+    @details 每个数据集合（conferences、employees、bookings）一行。
+    """
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+
+async def bump_version(db: AsyncSession, name: str) -> None:
+    """!
+    @brief 递增数据集合的版本号，不提交事务。
+    @param db 数据库会话。
+    @param name 数据集合名称。
+    """
+    now = datetime.datetime.utcnow()
+    statement = insert_upsert(
+        DataVersionDB, db, ["name"], [],
+        {"version": DataVersionDB.version + 1, "updated_at": now}
+    ).values(name=name, version=1, updated_at=now)
+    await db.execute(statement)
+
+async def collection_state(
+    db: AsyncSession,
+    name: str,
+    model,
+    updated_column=None
+) -> Tuple[int, int, Optional[datetime.datetime]]:
+    """!
+    @brief 用一次聚合查询获取数据集合的状态。
+    @param db 数据库会话。
+    @param name 数据集合名称。
+    @param model 数据集合对应的 SQLAlchemy 模型，用于统计行数。
+    @param updated_column 行级修改时间列，或直接给出最后修改时间的标量子查询（例如取自其他表），
+           为 None 时只使用版本号的修改时间。
+    @return Tuple[int, int, Optional[datetime]] (行数, 版本号, 最后修改时间)。
+    """
+    version_row = select(DataVersionDB).where(DataVersionDB.name == name)
+    columns = [
+        func.count(),
+        version_row.with_only_columns(DataVersionDB.version).scalar_subquery(),
+        version_row.with_only_columns(DataVersionDB.updated_at).scalar_subquery(),
+    ]
+    if isinstance(updated_column, ScalarSelect):
+        columns.append(updated_column)
+    elif updated_column is not None:
+        columns.append(func.max(updated_column))
+    row = (await db.execute(select(*columns).select_from(model))).one()
+
+    count, version, version_updated_at = row[0], row[1] or 0, row[2]
+    timestamps = [ts for ts in (version_updated_at, *row[3:]) if ts is not None]
+    return count, version, max(timestamps) if timestamps else None
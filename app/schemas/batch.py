@@ -0,0 +1,50 @@
+import datetime
+from typing import Optional
+from pydantic import BaseModel, Field, ValidationError
+
+class BatchItemResult(BaseModel):
+    """!
+    @brief 批量写入中单条数据的处理结果。
+    @details status 取值：created（新建）、updated（已更新）、conflict（与已有数据冲突）、
+             duplicate（同批次中被后续同键数据覆盖）、invalid（数据校验失败）。
+    """
+    index: int = Field(..., example=0)
+    status: str = Field(..., example="created")
+    id: Optional[int] = Field(None, example=1)
+    detail: Optional[str] = Field(None, example=None)
+
+    @classmethod
+    def invalid(cls, index: int, error: ValidationError) -> "BatchItemResult":
+        """!
+        @brief 根据 Pydantic 校验错误构造 invalid 结果。
+        @param index 数据在批次中的下标。
+        @param error 校验错误。
+        @return BatchItemResult 状态为 invalid 的结果。
+        """
+        detail = "; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+        )
+        return cls(index=index, status="invalid", detail=detail)
+
+class ImportJobStatus(BaseModel):
+    """!
+    @brief 流式导入任务的进度与结果。
+    @details status 取值：running（导入中）、completed（已完成）、failed（数据流无法继续解析或写入出错而终止，
+             此前已提交的数据块仍然有效）。rows 为已解析的数据行数，其余计数含义同 BatchItemResult 的状态；
+             未写入的行（invalid、conflict、duplicate）逐行列在 errors_url 指向的 CSV 错误报告中。
+    """
+    id: str = Field(..., example="3f2a9c1d5e7b")
+    status: str = Field(..., example="completed")
+    format: str = Field(..., example="csv")
+    upsert: bool = Field(..., example=True)
+    rows: int = Field(0, example=1000)
+    created: int = Field(0, example=990)
+    updated: int = Field(0, example=5)
+    duplicate: int = Field(0, example=0)
+    conflict: int = Field(0, example=0)
+    invalid: int = Field(0, example=5)
+    chunks: int = Field(0, example=1, description="已提交的事务数")
+    started_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+    error: Optional[str] = Field(None, example=None)
+    errors_url: Optional[str] = Field(None, example="/api/employees/imports/3f2a9c1d5e7b/errors")
@@ -1,4 +1,5 @@
 import datetime
+from typing import List
 from pydantic import BaseModel, Field
 
 class EmployeeConference(BaseModel):
@@ -11,6 +12,17 @@ class EmployeeConference(BaseModel):
     class Config:
         orm_mode = True
 
+class BookingDetail(BaseModel):
+    """!
+    @brief 带会议与员工信息的预定记录，由一次连接查询得到，客户端无需再拉取会议和员工列表。
+    """
+    conference_id: int = Field(..., example=1)
+    conference_name: str = Field(..., example="年度技术大会")
+    conference_date: datetime.date = Field(..., example="2024-03-20")
+    employee_id: int = Field(..., example=1)
+    employee_name: str = Field(..., example="张三")
+    employee_department: str = Field(..., example="技术部")
+
 class ConferenceBookingBase(BaseModel):
     """!
     @brief 会议预定 Pydantic 模型。
@@ -32,4 +44,40 @@ class ConferenceBooking(ConferenceBookingBase):
     booking_date: datetime.datetime = Field(..., example="2024-03-20T10:00:00")
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class BookingBatchCreate(BaseModel):
+    """!
+    @brief 批量预定会议时使用的 Pydantic 模型。
+    """
+    employee_ids: List[int] = Field(..., min_length=1, example=[1, 2, 3])
+
+class BookingBatchResult(BaseModel):
+    """!
+    @brief 批量预定会议的结果。
+    @details created 为本次新建的预定，existing 为已存在的预定，waitlisted 为因会议已满加入候补名单的员工，
+             invalid 为不存在的员工 ID，conflicting 为已预定了同一时段其他会议的员工。
+    """
+    conference_id: int = Field(..., example=1)
+    created: List[int] = Field(default_factory=list, example=[1, 2])
+    existing: List[int] = Field(default_factory=list, example=[3])
+    waitlisted: List[int] = Field(default_factory=list, example=[4])
+    invalid: List[int] = Field(default_factory=list, example=[])
+    conflicting: List[int] = Field(default_factory=list, example=[])
+
+class WaitlistEntry(BaseModel):
+    """!
+    @brief 候补名单中的一项。
+    @details position 从 1 开始，1 表示下一个空出的名额将分配给该员工。
+    """
+    conference_id: int = Field(..., example=1)
+    employee_id: int = Field(..., example=1)
+    position: int = Field(..., example=1)
+
+
+class AttendeeCount(BaseModel):
+    """!
+    @brief 会议的与会人数。
+    """
+    conference_id: int = Field(..., example=1)
+    count: int = Field(..., example=42)
@@ -1,6 +1,22 @@
 import datetime
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+def check_schedule(room_id: Optional[int], start_time: Optional[datetime.time], end_time: Optional[datetime.time]) -> None:
+    """!
+    @brief 检查会议室与起止时间的组合是否有效。
+    @details 起止时间需同时提供且结束晚于开始；指定会议室时必须提供起止时间。
+    @param room_id 会议室 ID。
+    @param start_time 开始时间。
+    @param end_time 结束时间。
+    @exception ValueError 组合无效。
+    """
+    if (start_time is None) != (end_time is None):
+        raise ValueError("start_time and end_time must be given together")
+    if start_time is not None and end_time <= start_time:
+        raise ValueError("end_time must be later than start_time")
+    if room_id is not None and start_time is None:
+        raise ValueError("start_time and end_time are required when room_id is given")
 
 class ConferenceBase(BaseModel):
     """!
@@ -10,12 +26,20 @@ class ConferenceBase(BaseModel):
     date: datetime.date = Field(..., example="2008-1-1")
     location: str = Field(..., min_length=1, max_length=255, example="会议地点")
     description: Optional[str] = Field(None, example="会议描述")
+    capacity: Optional[int] = Field(None, ge=0, example=100, description="人数上限，不传表示不限")
+    room_id: Optional[int] = Field(None, example=1, description="会议室 ID，指定时需同时提供起止时间")
+    start_time: Optional[datetime.time] = Field(None, example="09:00", description="会议当天的开始时间")
+    end_time: Optional[datetime.time] = Field(None, example="10:30", description="会议当天的结束时间")
 
 class ConferenceCreate(ConferenceBase):
     """!
     @brief 创建新会议时使用的 Pydantic 模型。
     """
-    pass
+
+    @model_validator(mode="after")
+    def validate_schedule(self) -> "ConferenceCreate":
+        check_schedule(self.room_id, self.start_time, self.end_time)
+        return self
 
 class ConferenceUpdate(ConferenceBase):
     """!
@@ -25,12 +49,17 @@ class ConferenceUpdate(ConferenceBase):
     date: Optional[datetime.date] = Field(None, example="2008-2-2")
     location: Optional[str] = Field(None, min_length=1, max_length=255, example="会议地点更改")
     description: Optional[str] = Field(None, example="会议描述更改")
+    capacity: Optional[int] = Field(None, ge=0, example=200)
+    room_id: Optional[int] = Field(None, example=2)
+    start_time: Optional[datetime.time] = Field(None, example="14:00")
+    end_time: Optional[datetime.time] = Field(None, example="15:00")
 
 class Conference(ConferenceBase):
     """!
     @brief 表示一个会议对象的完整 Pydantic 模型，包含 ID。
     """
     id: int = Field(..., example=1)
+    booked_count: int = Field(0, example=42)
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
@@ -0,0 +1,33 @@
+import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class RoomBase(BaseModel):
+    """!
+    @brief 会议室 Pydantic 模型。
+    """
+    name: str = Field(..., min_length=1, max_length=255, example="A座1层会议室1")
+    capacity: Optional[int] = Field(None, ge=0, example=20, description="座位数，不传表示不限")
+
+class RoomCreate(RoomBase):
+    """!
+    @brief 创建新会议室时使用的 Pydantic 模型。
+    """
+    pass
+
+class Room(RoomBase):
+    """!
+    @brief 表示一个会议室对象的完整 Pydantic 模型，包含 ID。
+    """
+    id: int = Field(..., example=1)
+    created_at: datetime.datetime
+
+    class Config:
+        orm_mode = True
+
+class TimeSlot(BaseModel):
+    """!
+    @brief 会议室在某一天的一个空闲时段（左闭右开）。
+    """
+    start_time: datetime.time = Field(..., example="09:00:00")
+    end_time: datetime.time = Field(..., example="10:30:00")
@@ -0,0 +1,29 @@
+import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+class DepartmentStats(BaseModel):
+    """!
+    @brief 一个部门的员工数与预定数。
+    """
+    department: str = Field(..., example="技术部")
+    employees: int = Field(..., example=120)
+    bookings: int = Field(..., example=860)
+
+class MonthlyStats(BaseModel):
+    """!
+    @brief 一个月份（按会议日期）的会议数与预定数。
+    """
+    month: str = Field(..., example="2025-06")
+    conferences: int = Field(..., example=42)
+    bookings: int = Field(..., example=1300)
+
+class ConferenceAttendance(BaseModel):
+    """!
+    @brief 一个会议的预定人数。
+    """
+    id: int = Field(..., example=1)
+    name: str = Field(..., example="年度技术大会")
+    date: datetime.date = Field(..., example="2025-06-01")
+    capacity: Optional[int] = Field(None, example=100)
+    booked_count: int = Field(..., example=87)
@@ -0,0 +1,235 @@
+"""!
+@file api.py
+@brief API 负载基准测试
+@details 在生成好的 SQLite 数据库副本上，通过进程内 ASGI 客户端以指定并发依次压测 app/api 下的每个路由，
+         输出各场景的 p50/p95/p99 延迟、吞吐量、状态码分布与峰值内存（JSON），可用 benchmarks.compare 跨提交比较。
+         用法：python -m benchmarks.api --db bench.db --employees 100000 --conferences 10000 --bookings 1000000
+               --concurrency 16 --requests 500 --output api.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+from benchmarks.common import asgi_client, configure_environment, latency_summary, peak_rss_kb, write_report
+from benchmarks.seed import seed
+
+class Context:
+    """!
+    @brief 场景之间共享的状态。
+    @details 写入类场景把创建出的 ID 记录下来，供后续的更新、取消和删除场景使用。
+    """
+
+    def __init__(self, employees: int, conferences: int, random_seed: int):
+        self.rng = random.Random(random_seed)
+        self.employees = employees
+        self.conferences = conferences
+        self.created_conferences: List[int] = []
+        self.created_employees: List[int] = []
+        self.booked: List[tuple] = []
+
+    def employee_id(self) -> int:
+        return self.rng.randint(1, self.employees)
+
+    def conference_id(self) -> int:
+        return self.rng.randint(1, self.conferences)
+
+class Scenario(NamedTuple):
+    """!
+    @brief 单个压测场景。
+    @details build(ctx, i) 返回 (method, url, 请求参数, 响应回调)；
+             limit 限制请求数（如全量列表），source 指定依赖的已创建 ID 列表名。
+    """
+    name: str
+    build: Callable
+    limit: Optional[int] = None
+    source: Optional[str] = None
+
+def _conference_body(ctx: Context) -> dict:
+    return {
+        "name": f"压测会议-{uuid.uuid4().hex[:8]}",
+        "date": (datetime.date(2025, 1, 1) + datetime.timedelta(days=ctx.rng.randrange(365))).isoformat(),
+        "location": "压测会议室",
+    }
+
+def _employee_body(ctx: Context) -> dict:
+    return {
+        "name": "压测员工",
+        "email": f"bench-{uuid.uuid4().hex}@example.com",
+        "department": "技术部",
+        "position": "工程师",
+    }
+
+def _collect(target: str, key: str = "id"):
+    """!
+    @brief 生成把响应中的 ID 追加到共享状态的回调。
+    """
+    def callback(ctx: Context, response) -> None:
+        if response.status_code < 400:
+            getattr(ctx, target).append(response.json()[key])
+    return callback
+
+def _book(ctx: Context, i: int):
+    conference_id, employee_id = ctx.conference_id(), ctx.employee_id()
+
+    def callback(ctx: Context, response) -> None:
+        if response.status_code < 400:
+            ctx.booked.append((conference_id, employee_id))
+
+    return "POST", f"/api/conferences/{conference_id}/book", {"params": {"employee_id": employee_id}}, callback
+
+# 场景按顺序执行：先读后写，写入场景创建的数据由后面的取消、删除场景清理
+SCENARIOS = [
+    Scenario("conferences.list_page", lambda ctx, i: (
+        "GET", "/api/conferences/", {"params": {"limit": 100, "after_id": ctx.rng.randrange(ctx.conferences)}}, None)),
+    Scenario("conferences.list_all", lambda ctx, i: ("GET", "/api/conferences/", {}, None), limit=5),
+    Scenario("conferences.list_stream", lambda ctx, i: ("GET", "/api/conferences/", {"params": {"stream": "true"}}, None), limit=5),
+    Scenario("conferences.get", lambda ctx, i: ("GET", f"/api/conferences/{ctx.conference_id()}", {}, None)),
+    Scenario("employees.list_page", lambda ctx, i: (
+        "GET", "/api/employees/", {"params": {"limit": 100, "after_id": ctx.rng.randrange(ctx.employees)}}, None)),
+    Scenario("employees.list_all", lambda ctx, i: ("GET", "/api/employees/", {}, None), limit=3),
+    Scenario("employees.list_stream", lambda ctx, i: ("GET", "/api/employees/", {"params": {"stream": "true"}}, None), limit=3),
+    Scenario("employees.get", lambda ctx, i: ("GET", f"/api/employees/{ctx.employee_id()}", {}, None)),
+    Scenario("bookings.attendees", lambda ctx, i: ("GET", f"/api/conferences/{ctx.conference_id()}/attendees", {}, None)),
+    Scenario("bookings.employee_conferences", lambda ctx, i: (
+        "GET", f"/api/employees/{ctx.employee_id()}/conferences", {}, None)),
+    Scenario("bookings.list_all", lambda ctx, i: ("GET", "/api/conferences/bookings", {}, None), limit=2),
+    Scenario("conferences.create", lambda ctx, i: (
+        "POST", "/api/conferences/", {"json": _conference_body(ctx)}, _collect("created_conferences"))),
+    Scenario("conferences.batch", lambda ctx, i: (
+        "POST", "/api/conferences/batch", {"json": [_conference_body(ctx) for _ in range(50)]}, None), limit=50),
+    Scenario("conferences.update", lambda ctx, i: (
+        "PUT", f"/api/conferences/{ctx.created_conferences[i]}", {"json": {"description": f"更新 {i}"}}, None),
+        source="created_conferences"),
+    Scenario("employees.create", lambda ctx, i: (
+        "POST", "/api/employees/", {"json": _employee_body(ctx)}, _collect("created_employees"))),
+    Scenario("employees.batch", lambda ctx, i: (
+        "POST", "/api/employees/batch", {"json": [_employee_body(ctx) for _ in range(50)]}, None), limit=50),
+    Scenario("employees.update", lambda ctx, i: (
+        "PUT", f"/api/employees/{ctx.created_employees[i]}", {"json": {"position": "高级工程师"}}, None),
+        source="created_employees"),
+    Scenario("bookings.book", _book),
+    Scenario("bookings.book_batch", lambda ctx, i: (
+        "POST", f"/api/conferences/{ctx.conference_id()}/bookings:batch",
+        {"json": {"employee_ids": [ctx.employee_id() for _ in range(50)]}}, None), limit=50),
+    Scenario("bookings.cancel", lambda ctx, i: (
+        "DELETE", "/api/conferences/{}/bookings/{}".format(*ctx.booked[i]), {}, None), source="booked"),
+    Scenario("employees.delete", lambda ctx, i: (
+        "DELETE", f"/api/employees/{ctx.created_employees[i]}", {}, None), source="created_employees"),
+    Scenario("conferences.delete", lambda ctx, i: (
+        "DELETE", f"/api/conferences/{ctx.created_conferences[i]}", {}, None), source="created_conferences"),
+]
+
+async def run_scenario(client, ctx: Context, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    """!
+    @brief 以固定并发执行一个场景。
+    @param client ASGI 客户端。
+    @param ctx 共享状态。
+    @param scenario 场景。
+    @param requests 请求数上限。
+    @param concurrency 并发数。
+    @return dict 场景结果。
+    """
+    total = requests if scenario.limit is None else min(requests, scenario.limit)
+    if scenario.source is not None:
+        total = min(total, len(getattr(ctx, scenario.source)))
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    next_index = iter(range(total))
+
+    async def worker():
+        for i in next_index:
+            method, url, kwargs, callback = scenario.build(ctx, i)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+            if callback is not None:
+                callback(ctx, response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        **latency_summary(latencies, elapsed),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+async def run(requests: int, concurrency: int, sizes: Dict[str, int], only: Optional[List[str]], random_seed: int) -> dict:
+    """!
+    @brief 依次执行所有场景。
+    @return dict 各场景结果。
+    """
+    ctx = Context(sizes["employees"], sizes["conferences"], random_seed)
+    results = {}
+    async with asgi_client() as client:
+        for scenario in SCENARIOS:
+            if only and not any(scenario.name.startswith(prefix) for prefix in only):
+                continue
+            results[scenario.name] = await run_scenario(client, ctx, scenario, requests, concurrency)
+            print(f"{scenario.name}: p50={results[scenario.name]['p50_ms']:.2f}ms", file=sys.stderr)
+    return results
+
+def dataset_sizes(path: Path) -> Dict[str, int]:
+    """!
+    @brief 读取数据库中的数据规模。
+    @param path SQLite 数据库文件路径。
+    @return Dict[str, int] 员工、会议和预定数量。
+    """
+    with sqlite3.connect(path) as connection:
+        return {
+            "employees": connection.execute("SELECT COUNT(*) FROM employees").fetchone()[0],
+            "conferences": connection.execute("SELECT COUNT(*) FROM conferences").fetchone()[0],
+            "bookings": connection.execute("SELECT COUNT(*) FROM employee_conference").fetchone()[0],
+        }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="API 负载基准测试")
+    parser.add_argument("--db", help="已生成的数据库文件，不存在时按下列规模生成；默认使用临时文件")
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--conferences", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=8, help="并发请求数")
+    parser.add_argument("--requests", type=int, default=200, help="每个场景的请求数")
+    parser.add_argument("--only", nargs="*", help="只运行名称以这些前缀开头的场景，如 conferences bookings.book")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", help="结果 JSON 文件路径，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(args.db) if args.db else Path(tmp) / "seed.db"
+        if not source.exists():
+            seed(source, args.employees, args.conferences, args.bookings, args.seed)
+        # 写入场景会修改数据，始终在副本上运行，保证每次测试的初始数据一致
+        database = Path(tmp) / "bench.db"
+        shutil.copyfile(source, database)
+        sizes = dataset_sizes(database)
+
+        configure_environment(database)
+        results = asyncio.run(run(args.requests, args.concurrency, sizes, args.only, args.seed))
+
+    write_report({
+        "benchmark": "api",
+        "dataset": sizes,
+        "concurrency": args.concurrency,
+        "requests_per_scenario": args.requests,
+        "scenarios": results,
+        "peak_rss_kb": peak_rss_kb(),
+    }, args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""!
+@file common.py
+@brief 基准测试公共工具
+@details 提供延迟统计、峰值内存读取、报告输出，以及在进程内通过 ASGI 驱动应用的客户端
+"""
+
+import contextlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """!
+    @brief 计算一组测量值的统计量。
+    @param values 测量值列表。
+    @return Dict[str, float] 中位数、最小值和最大值。
+    """
+    return {"median": statistics.median(values), "min": min(values), "max": max(values)}
+
+def latency_summary(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """!
+    @brief 计算延迟分位数与吞吐量。
+    @param latencies 每个请求的延迟（秒）。
+    @param elapsed 整轮请求的总耗时（秒）。
+    @return Dict[str, float] p50/p95/p99/平均延迟（毫秒）与吞吐量（请求/秒）。
+    """
+    if not latencies:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "throughput_rps": 0.0}
+    if len(latencies) == 1:
+        p50 = p95 = p99 = latencies[0]
+    else:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    return {
+        "p50_ms": p50 * 1000,
+        "p95_ms": p95 * 1000,
+        "p99_ms": p99 * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+    }
+
+def peak_rss_kb() -> int:
+    """!
+    @brief 读取当前进程的峰值常驻内存。
+    @return int 峰值内存（KB，Linux 下 ru_maxrss 的单位）。
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def git_revision() -> Optional[str]:
+    """!
+    @brief 获取当前提交，便于跨提交比较结果。
+    @return Optional[str] 提交哈希，不在 git 仓库中时为 None。
+    """
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, check=True, capture_output=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+def write_report(report: dict, output: Optional[str]) -> None:
+    """!
+    @brief 输出 JSON 报告。
+    @param report 报告内容。
+    @param output 输出文件路径，为 None 时输出到标准输出。
+    """
+    report.setdefault("git_revision", git_revision())
+    report.setdefault("python", sys.version.split()[0])
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if output:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+def configure_environment(database_path: Path) -> None:
+    """!
+    @brief 在导入应用前设置基准测试所需的环境变量。
+    @param database_path SQLite 数据库文件路径。
+    """
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database_path}"
+    os.environ.setdefault("DB_SESSION_LOG_SAMPLE_RATE", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+@contextlib.asynccontextmanager
+async def asgi_client():
+    """!
+    @brief 启动应用并创建进程内 ASGI 客户端。
+    @details 需先调用 configure_environment()，应用在此处才被导入。
+             应用内未处理的异常按 500 响应返回，而不是在客户端抛出，以便计入错误数。
+    @yields httpx.AsyncClient 直连应用的 HTTP 客户端。
+    """
+    import httpx
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            yield client
@@ -0,0 +1,61 @@
+"""!
+@file compare.py
+@brief 基准测试结果比较
+@details 比较两次 benchmarks.api 输出的 JSON，列出每个场景的延迟与吞吐量变化。
+         延迟增加或吞吐量下降超过阈值时以非零状态退出，便于在 CI 中使用。
+         用法：python -m benchmarks.compare base.json head.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 参与比较的指标及其方向：1 表示越小越好，-1 表示越大越好
+METRICS = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_rps": -1}
+
+def compare(base: dict, head: dict, threshold: float) -> tuple:
+    """!
+    @brief 比较两份结果。
+    @param base 基准结果。
+    @param head 新结果。
+    @param threshold 视为退化的相对变化阈值。
+    @return tuple (输出行列表, 退化项列表)
+    """
+    lines = [f"{'scenario':<32}{'metric':<16}{'base':>12}{'head':>12}{'change':>10}"]
+    regressions = []
+    for name, head_result in head["scenarios"].items():
+        base_result = base["scenarios"].get(name)
+        if base_result is None:
+            continue
+        for metric, direction in METRICS.items():
+            before, after = base_result[metric], head_result[metric]
+            change = (after - before) / before if before else 0.0
+            flag = ""
+            if change * direction > threshold:
+                flag = "  !"
+                regressions.append((name, metric, change))
+            lines.append(f"{name:<32}{metric:<16}{before:>12.2f}{after:>12.2f}{change:>+10.1%}{flag}")
+    base_rss, head_rss = base.get("peak_rss_kb"), head.get("peak_rss_kb")
+    if base_rss and head_rss:
+        lines.append(f"{'(process)':<32}{'peak_rss_kb':<16}{base_rss:>12}{head_rss:>12}{(head_rss - base_rss) / base_rss:>+10.1%}")
+    return lines, regressions
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="比较两次 API 基准测试结果")
+    parser.add_argument("base", help="基准结果 JSON")
+    parser.add_argument("head", help="新结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="视为退化的相对变化，默认 0.1（10%%）")
+    args = parser.parse_args(argv)
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    lines, regressions = compare(base, head, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} 项指标退化超过 {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
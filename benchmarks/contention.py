@@ -0,0 +1,114 @@
+"""!
+@file contention.py
+@brief 热点会议并发预定基准测试
+@details 所有员工以指定并发同时预定同一个有人数上限的会议，随后部分员工并发取消，
+         记录两个阶段的延迟、吞吐量与状态码分布，并检查名额是否超额、booked_count 是否与预定记录一致、
+         取消后空出的名额是否由候补补上。状态不一致时以非零状态退出。
+         --coalesce 开启写操作合并提交（WRITE_COALESCING），用于与逐请求提交对比。
+         用法：python -m benchmarks.contention --employees 2000 --capacity 200 --concurrency 200 --cancel 100 [--coalesce]
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from benchmarks.api import Context, Scenario, run_scenario
+from benchmarks.common import asgi_client, configure_environment, peak_rss_kb, write_report
+from benchmarks.seed import seed
+
+CONFERENCE_ID = 1
+
+async def run(employees: int, cancel: int, concurrency: int) -> dict:
+    """!
+    @brief 执行预定和取消两个阶段。
+    @return dict 各阶段结果。
+    """
+    ctx = Context(employees, 1, 0)
+    book = Scenario("book", lambda ctx, i: (
+        "POST", f"/api/conferences/{CONFERENCE_ID}/book", {"params": {"employee_id": i + 1}}, None))
+    cancel_booking = Scenario("cancel", lambda ctx, i: (
+        "DELETE", f"/api/conferences/{CONFERENCE_ID}/bookings/{i + 1}", {}, None))
+
+    async with asgi_client() as client:
+        phases = {
+            "book": await run_scenario(client, ctx, book, employees, concurrency),
+            "cancel": await run_scenario(client, ctx, cancel_booking, cancel, concurrency),
+        }
+
+    from app.models.coalescer import coalescer
+    if coalescer is not None:
+        phases["coalescing"] = {
+            "batches": coalescer.batches,
+            "operations": coalescer.operations,
+            "mean_batch_size": coalescer.operations / max(coalescer.batches, 1),
+        }
+    return phases
+
+def check(path: Path, employees: int, capacity: int, cancel: int) -> dict:
+    """!
+    @brief 检查测试结束后的名额状态。
+    @param path 数据库文件路径。
+    @return dict 实际状态与是否一致。
+    """
+    with sqlite3.connect(path) as connection:
+        booked_count = connection.execute("SELECT booked_count FROM conferences WHERE id = ?", (CONFERENCE_ID,)).fetchone()[0]
+        bookings = connection.execute(
+            "SELECT COUNT(*) FROM employee_conference WHERE conference_id = ?", (CONFERENCE_ID,)).fetchone()[0]
+        waitlist = connection.execute(
+            "SELECT COUNT(*) FROM conference_waitlist WHERE conference_id = ?", (CONFERENCE_ID,)).fetchone()[0]
+        overlap = connection.execute(
+            "SELECT COUNT(*) FROM conference_waitlist w JOIN employee_conference b "
+            "ON b.conference_id = w.conference_id AND b.employee_id = w.employee_id").fetchone()[0]
+
+    # 每名员工要么预定成功要么进入候补，取消的员工从两者中移除，空出的名额由候补补上
+    remaining = employees - min(cancel, employees)
+    return {
+        "booked_count": booked_count,
+        "bookings": bookings,
+        "waitlist": waitlist,
+        "consistent": (
+            booked_count == bookings == min(capacity, remaining)
+            and waitlist == remaining - bookings
+            and overlap == 0
+        ),
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="热点会议并发预定基准测试")
+    parser.add_argument("--employees", type=int, default=1000, help="参与预定的员工数")
+    parser.add_argument("--capacity", type=int, default=100, help="会议人数上限")
+    parser.add_argument("--concurrency", type=int, default=100, help="并发请求数")
+    parser.add_argument("--cancel", type=int, default=50, help="预定完成后并发取消的员工数")
+    parser.add_argument("--coalesce", action="store_true", help="开启写操作合并提交")
+    parser.add_argument("--output", help="结果 JSON 文件路径，默认输出到标准输出")
+    args = parser.parse_args(argv)
+    if args.coalesce:
+        os.environ["WRITE_COALESCING"] = "1"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "contention.db"
+        seed(database, args.employees, 1, 0)
+        with sqlite3.connect(database) as connection:
+            connection.execute("UPDATE conferences SET capacity = ? WHERE id = ?", (args.capacity, CONFERENCE_ID))
+
+        configure_environment(database)
+        phases = asyncio.run(run(args.employees, args.cancel, args.concurrency))
+        state = check(database, args.employees, args.capacity, args.cancel)
+
+    write_report({
+        "benchmark": "contention",
+        "employees": args.employees,
+        "capacity": args.capacity,
+        "concurrency": args.concurrency,
+        "coalesce": args.coalesce,
+        "scenarios": phases,
+        "state": state,
+        "peak_rss_kb": peak_rss_kb(),
+    }, args.output)
+    return 0 if state["consistent"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""!
+@file query_plans.py
+@brief 查询计划回归检查
+@details 在百万级预定数据上逐个请求按 ID 查找、按条件筛选和全文检索的路由，捕获每个路由执行的 SQL 并用 EXPLAIN QUERY PLAN 检查：
+         大表只允许通过索引查找（SEARCH），不允许全表扫描（SCAN）；全量预定列表、流式导出、分页的预定详情与会议室空闲时段不允许额外排序（TEMP B-TREE）；
+         会议排名按设计扫描会议表，只检查不扫描预定相关的表。
+         任一路由不符合时以非零状态退出，结果以 JSON 输出。
+         用法：python -m benchmarks.query_plans --db bench.db --output plans.json
+"""
+
+import argparse
+import asyncio
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from benchmarks.common import asgi_client, configure_environment, write_report
+from benchmarks.seed import seed
+
+# 需要检查的大表
+LARGE_TABLES = ("employees", "conferences", "employee_conference", "conference_bookings", "conference_waitlist")
+
+FULL_SCAN = re.compile(r"^SCAN (%s)\b" % "|".join(LARGE_TABLES))
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+INDEX_ORDER = re.compile("%s|%s" % (FULL_SCAN.pattern, TEMP_SORT.pattern))
+# 只禁止扫描预定相关的表：会议排名按设计扫描会议表并保留前若干个（booked_count 不建索引）
+BOOKING_SCAN = re.compile(r"^SCAN (employee_conference|conference_bookings|conference_waitlist)\b")
+
+# 列表接口构造 ETag 的聚合查询（见 app.models.version.collection_state）按设计统计整张表，只记录不检查
+VALIDATOR = re.compile(r"\bFROM data_versions\b")
+
+# (名称, 方法, URL, 禁止的计划模式)；{conference} 与 {employee} 为一条已有预定，按顺序先取消再重新预定，最后删除员工；
+# {cursor} 为指向该预定的分页游标
+ROUTES = [
+    ("attendees", "GET", "/api/conferences/{conference}/attendees", FULL_SCAN),
+    ("employee_conferences", "GET", "/api/employees/{employee}/conferences", FULL_SCAN),
+    ("waitlist", "GET", "/api/conferences/{conference}/waitlist", FULL_SCAN),
+    ("search_employees", "GET", "/api/employees/?q=user1&limit=20", FULL_SCAN),
+    ("filter_employees", "GET", "/api/employees/?department=技术部&limit=20", FULL_SCAN),
+    ("search_conferences", "GET", "/api/conferences/?q=会议0001&limit=20", FULL_SCAN),
+    ("filter_conferences", "GET", "/api/conferences/?location=A座1层会议室1&limit=20", FULL_SCAN),
+    ("cancel", "DELETE", "/api/conferences/{conference}/bookings/{employee}", FULL_SCAN),
+    ("book", "POST", "/api/conferences/{conference}/book?employee_id={employee}", FULL_SCAN),
+    ("all_bookings", "GET", "/api/conferences/bookings", TEMP_SORT),
+    ("booking_details", "GET", "/api/bookings?limit=50&cursor={cursor}", INDEX_ORDER),
+    ("conference_booking_details", "GET", "/api/bookings?conference_id={conference}&limit=50", INDEX_ORDER),
+    ("employee_booking_details", "GET", "/api/bookings?employee_id={employee}&limit=50", INDEX_ORDER),
+    ("department_stats", "GET", "/api/stats/departments", FULL_SCAN),
+    ("monthly_stats", "GET", "/api/stats/months", FULL_SCAN),
+    ("top_conferences", "GET", "/api/stats/conferences/top", BOOKING_SCAN),
+    ("room_conferences", "GET", "/api/conferences/?room_id=1&limit=20", FULL_SCAN),
+    ("available_rooms", "GET", "/api/rooms/available?date=2025-06-02&start_time=09:00&end_time=10:00", FULL_SCAN),
+    ("room_slots", "GET", "/api/rooms/1/slots?date=2025-06-02", INDEX_ORDER),
+    ("schedule_conference", "POST", "/api/conferences/", FULL_SCAN),
+    ("export_conferences", "GET", "/api/conferences/export", TEMP_SORT),
+    ("export_bookings", "GET", "/api/bookings/export", TEMP_SORT),
+    ("employee_calendar", "GET", "/api/employees/{employee}/conferences.ics", FULL_SCAN),
+    ("delete_employee", "DELETE", "/api/employees/{employee}", FULL_SCAN),
+]
+
+# 带请求体的路由的请求体；会议排在种子数据的时段之后，不与已有会议冲突
+BODIES = {
+    "schedule_conference": {
+        "name": "排期检查", "date": "2025-06-02", "location": "A座1层会议室1",
+        "room_id": 1, "start_time": "20:00", "end_time": "21:00",
+    },
+}
+
+# 不经过路由、直接检查的查询（近期会议按日期查找）
+STATEMENTS = [
+    ("upcoming_conferences",
+     "SELECT id, name, date FROM conferences WHERE date >= ? ORDER BY date LIMIT 20", ("2025-06-01",), FULL_SCAN),
+]
+
+def explain(connection: sqlite3.Connection, statement: str, parameters) -> list:
+    """!
+    @brief 获取语句的查询计划。
+    @return list 计划中每一步的描述。
+    """
+    return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())]
+
+def check(connection: sqlite3.Connection, statements: list, forbidden) -> dict:
+    """!
+    @brief 检查一组语句的查询计划。
+    @param connection 用于 EXPLAIN 的连接。
+    @param statements (SQL, 参数) 列表。
+    @param forbidden 不允许出现的计划模式。
+    @return dict 每条语句的计划与是否通过。
+    """
+    results = []
+    for statement, parameters in statements:
+        plan = explain(connection, statement, parameters)
+        exempt = bool(VALIDATOR.search(statement))
+        results.append({
+            "sql": " ".join(statement.split()),
+            "plan": plan,
+            "exempt": exempt,
+            "violations": [] if exempt else [step for step in plan if forbidden.search(step)],
+        })
+    return {"ok": not any(result["violations"] for result in results), "statements": results}
+
+async def capture(conference_id: int, employee_id: int) -> dict:
+    """!
+    @brief 依次请求各路由，记录每个路由执行的 SQL。
+    @return dict 路由名称到 (SQL, 参数) 列表的映射。
+    """
+    from sqlalchemy import event
+    from app.core.pagination import encode_cursor
+    from app.models.database import engine
+
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    statements = {}
+    async with asgi_client() as client:
+        for name, method, url, _ in ROUTES:
+            captured.clear()
+            response = await client.request(method, url.format(
+                conference=conference_id, employee=employee_id, cursor=encode_cursor(conference_id, employee_id)
+            ), json=BODIES.get(name))
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name}: {response.status_code} {response.text}")
+            statements[name] = list(captured)
+    return statements
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="查询计划回归检查")
+    parser.add_argument("--db", help="已生成的数据库文件，不存在时按下列规模生成；默认使用临时文件")
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--conferences", type=int, default=10000)
+    parser.add_argument("--bookings", type=int, default=1000000)
+    parser.add_argument("--output", help="结果 JSON 文件路径，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(args.db) if args.db else Path(tmp) / "seed.db"
+        if not source.exists():
+            seed(source, args.employees, args.conferences, args.bookings)
+        database = Path(tmp) / "plans.db"
+        shutil.copyfile(source, database)
+
+        # 取一个已有预定的 (会议, 员工)，使取消和删除路由走到真实的写入路径
+        with sqlite3.connect(database) as connection:
+            employee_id, conference_id = connection.execute(
+                "SELECT employee_id, conference_id FROM employee_conference LIMIT 1").fetchone()
+
+        configure_environment(database)
+        captured = asyncio.run(capture(conference_id, employee_id))
+
+        with sqlite3.connect(database) as connection:
+            results = {name: check(connection, captured[name], forbidden) for name, _, _, forbidden in ROUTES}
+            for name, statement, parameters, forbidden in STATEMENTS:
+                results[name] = check(connection, [(statement, parameters)], forbidden)
+            sizes = {
+                table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("employees", "conferences", "employee_conference")
+            }
+
+    failed = [name for name, result in results.items() if not result["ok"]]
+    write_report({"benchmark": "query_plans", "dataset": sizes, "failed": failed, "routes": results}, args.output)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""!
+@file seed.py
+@brief 基准测试数据生成
+@details 使用 init-db 创建表结构，再以 sqlite3 批量写入员工、会议室、会议和预定数据。
+         每个地点对应一个会议室，会议按地点占用会议室当天从 8 点起依次排开的一小时时段，排满的会议不指定会议室。
+         数据由固定随机种子生成，相同参数得到相同的数据库。
+         用法：python -m benchmarks.seed bench.db --employees 100000 --conferences 10000 --bookings 1000000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+from benchmarks.common import ROOT
+
+DEPARTMENTS = ["技术部", "市场部", "销售部", "人事部", "财务部", "行政部", "产品部", "法务部"]
+POSITIONS = ["工程师", "高级工程师", "经理", "总监", "专员", "助理"]
+LOCATIONS = [f"{building}座{floor}层会议室{room}" for building in "ABC" for floor in range(1, 6) for room in range(1, 5)]
+ROOM_CAPACITIES = [8, 12, 20, 50, 100]
+
+# 会议室每天可排会议的时段 [FIRST_HOUR, LAST_HOUR)，每场一小时
+FIRST_HOUR = 8
+LAST_HOUR = 20
+
+# 每批写入的行数
+BATCH_SIZE = 50000
+
+def seed(path: Path, employees: int, conferences: int, bookings: int, random_seed: int = 42) -> dict:
+    """!
+    @brief 生成基准测试数据库。
+    @param path SQLite 数据库文件路径，已存在时会被覆盖。
+    @param employees 员工数量。
+    @param conferences 会议数量。
+    @param bookings 预定数量，不能超过 employees * conferences。
+    @param random_seed 随机种子。
+    @return dict 实际写入的数据规模与耗时。
+    """
+    if bookings > employees * conferences:
+        raise ValueError("bookings must not exceed employees * conferences")
+
+    path = path.resolve()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{path}", PYTHONWARNINGS="ignore")
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], cwd=ROOT, env=env, check=True, capture_output=True)
+
+    rng = random.Random(random_seed)
+    start = time.perf_counter()
+    now = datetime.datetime(2025, 1, 1)
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=OFF")
+    connection.execute("PRAGMA synchronous=OFF")
+    with connection:
+        connection.executemany(
+            "INSERT INTO employees (id, name, email, department, position, phone, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (i, f"员工{i:07d}", f"user{i}@example.com", rng.choice(DEPARTMENTS), rng.choice(POSITIONS),
+                 f"138{i:08d}", now, now)
+                for i in range(1, employees + 1)
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO rooms (id, name, capacity, created_at) VALUES (?, ?, ?, ?)",
+            ((i, location, ROOM_CAPACITIES[i % len(ROOM_CAPACITIES)], now) for i, location in enumerate(LOCATIONS, 1)),
+        )
+        first_day = datetime.date(2024, 1, 1)
+
+        def conference_rows():
+            # 每个 (会议室, 日期) 已排开的会议数
+            scheduled = {}
+            for i in range(1, conferences + 1):
+                date = first_day + datetime.timedelta(days=rng.randrange(1096))
+                location = rng.choice(LOCATIONS)
+                room_id = LOCATIONS.index(location) + 1
+                hour = FIRST_HOUR + scheduled.get((room_id, date), 0)
+                if hour < LAST_HOUR:
+                    scheduled[(room_id, date)] = hour - FIRST_HOUR + 1
+                    schedule = (room_id, f"{hour:02d}:00:00.000000", f"{hour + 1:02d}:00:00.000000")
+                else:
+                    schedule = (None, None, None)
+                yield (i, f"会议{i:06d}", date, location, f"第 {i} 场会议", *schedule, now, now)
+
+        connection.executemany(
+            "INSERT INTO conferences (id, name, date, location, description, room_id, start_time, end_time, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            conference_rows(),
+        )
+
+        # 每个会议分配近似相同数量的与会人员，员工从随机起点按步长选取，保证 (员工, 会议) 不重复
+        booked_counts = []
+
+        def booking_rows():
+            remaining = bookings
+            for conference_id in range(1, conferences + 1):
+                count = remaining // (conferences - conference_id + 1)
+                remaining -= count
+                booked_counts.append((count, conference_id))
+                offset = rng.randrange(employees)
+                for k in range(count):
+                    yield ((offset + k) % employees + 1, conference_id)
+
+        rows = booking_rows()
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+            if not batch:
+                break
+            connection.executemany("INSERT INTO employee_conference (employee_id, conference_id) VALUES (?, ?)", batch)
+        connection.executemany("UPDATE conferences SET booked_count = ? WHERE id = ?", booked_counts)
+    connection.execute("ANALYZE")
+    connection.close()
+
+    return {
+        "employees": employees,
+        "conferences": conferences,
+        "bookings": bookings,
+        "seed_seconds": time.perf_counter() - start,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="生成基准测试数据库")
+    parser.add_argument("path", help="SQLite 数据库文件路径")
+    parser.add_argument("--employees", type=int, default=10000)
+    parser.add_argument("--conferences", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args(argv)
+
+    print(seed(Path(args.path), args.employees, args.conferences, args.bookings, args.seed))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
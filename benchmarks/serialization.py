@@ -0,0 +1,153 @@
+"""!
+@file serialization.py
+@brief 列表响应序列化基准测试
+@details 比较两种列表响应路径：逐行构造 Pydantic 模型并由 FastAPI 按 response_model 校验、编码（pydantic），
+         与按列查询后直接把行编码为 JSON（rows，见 app.core.responses）。
+         每种页大小分别测量：经 ASGI 的完整请求延迟，以及不含数据库查询的纯编码耗时。
+         用法：python -m benchmarks.serialization --sizes 100 1000 10000 --requests 20 --output serialization.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+from benchmarks.common import configure_environment, latency_summary, peak_rss_kb, summarize, write_report
+from benchmarks.seed import seed
+
+def build_app():
+    """!
+    @brief 构造只包含待比较路由的应用，两条路径使用同一个数据库会话依赖。
+    @return FastAPI 应用。
+    """
+    from fastapi import Depends, FastAPI, Query
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from app.core.responses import rows_response
+    from app.models.conference import ConferenceDB
+    from app.models.database import get_db
+    from app.models.employee import EmployeeDB
+    from app.schemas.conference import Conference
+    from app.schemas.employee import Employee
+
+    app = FastAPI()
+    for kind, model, schema in (("employees", EmployeeDB, Employee), ("conferences", ConferenceDB, Conference)):
+        def register(model=model, schema=schema, kind=kind):
+            @app.get(f"/pydantic/{kind}", response_model=List[schema])
+            async def pydantic_path(limit: int = Query(...), db: AsyncSession = Depends(get_db)):
+                result = await db.execute(select(model).order_by(model.id).limit(limit))
+                return [row.to_pydantic() for row in result.scalars().all()]
+
+            @app.get(f"/rows/{kind}", response_model=List[schema])
+            async def rows_path(limit: int = Query(...), db: AsyncSession = Depends(get_db)):
+                result = await db.execute(select(*model.__table__.columns).order_by(model.id).limit(limit))
+                return rows_response(result.all(), result.keys())
+        register()
+    return app
+
+async def measure_requests(sizes: List[int], requests: int) -> dict:
+    """!
+    @brief 逐个发送请求，测量两条路径的完整请求延迟。
+    @return dict 路径、数据集合与页大小到延迟统计的映射。
+    """
+    import httpx
+
+    app = build_app()
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for kind in ("employees", "conferences"):
+            for size in sizes:
+                for path in ("pydantic", "rows"):
+                    url = f"/{path}/{kind}"
+                    first = await client.get(url, params={"limit": size})
+                    first.raise_for_status()
+                    latencies = []
+                    started = time.perf_counter()
+                    for _ in range(requests):
+                        begin = time.perf_counter()
+                        response = await client.get(url, params={"limit": size})
+                        latencies.append(time.perf_counter() - begin)
+                        response.raise_for_status()
+                    summary = latency_summary(latencies, time.perf_counter() - started)
+                    summary["response_bytes"] = len(first.content)
+                    results[f"{path}/{kind}/{size}"] = summary
+    return results
+
+async def measure_encoding(sizes: List[int], repeats: int) -> dict:
+    """!
+    @brief 只测量编码耗时：行已从数据库取出，比较构造模型、校验并编码与直接编码。
+    @return dict 路径、数据集合与页大小到耗时（毫秒）统计的映射。
+    """
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from app.core.responses import dumps, row_dicts
+    from app.models.conference import ConferenceDB
+    from app.models.database import AsyncSessionLocal
+    from app.models.employee import EmployeeDB
+    from app.schemas.conference import Conference
+    from app.schemas.employee import Employee
+
+    results = {}
+    async with AsyncSessionLocal() as session:
+        for kind, model, schema in (("employees", EmployeeDB, Employee), ("conferences", ConferenceDB, Conference)):
+            adapter = TypeAdapter(List[schema])
+            for size in sizes:
+                objects = (await session.execute(select(model).order_by(model.id).limit(size))).scalars().all()
+                result = await session.execute(select(*model.__table__.columns).order_by(model.id).limit(size))
+                keys, rows = list(result.keys()), result.all()
+
+                def pydantic_path():
+                    validated = adapter.validate_python([obj.to_pydantic() for obj in objects])
+                    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode("utf-8")
+
+                def rows_path():
+                    return dumps(row_dicts(rows, keys))
+
+                assert json.loads(pydantic_path()) == json.loads(rows_path())
+                for path, encode in (("pydantic", pydantic_path), ("rows", rows_path)):
+                    samples = []
+                    for _ in range(repeats):
+                        begin = time.perf_counter()
+                        encode()
+                        samples.append((time.perf_counter() - begin) * 1000)
+                    results[f"{path}/{kind}/{size}"] = summarize(samples)
+    return results
+
+async def run(sizes: List[int], requests: int) -> tuple:
+    """!
+    @brief 在同一个事件循环中依次执行两项测量，复用连接池。
+    @return tuple (完整请求延迟, 纯编码耗时)。
+    """
+    return await measure_requests(sizes, requests), await measure_encoding(sizes, requests)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="列表响应序列化基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="每页行数")
+    parser.add_argument("--requests", type=int, default=20, help="每个场景的请求次数")
+    parser.add_argument("--output", help="结果 JSON 文件路径，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    rows = max(args.sizes)
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "serialization.db"
+        seed(database, rows, rows, 0)
+        configure_environment(database)
+        requests, encoding = asyncio.run(run(args.sizes, args.requests))
+
+    from app.core.responses import orjson
+    write_report({
+        "benchmark": "serialization",
+        "encoder": "orjson" if orjson is not None else "json",
+        "sizes": args.sizes,
+        "requests": requests,
+        "encoding_ms": encoding,
+        "peak_rss_kb": peak_rss_kb(),
+    }, args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
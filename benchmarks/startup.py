@@ -0,0 +1,87 @@
+"""!
+@file startup.py
+@brief 工作进程冷启动基准测试
+@details 在全新的子进程中依次测量：导入 app.main 的耗时与导入的模块数、导入时已计算指纹的静态文件数、
+         启动事件（渲染首页）的耗时、从开始导入到首个 API 响应的耗时、随后首页请求的耗时，以及进程峰值内存。
+         结果以 JSON 输出，便于在不同提交之间比较。
+         用法：python -m benchmarks.startup --runs 10 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from benchmarks.common import ROOT, summarize, write_report
+
+# 在子进程中执行的测量脚本
+CHILD_SCRIPT = r"""
+import asyncio, json, resource, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+imported_modules = len(sys.modules)
+from app.core.assets import ASSET_MOUNTS
+assets_hashed_at_import = sum(len(files.digests) for files in ASSET_MOUNTS.values())
+timings = {}
+
+async def first_requests():
+    import httpx
+    async with app.router.lifespan_context(app):
+        timings["started"] = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get("/api/employees/", params={"limit": 1})
+            response.raise_for_status()
+            timings["api"] = time.perf_counter()
+            response = await client.get("/")
+            response.raise_for_status()
+            timings["page"] = time.perf_counter()
+
+asyncio.run(first_requests())
+print(json.dumps({
+    "import_seconds": imported - start,
+    "startup_seconds": timings["started"] - imported,
+    "first_response_seconds": timings["api"] - start,
+    "first_page_seconds": timings["page"] - timings["api"],
+    "imported_modules": imported_modules,
+    "assets_hashed_at_import": assets_hashed_at_import,
+    "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+def run(runs: int) -> dict:
+    """!
+    @brief 执行冷启动基准测试。
+    @param runs 子进程启动次数。
+    @return dict 测量结果。
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{tmp}/startup.db", PYTHONWARNINGS="ignore")
+        subprocess.run([sys.executable, "-m", "app.cli", "init-db"], cwd=ROOT, env=env, check=True, capture_output=True)
+
+        samples = []
+        for _ in range(runs):
+            completed = subprocess.run(
+                [sys.executable, "-c", CHILD_SCRIPT], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+            )
+            samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    return {
+        "benchmark": "startup",
+        "runs": runs,
+        **{key: summarize([sample[key] for sample in samples]) for key in samples[0]},
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="工作进程冷启动基准测试")
+    parser.add_argument("--runs", type=int, default=10, help="子进程启动次数")
+    parser.add_argument("--output", help="结果 JSON 文件路径，默认输出到标准输出")
+    args = parser.parse_args(argv)
+
+    write_report(run(args.runs), args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""!
+@file conftest.py
+@brief 测试公共夹具
+@details 导入应用之前把数据库与导入错误报告指向临时目录，并缩短 /api/events 单个连接的保持时间，使事件流请求能很快结束。
+         整个测试会话共用一个应用实例和数据库，各测试通过工厂夹具创建自己的员工与会议，互不依赖。
+"""
+
+import itertools
+import os
+import tempfile
+from pathlib import Path
+import pytest
+
+DATA_DIR = Path(tempfile.mkdtemp(prefix="coference-tests-"))
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite+aiosqlite:///{DATA_DIR / 'test.db'}",
+    "AUTO_CREATE_SCHEMA": "true",
+    "IMPORT_REPORT_DIR": str(DATA_DIR),
+    "EVENTS_MAX_STREAM_SECONDS": "0.3",
+    "EVENTS_HEARTBEAT_SECONDS": "0.1",
+    "DB_SESSION_LOG_SAMPLE_RATE": "0",
+    "LOG_LEVEL": "WARNING",
+})
+
+# 生成唯一的姓名、邮箱与会议名称
+_sequence = itertools.count(1)
+
+def unique(prefix: str) -> str:
+    """!
+    @brief 生成本次测试会话中唯一的字符串。
+    """
+    return f"{prefix}{next(_sequence)}"
+
+@pytest.fixture(scope="session")
+def client():
+    """!
+    @brief 执行启动事件（建表、渲染首页）后的测试客户端。
+    """
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def make_employee(client):
+    """!
+    @brief 创建员工的工厂，字段可覆盖默认值。
+    """
+    def make(**fields) -> dict:
+        name = unique("user")
+        body = {"name": name, "email": f"{name}@example.com", "department": "技术部", "position": "工程师", **fields}
+        response = client.post("/api/employees/", json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make
+
+@pytest.fixture
+def make_conference(client):
+    """!
+    @brief 创建会议的工厂，字段可覆盖默认值。
+    """
+    def make(**fields) -> dict:
+        body = {"name": unique("会议"), "date": "2025-06-02", "location": "A座1层", **fields}
+        response = client.post("/api/conferences/", json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return make
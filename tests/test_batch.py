@@ -0,0 +1,49 @@
+def employee(name, email, **fields):
+    return {"name": name, "email": email, "department": "技术部", "position": "工程师", **fields}
+
+def test_duplicate_email_is_a_conflict(client, make_employee):
+    first, second = make_employee(), make_employee()
+    response = client.post("/api/employees/", json=employee("重复", first["email"]))
+    assert response.status_code == 409
+
+    response = client.put(f"/api/employees/{second['id']}", json={"email": first["email"]})
+    assert response.status_code == 409
+    assert client.get(f"/api/employees/{second['id']}").json()["email"] == second["email"]
+
+def test_employee_batch_create(client, make_employee):
+    existing = make_employee()
+    response = client.post("/api/employees/batch", json=[
+        employee("批量一", "batch-create-1@example.com"),
+        employee("批量二", existing["email"]),
+        {"name": "缺邮箱"},
+        employee("批量三", "batch-create-1@example.com"),
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == ["created", "conflict", "invalid", "conflict"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert "email" in results[2]["detail"]
+    assert client.get(f"/api/employees/{results[0]['id']}").json()["name"] == "批量一"
+
+def test_employee_batch_upsert(client, make_employee):
+    existing = make_employee()
+    response = client.post("/api/employees/batch", params={"upsert": "true"}, json=[
+        employee("覆盖前", "batch-upsert-1@example.com"),
+        employee("已有员工", existing["email"], department="市场部"),
+        employee("覆盖后", "batch-upsert-1@example.com"),
+    ])
+    results = response.json()
+    assert [result["status"] for result in results] == ["duplicate", "updated", "created"]
+    assert results[1]["id"] == existing["id"]
+    assert client.get(f"/api/employees/{existing['id']}").json()["department"] == "市场部"
+    assert client.get(f"/api/employees/{results[2]['id']}").json()["name"] == "覆盖后"
+
+def test_conference_batch_create(client):
+    response = client.post("/api/conferences/batch", json=[
+        {"name": "批量会议一", "date": "2025-07-01", "location": "A座"},
+        {"name": "缺日期", "location": "A座"},
+        {"name": "批量会议二", "date": "2025-07-02", "location": "B座", "capacity": 10},
+    ])
+    results = response.json()
+    assert [result["status"] for result in results] == ["created", "invalid", "created"]
+    assert client.get(f"/api/conferences/{results[2]['id']}").json()["capacity"] == 10
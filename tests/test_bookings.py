@@ -0,0 +1,130 @@
+def book(client, conference_id, employee_id):
+    return client.post(f"/api/conferences/{conference_id}/book", params={"employee_id": employee_id})
+
+def waitlist(client, conference_id):
+    return [entry["employee_id"] for entry in client.get(f"/api/conferences/{conference_id}/waitlist").json()]
+
+def booked_count(client, conference_id):
+    return client.get(f"/api/conferences/{conference_id}").json()["booked_count"]
+
+def test_book_and_duplicate(client, make_employee, make_conference):
+    conference, employee = make_conference(), make_employee()
+    assert book(client, conference["id"], employee["id"]).status_code == 201
+    assert book(client, conference["id"], employee["id"]).status_code == 409
+    assert client.get(f"/api/conferences/{conference['id']}/attendees/count").json()["count"] == 1
+    assert booked_count(client, conference["id"]) == 1
+
+def test_book_unknown_conference_or_employee(client, make_employee, make_conference):
+    assert book(client, 10 ** 9, make_employee()["id"]).status_code == 404
+    assert book(client, make_conference()["id"], 10 ** 9).status_code == 404
+
+def test_full_conference_waitlists_and_cancel_promotes(client, make_employee, make_conference):
+    conference = make_conference(capacity=1)
+    first, second, third = make_employee(), make_employee(), make_employee()
+    assert book(client, conference["id"], first["id"]).status_code == 201
+    response = book(client, conference["id"], second["id"])
+    assert response.status_code == 202
+    assert response.json()["position"] == 1
+    assert book(client, conference["id"], third["id"]).json()["position"] == 2
+
+    response = client.delete(f"/api/conferences/{conference['id']}/bookings/{first['id']}")
+    assert response.json()["promoted"] == [second["id"]]
+    assert waitlist(client, conference["id"]) == [third["id"]]
+    assert booked_count(client, conference["id"]) == 1
+
+def test_raising_capacity_fills_from_waitlist(client, make_employee, make_conference):
+    conference = make_conference(capacity=1)
+    employees = [make_employee() for _ in range(3)]
+    for employee in employees:
+        book(client, conference["id"], employee["id"])
+
+    assert client.put(f"/api/conferences/{conference['id']}", json={"capacity": 2}).status_code == 200
+    assert waitlist(client, conference["id"]) == [employees[2]["id"]]
+    assert booked_count(client, conference["id"]) == 2
+
+def test_deleting_employee_releases_seat(client, make_employee, make_conference):
+    conference = make_conference(capacity=1)
+    booked, waiting = make_employee(), make_employee()
+    book(client, conference["id"], booked["id"])
+    book(client, conference["id"], waiting["id"])
+
+    assert client.delete(f"/api/employees/{booked['id']}").status_code == 200
+    attendees = client.get(f"/api/conferences/{conference['id']}/attendees").json()
+    assert [attendee["id"] for attendee in attendees] == [waiting["id"]]
+    assert waitlist(client, conference["id"]) == []
+    assert booked_count(client, conference["id"]) == 1
+
+def test_schedule_conflict(client, make_employee, make_conference):
+    employee = make_employee()
+    morning = make_conference(start_time="09:00", end_time="10:00")
+    overlapping = make_conference(start_time="09:30", end_time="11:00")
+    adjacent = make_conference(start_time="10:00", end_time="11:00")
+    assert book(client, morning["id"], employee["id"]).status_code == 201
+
+    response = book(client, overlapping["id"], employee["id"])
+    assert response.status_code == 409
+    assert response.json()["detail"]["conference"]["id"] == morning["id"]
+    assert book(client, adjacent["id"], employee["id"]).status_code == 201
+
+def test_waitlist_promotion_skips_conflicting_employees(client, make_employee, make_conference):
+    full = make_conference(capacity=1, start_time="13:00", end_time="14:00")
+    other = make_conference(start_time="13:30", end_time="15:00")
+    booked, busy, free = make_employee(), make_employee(), make_employee()
+    for employee in (booked, busy, free):
+        book(client, full["id"], employee["id"])
+    # 候补期间预定了时段重叠的其他会议
+    assert book(client, other["id"], busy["id"]).status_code == 201
+
+    response = client.delete(f"/api/conferences/{full['id']}/bookings/{booked['id']}")
+    assert response.json()["promoted"] == [free["id"]]
+    assert waitlist(client, full["id"]) == [busy["id"]]
+    assert booked_count(client, full["id"]) == 1
+
+def test_rescheduling_rechecks_booked_employees(client, make_employee, make_conference):
+    employee = make_employee()
+    first = make_conference(start_time="09:00", end_time="10:00")
+    second = make_conference(start_time="11:00", end_time="12:00")
+    book(client, first["id"], employee["id"])
+    book(client, second["id"], employee["id"])
+
+    response = client.put(f"/api/conferences/{second['id']}", json={"start_time": "09:30", "end_time": "10:30"})
+    assert response.status_code == 409
+    assert response.json()["detail"]["employee_ids"] == [employee["id"]]
+    assert client.get(f"/api/conferences/{second['id']}").json()["start_time"] == "11:00:00"
+
+    response = client.put(f"/api/conferences/{second['id']}", json={"start_time": "10:00", "end_time": "10:30"})
+    assert response.status_code == 200
+
+def test_batch_booking(client, make_employee, make_conference):
+    conference = make_conference(capacity=2, start_time="16:00", end_time="17:00")
+    clash = make_conference(start_time="16:30", end_time="17:30")
+    first, second, third, busy = (make_employee() for _ in range(4))
+    book(client, clash["id"], busy["id"])
+
+    response = client.post(
+        f"/api/conferences/{conference['id']}/bookings:batch",
+        json={"employee_ids": [first["id"], second["id"], first["id"], third["id"], busy["id"], 10 ** 9]},
+    )
+    assert response.status_code == 201
+    result = response.json()
+    assert result["created"] == [first["id"], second["id"]]
+    assert result["waitlisted"] == [third["id"]]
+    assert result["conflicting"] == [busy["id"]]
+    assert result["invalid"] == [10 ** 9]
+
+    again = client.post(f"/api/conferences/{conference['id']}/bookings:batch", json={"employee_ids": [first["id"]]})
+    assert again.json()["existing"] == [first["id"]]
+    assert booked_count(client, conference["id"]) == 2
+
+def test_capacity_cannot_drop_below_booked_count(client, make_employee, make_conference):
+    conference = make_conference(capacity=3)
+    for _ in range(2):
+        book(client, conference["id"], make_employee()["id"])
+
+    response = client.put(f"/api/conferences/{conference['id']}", json={"capacity": 1})
+    assert response.status_code == 409
+    assert response.json()["detail"]["booked_count"] == 2
+    assert client.get(f"/api/conferences/{conference['id']}").json()["capacity"] == 3
+
+    assert client.put(f"/api/conferences/{conference['id']}", json={"capacity": 2}).status_code == 200
+    assert client.put(f"/api/conferences/{conference['id']}", json={"capacity": None}).json()["capacity"] is None
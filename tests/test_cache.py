@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from app.core.cache import LRUCacheBackend
+
+def test_fill_is_dropped_when_key_invalidated_during_read():
+    async def run():
+        backend = LRUCacheBackend(max_entries=10, ttl=60)
+        with backend.filling("conference:1") as fill:
+            # 读取数据库期间有写操作提交并失效了该键
+            await backend.delete("conference:1")
+            await fill("stale")
+        stale = await backend.get("conference:1")
+
+        with backend.filling("conference:1") as fill:
+            await fill("fresh")
+        return stale, await backend.get("conference:1"), backend._fills
+
+    stale, fresh, fills = asyncio.run(run())
+    assert stale is None
+    assert fresh == "fresh"
+    assert fills == {}
+
+def test_lru_eviction_and_ttl():
+    async def run():
+        backend = LRUCacheBackend(max_entries=2, ttl=60)
+        for key in ("a", "b", "c"):
+            await backend.set(key, key)
+        evicted = await backend.get("a")
+        backend.ttl = 0
+        await backend.set("d", "d")
+        return evicted, await backend.get("d"), backend.stats()
+
+    evicted, expired, stats = asyncio.run(run())
+    assert (evicted, expired) == (None, None)
+    assert stats["evictions"] == 3
+
+@pytest.mark.parametrize("kind", ["conferences", "employees"])
+def test_writes_invalidate_cached_entity(client, make_conference, make_employee, kind):
+    entity = make_conference() if kind == "conferences" else make_employee()
+    url = f"/api/{kind}/{entity['id']}"
+    assert client.get(url).json()["name"] == entity["name"]
+    # 第二次读取命中缓存
+    hits = client.get("/api/cache/stats").json()["hits"]
+    client.get(url)
+    assert client.get("/api/cache/stats").json()["hits"] == hits + 1
+
+    assert client.put(url, json={"name": "改名后"}).status_code == 200
+    assert client.get(url).json()["name"] == "改名后"
+
+    assert client.delete(url).status_code == 200
+    assert client.get(url).status_code == 404
@@ -0,0 +1,68 @@
+import asyncio
+from sqlalchemy import text
+from app.core.metrics import RequestStats, attributed_to
+from app.models import coalescer as coalescer_module
+from app.models.coalescer import WriteCoalescer
+
+def insert_item(name: str, fail: bool = False):
+    async def operation(session):
+        await session.execute(text("INSERT INTO items (name) VALUES (:name)"), {"name": name})
+        if fail:
+            raise ValueError(name)
+        return name
+    return operation
+
+def test_concurrent_writes_share_a_transaction(tmp_path):
+    async def run():
+        writer = WriteCoalescer(f"sqlite+aiosqlite:///{tmp_path / 'coalesce.db'}", max_batch=16, window_ms=50)
+        async with writer.engine.begin() as connection:
+            await connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)"))
+
+        async def submit(name: str, fail: bool = False):
+            stats = RequestStats()
+            with attributed_to(stats):
+                result = await writer.submit(insert_item(name, fail))
+            return result, stats
+
+        outcomes = await asyncio.gather(
+            *(submit(f"item{i}") for i in range(5)), submit("broken", fail=True), return_exceptions=True
+        )
+        async with writer.engine.connect() as connection:
+            names = (await connection.execute(text("SELECT name FROM items ORDER BY id"))).scalars().all()
+        await writer.close()
+        return writer, outcomes, names
+
+    writer, outcomes, names = asyncio.run(run())
+    # 六个写操作在同一个批次中提交，失败的操作只回滚自己的 SAVEPOINT
+    assert (writer.batches, writer.operations) == (1, 6)
+    assert names == [f"item{i}" for i in range(5)]
+    assert isinstance(outcomes[-1], ValueError)
+    for i, (result, stats) in enumerate(outcomes[:-1]):
+        assert result == f"item{i}"
+        # INSERT 计入提交它的请求
+        assert stats.queries >= 1
+
+def test_endpoints_write_through_coalescer(client, make_conference, make_employee, monkeypatch):
+    writer = WriteCoalescer()
+    monkeypatch.setattr(coalescer_module, "coalescer", writer)
+    try:
+        response = client.post("/api/employees/batch", json=[
+            {"name": "合并一", "email": "coalesce-1@example.com", "department": "技术部", "position": "工程师"},
+            {"name": "合并二", "email": "coalesce-1@example.com", "department": "技术部", "position": "工程师"},
+        ])
+        assert [item["status"] for item in response.json()] == ["created", "conflict"]
+
+        response = client.post("/api/conferences/batch", json=[{"name": "合并会议", "date": "2025-06-03", "location": "A座"}])
+        assert response.json()[0]["status"] == "created"
+
+        conference, employee = make_conference(capacity=1), make_employee()
+        assert client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]}).status_code == 201
+        assert client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]}).status_code == 409
+
+        body = "name,email,department,position\n导入合并,coalesce-2@example.com,技术部,工程师\n"
+        job = client.post("/api/employees/import", content=body.encode(), headers={"Content-Type": "text/csv"}).json()
+        assert job["created"] == 1
+        # 两次批量写入、两个工厂创建、两次预定与一个导入事务
+        assert writer.operations == 7
+    finally:
+        client.portal.call(writer.close)
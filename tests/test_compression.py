@@ -0,0 +1,141 @@
+import asyncio
+import gzip
+import hashlib
+import re
+import zlib
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from starlette.testclient import TestClient
+from app.core.assets import HashedStaticFiles
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+TEXT = "会议管理系统 " * 200
+
+async def chunks():
+    for i in range(3):
+        yield f"{i}:{TEXT}\n"
+
+def build_app() -> Starlette:
+    routes = [
+        Route("/small", lambda request: PlainTextResponse("短文本")),
+        Route("/large", lambda request: PlainTextResponse(TEXT)),
+        Route("/binary", lambda request: Response(TEXT.encode(), media_type="image/png")),
+        Route("/encoded", lambda request: Response(gzip.compress(TEXT.encode()), media_type="text/plain",
+                                                   headers={"Content-Encoding": "gzip"})),
+        Route("/partial", lambda request: Response(TEXT.encode()[:500], status_code=206, media_type="text/plain",
+                                                   headers={"Content-Range": "bytes 0-499/5000"})),
+        Route("/ranged", lambda request: Response(TEXT.encode()[:500], media_type="text/plain",
+                                                  headers={"Content-Range": "bytes 0-499/5000"})),
+        Route("/missing", lambda request: PlainTextResponse(TEXT, status_code=404)),
+        Route("/events", lambda request: StreamingResponse(chunks(), media_type="text/event-stream")),
+        Route("/stream", lambda request: StreamingResponse(chunks(), media_type="application/x-ndjson")),
+    ]
+    app = Starlette(routes=routes)
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+    return app
+
+@pytest.fixture(scope="module")
+def compressed_client():
+    with TestClient(build_app()) as client:
+        yield client
+
+def encoding(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    return response.headers.get("content-encoding"), response
+
+def test_threshold_and_content_length(compressed_client):
+    assert encoding(compressed_client, "/small")[0] is None
+    content_encoding, response = encoding(compressed_client, "/large")
+    assert content_encoding == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    # httpx 已解压响应体，Content-Length 为压缩后的长度
+    assert int(response.headers["content-length"]) < len(TEXT.encode())
+    assert response.text == TEXT
+
+@pytest.mark.parametrize("path", ["/binary", "/encoded", "/partial", "/ranged", "/missing", "/events"])
+def test_responses_left_uncompressed(compressed_client, path):
+    content_encoding, response = encoding(compressed_client, path)
+    if path == "/encoded":
+        assert content_encoding == "gzip"
+        assert response.text == TEXT
+    else:
+        assert content_encoding is None
+
+def test_no_accept_encoding(compressed_client):
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+def test_streamed_chunks_are_flushed():
+    async def run():
+        messages = []
+        scope = {"type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream", "query_string": b"",
+                 "headers": [(b"accept-encoding", b"gzip")], "scheme": "http", "server": ("test", 80),
+                 "root_path": "", "http_version": "1.1", "asgi": {"version": "3.0", "spec_version": "2.4"}}
+
+        async def receive():
+            # spec_version 2.4 下 StreamingResponse 不再监听断开，这里只会在读取请求体时被调用
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await build_app()(scope, receive, send)
+        return messages
+
+    messages = asyncio.run(run())
+    start, bodies = messages[0], [message for message in messages[1:] if message["type"] == "http.response.body"]
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # 每一块压缩数据单独解压即得到对应的原文，不会被缓冲到响应结束
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    for i, message in enumerate(bodies[:3]):
+        assert decompressor.decompress(message["body"]).decode() == f"{i}:{TEXT}\n"
+    assert len(bodies) == 4 and not bodies[-1].get("more_body", False)
+    assert decompressor.decompress(bodies[-1]["body"]) == b""
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("deflate") is None
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("*") in ("br", "gzip")
+    assert choose_encoding(None) is None
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "app.css").write_text("body { color: red; }")
+    return HashedStaticFiles(tmp_path, "/static/")
+
+def test_hashed_urls(assets, tmp_path):
+    digest = hashlib.sha256(b"body { color: red; }").hexdigest()[:12]
+    assert assets.url("css/app.css") == f"/static/css/app.{digest}.css"
+    assert assets.url("css/missing.css") == "/static/css/missing.css"
+    assert assets.original(f"css/app.{digest}.css") == "css/app.css"
+    assert assets.original("css/app.000000000000.css") is None
+    assert assets.digest("../outside.txt") is None
+    assert assets.digests == {"css/app.css": digest}
+
+def test_hashed_responses(assets):
+    url = assets.url("css/app.css")
+    with TestClient(Starlette(routes=[Mount("/static", app=assets)])) as client:
+        hashed = client.get(url)
+        assert hashed.status_code == 200
+        assert hashed.headers["cache-control"] == "public, max-age=31536000, immutable"
+        original = client.get("/static/css/app.css")
+        assert original.headers["cache-control"] == "no-cache"
+        assert original.content == hashed.content
+        assert client.get(re.sub(r"\.[0-9a-f]{12}\.", ".0123456789ab.", url)).status_code == 404
+
+def test_index_references_hashed_assets(client):
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    url = re.search(r"/source/bg\.[0-9a-f]{12}\.png", response.text).group(0)
+    assert client.get(url).headers["cache-control"].endswith("immutable")
+
+    etag = response.headers["ETag"]
+    assert client.get("/", headers={"If-None-Match": etag}).status_code == 304
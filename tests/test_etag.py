@@ -0,0 +1,28 @@
+def revalidate(client, url):
+    """!
+    @brief 获取资源后带 If-None-Match 再次请求，返回 (ETag, 条件请求的状态码)。
+    """
+    etag = client.get(url).headers["ETag"]
+    return etag, client.get(url, headers={"If-None-Match": etag}).status_code
+
+def test_conference_list_etag(client, make_conference):
+    conference = make_conference()
+    etag, status = revalidate(client, "/api/conferences/")
+    assert status == 304
+
+    client.put(f"/api/conferences/{conference['id']}", json={"location": "B座2层"})
+    assert client.get("/api/conferences/", headers={"If-None-Match": etag}).status_code == 200
+    # 不同的查询参数是不同的表示
+    assert client.get("/api/conferences/", params={"limit": 1}).headers["ETag"] != revalidate(client, "/api/conferences/")[0]
+
+def test_bookings_etag_changes_with_bookings(client, make_employee, make_conference):
+    conference, employee = make_conference(), make_employee()
+    before, status = revalidate(client, "/api/conferences/bookings")
+    assert status == 304
+
+    client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]})
+    booked, _ = revalidate(client, "/api/conferences/bookings")
+    assert booked != before
+
+    client.delete(f"/api/conferences/{conference['id']}/bookings/{employee['id']}")
+    assert revalidate(client, "/api/conferences/bookings")[0] not in (before, booked)
@@ -0,0 +1,61 @@
+import asyncio
+import json
+from app.core.events import EventBus, events
+
+def parse_stream(text: str):
+    """!
+    @brief 把 text/event-stream 响应体解析为 (id, event, data) 列表，忽略注释与 retry。
+    """
+    parsed = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith((":", "retry")))
+        if "event" in fields:
+            parsed.append((fields["id"], fields["event"], json.loads(fields["data"])))
+    return parsed
+
+def test_event_bus_replay():
+    async def run():
+        bus = EventBus(buffer_size=2)
+        assert bus.since(0) == []
+        first = bus.publish("a", {})
+        bus.publish("b", {})
+        assert [event.type for event in bus.since(first.seq)] == ["b"]
+        bus.publish("c", {})
+        # 第一条已被淘汰，无法从 0 续传
+        assert bus.since(0) is None
+        assert [event.type for event in bus.since(1)] == ["b", "c"]
+
+        assert bus.parse_event_id(bus.event_id(2)) == 2
+        assert bus.parse_event_id(bus.event_id(4)) is None
+        assert bus.parse_event_id(EventBus().event_id(1)) is None
+        assert bus.parse_event_id("garbage") is None
+
+    asyncio.run(run())
+
+def test_event_bus_wait():
+    async def run():
+        bus = EventBus()
+        assert not await bus.wait(0.01)
+        waiter = asyncio.ensure_future(bus.wait(1))
+        await asyncio.sleep(0)
+        bus.publish("a", {})
+        assert await waiter
+
+    asyncio.run(run())
+
+def test_stream_starts_with_ready(client):
+    response = client.get("/api/events")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    ready = parse_stream(response.text)[0]
+    assert ready[1] == "ready"
+    assert ready[0] == events.event_id(ready[2]["seq"])
+
+def test_stream_resumes_after_last_event_id(client, make_employee):
+    resume_id = parse_stream(client.get("/api/events").text)[0][0]
+    employee = make_employee()
+
+    replayed = parse_stream(client.get("/api/events", headers={"Last-Event-ID": resume_id}).text)
+    assert [(event, data["items"][0]["id"]) for _, event, data in replayed] == [("employee.created", employee["id"])]
+
+    reset = parse_stream(client.get("/api/events", params={"last_event_id": "stale:1"}).text)
+    assert reset[0][1] == "reset"
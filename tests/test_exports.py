@@ -0,0 +1,81 @@
+import csv
+import gzip
+import io
+import json
+
+def unfold(text):
+    """!
+    @brief 还原 iCalendar 的折行，返回各属性行。
+    """
+    return text.replace("\r\n ", "").split("\r\n")
+
+def test_employee_csv_export(client, make_employee):
+    employee = make_employee(name='引号"与,逗号')
+    response = client.get("/api/employees/export")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="employees.csv"'
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    exported = next(row for row in rows if row["id"] == str(employee["id"]))
+    assert exported["name"] == '引号"与,逗号'
+    assert exported["phone"] == ""
+    assert exported["created_at"] == employee["created_at"]
+
+def test_booking_ndjson_and_gzip_export(client, make_employee, make_conference):
+    conference = make_conference()
+    employees = [make_employee() for _ in range(3)]
+    for employee in employees:
+        client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]})
+
+    response = client.get("/api/bookings/export", params={"format": "ndjson"})
+    assert response.headers["content-disposition"] == 'attachment; filename="bookings.ndjson"'
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    ours = [row for row in rows if row["conference_id"] == conference["id"]]
+    assert [row["employee_id"] for row in ours] == [employee["id"] for employee in employees]
+    assert ours[0]["employee_name"] == employees[0]["name"]
+
+    plain = client.get("/api/bookings/export")
+    compressed = client.get("/api/bookings/export", params={"gzip": "true"})
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert compressed.headers["content-disposition"] == 'attachment; filename="bookings.csv.gz"'
+    assert gzip.decompress(compressed.content) == plain.content
+
+def test_conference_export_formats(client, make_conference):
+    conference = make_conference(start_time="09:00", end_time="10:00")
+    rows = list(csv.DictReader(io.StringIO(client.get("/api/conferences/export").text)))
+    exported = next(row for row in rows if row["id"] == str(conference["id"]))
+    assert (exported["date"], exported["start_time"]) == (conference["date"], "09:00:00")
+
+    lines = client.get("/api/conferences/export", params={"format": "ndjson"}).text.splitlines()
+    assert json.loads(lines[-1])["id"] == conference["id"]
+
+def test_employee_ical_feed(client, make_employee, make_conference):
+    room = client.post("/api/rooms/", json={"name": "日历会议室"}).json()
+    employee = make_employee(name="日历用户")
+    timed = make_conference(
+        name="周会；进度, 风险" + "很长的名称" * 10, date="2025-09-01", location="B座",
+        room_id=room["id"], start_time="09:00", end_time="10:30", description="第一行\n第二行",
+    )
+    all_day = make_conference(name="团建", date="2025-09-02", location="郊外")
+    for conference in (timed, all_day):
+        client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]})
+
+    response = client.get(f"/api/employees/{employee['id']}/conferences.ics")
+    assert response.headers["content-type"].startswith("text/calendar")
+    assert all(len(line.encode("utf-8")) <= 75 for line in response.text.split("\r\n"))
+
+    lines = unfold(response.text)
+    assert lines[0] == "BEGIN:VCALENDAR"
+    assert "X-WR-CALNAME:日历用户的会议" in lines
+    assert lines[-2:] == ["END:VCALENDAR", ""]
+    assert f"UID:conference-{timed['id']}@coference" in lines
+    assert "DTSTART:20250901T090000" in lines
+    assert "DTEND:20250901T103000" in lines
+    assert "LOCATION:B座 日历会议室" in lines
+    assert "SUMMARY:周会；进度\\, 风险" + "很长的名称" * 10 in lines
+    assert "DESCRIPTION:第一行\\n第二行" in lines
+    assert "DTSTART;VALUE=DATE:20250902" in lines
+    assert "DTEND;VALUE=DATE:20250903" in lines
+    assert lines.count("BEGIN:VEVENT") == 2
+
+    assert client.get("/api/employees/999999999/conferences.ics").status_code == 404
@@ -0,0 +1,67 @@
+import asyncio
+import csv
+import io
+import json
+import pytest
+from app.models.importer import ImportFormatError, read_lines
+
+def collect_lines(*chunks: bytes, **kwargs):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [line async for lines in read_lines(source(), **kwargs) for line in lines]
+
+    return asyncio.run(collect())
+
+def test_read_lines_across_chunks():
+    text = "﻿name,email\n张三,zhang@example.com\n李四".encode("utf-8")
+    # 逐字节切分，BOM 与多字节字符都跨数据块
+    assert collect_lines(*(text[i:i + 1] for i in range(len(text)))) == ["name,email", "张三,zhang@example.com", "李四"]
+
+def test_read_lines_rejects_invalid_data():
+    with pytest.raises(ImportFormatError):
+        collect_lines(b"\xff\xfe\n")
+    with pytest.raises(ImportFormatError):
+        collect_lines(b"x" * 20, max_length=10)
+
+def test_csv_import(client, make_employee):
+    existing = make_employee()
+    body = "\r\n".join([
+        "name,email,department,position",
+        "导入一,import-csv-1@example.com,技术部,工程师",
+        f"改名,{existing['email']},市场部,经理",
+        "缺字段,import-csv-2@example.com,技术部",
+        '"多行,名字",import-csv-3@example.com,技术部,"高级\n工程师"',
+    ])
+    response = client.post("/api/employees/import", content=body.encode("utf-8"), headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200, response.text
+    job = response.json()
+    assert (job["status"], job["rows"], job["created"], job["updated"], job["invalid"]) == ("completed", 4, 2, 1, 1)
+    assert client.get(f"/api/employees/{existing['id']}").json()["department"] == "市场部"
+
+    errors = list(csv.DictReader(io.StringIO(client.get(job["errors_url"]).text)))
+    assert [(row["line"], row["status"]) for row in errors] == [("4", "invalid")]
+    assert client.get(f"/api/employees/imports/{job['id']}").json()["created"] == 2
+
+def test_ndjson_import_without_upsert(client, make_employee):
+    existing = make_employee()
+    lines = [
+        {"name": "导入二", "email": "import-ndjson-1@example.com", "department": "技术部", "position": "工程师"},
+        {"name": "重复", "email": existing["email"], "department": "技术部", "position": "工程师"},
+    ]
+    body = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines) + "\n{broken\n"
+    response = client.post(
+        "/api/employees/import", params={"upsert": "false"},
+        content=body.encode("utf-8"), headers={"Content-Type": "application/x-ndjson"}
+    )
+    job = response.json()
+    assert (job["created"], job["conflict"], job["invalid"]) == (1, 1, 1)
+
+def test_import_format_errors(client):
+    assert client.post("/api/employees/import", content=b"x", headers={"Content-Type": "text/plain"}).status_code == 415
+
+    response = client.post("/api/employees/import", content=b"name,email\n", headers={"Content-Type": "text/csv"})
+    assert response.status_code == 422
+    assert response.json()["detail"]["import"]["status"] == "failed"
@@ -0,0 +1,89 @@
+import json
+import pytest
+
+@pytest.mark.parametrize("path", ["/api/conferences/", "/api/employees/"])
+def test_keyset_pages(client, make_employee, make_conference, path):
+    for _ in range(5):
+        make_employee()
+        make_conference()
+    expected = [item["id"] for item in client.get(path).json()]
+
+    ids, after_id = [], None
+    while True:
+        response = client.get(path, params={"limit": 2, **({"after_id": after_id} if after_id is not None else {})})
+        ids += [item["id"] for item in response.json()]
+        after_id = response.headers.get("X-Next-Cursor")
+        if after_id is None:
+            break
+    assert ids == expected
+
+def test_last_page_has_no_cursor(client, make_employee):
+    last = make_employee()
+    response = client.get("/api/employees/", params={"after_id": last["id"] - 1, "limit": 2})
+    assert [item["id"] for item in response.json()] == [last["id"]]
+    assert "X-Next-Cursor" not in response.headers
+
+@pytest.mark.parametrize("path", ["/api/conferences/", "/api/employees/"])
+def test_stream_list_as_ndjson(client, make_employee, make_conference, path):
+    make_employee()
+    make_conference()
+    response = client.get(path, params={"stream": "true"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in response.text.splitlines()] == client.get(path).json()
+
+def pages(client, url, **params):
+    """!
+    @brief 按 X-Next-Cursor 响应头依次获取所有页。
+    """
+    items, cursor = [], None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        items += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return items
+
+def book_all(client, conference, employees):
+    for employee in employees:
+        client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]})
+
+def test_attendee_pages(client, make_employee, make_conference):
+    conference = make_conference()
+    employees = [make_employee() for _ in range(5)]
+    book_all(client, conference, employees)
+
+    attendees = pages(client, f"/api/conferences/{conference['id']}/attendees", limit=2)
+    assert sorted(attendee["id"] for attendee in attendees) == [employee["id"] for employee in employees]
+
+    projected = pages(client, f"/api/conferences/{conference['id']}/attendees", limit=2, sort="name", fields="id,name")
+    assert [attendee["name"] for attendee in projected] == sorted(employee["name"] for employee in employees)
+    assert all(set(attendee) == {"id", "name"} for attendee in projected)
+    assert client.get(f"/api/conferences/{conference['id']}/attendees", params={"fields": "salary"}).status_code == 400
+    assert client.get(f"/api/conferences/{conference['id']}/attendees/count").json()["count"] == 5
+
+def test_booking_detail_pages(client, make_employee, make_conference):
+    conference = make_conference()
+    employees = [make_employee() for _ in range(5)]
+    book_all(client, conference, employees)
+
+    bookings = pages(client, "/api/bookings", conference_id=conference["id"], limit=2)
+    assert [booking["employee_id"] for booking in bookings] == [employee["id"] for employee in employees]
+    assert bookings[0]["conference_name"] == conference["name"]
+    assert bookings[0]["employee_name"] == employees[0]["name"]
+
+    by_employee = pages(client, "/api/bookings", employee_id=employees[0]["id"], limit=1)
+    assert [booking["conference_id"] for booking in by_employee] == [conference["id"]]
+
+def test_invalid_booking_cursor(client):
+    assert client.get("/api/bookings", params={"limit": 2, "cursor": "not-a-cursor"}).status_code == 400
+
+def test_stream_booking_details(client, make_employee, make_conference):
+    conference = make_conference()
+    employees = [make_employee() for _ in range(3)]
+    book_all(client, conference, employees)
+
+    response = client.get("/api/bookings", params={"conference_id": conference["id"], "stream": "true"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["employee_id"] for row in rows] == [employee["id"] for employee in employees]
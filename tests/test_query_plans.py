@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_query_plans(tmp_path):
+    """!
+    @brief 在小规模数据上运行查询计划回归检查，所有路由的 SQL 都不应出现全表扫描或临时排序。
+    @details 应用在导入时读取 DATABASE_URL，而测试会话已导入应用，因此在子进程中运行。
+             百万级数据的检查见 benchmarks/query_plans.py 的默认规模。
+    """
+    output = tmp_path / "plans.json"
+    environment = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    code = (
+        "import sys; from benchmarks.query_plans import main; "
+        f"sys.exit(main(['--employees', '500', '--conferences', '100', '--bookings', '3000', '--output', {str(output)!r}]))"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=environment, capture_output=True, text=True)
+    assert output.exists(), completed.stderr
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["failed"] == []
+    assert completed.returncode == 0
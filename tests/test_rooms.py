@@ -0,0 +1,111 @@
+import datetime
+import itertools
+import pytest
+from app.models.schedule import RoomSchedule, free_slots
+
+_rooms = itertools.count(1)
+
+@pytest.fixture
+def room(client):
+    response = client.post("/api/rooms/", json={"name": f"测试会议室{next(_rooms)}", "capacity": 10})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def schedule(client, room, start, end, date="2025-08-01", **fields):
+    body = {"name": "会议室测试", "date": date, "location": "A座", "room_id": room["id"],
+            "start_time": start, "end_time": end, **fields}
+    return client.post("/api/conferences/", json=body)
+
+def time(text):
+    return datetime.time.fromisoformat(text)
+
+def test_room_conflicts(client, room):
+    assert schedule(client, room, "09:00", "10:00").status_code == 201
+    assert schedule(client, room, "09:30", "10:30").status_code == 409
+    assert schedule(client, room, "08:00", "11:00").status_code == 409
+    # 首尾相接不算冲突，其他日期不受影响
+    assert schedule(client, room, "10:00", "11:00").status_code == 201
+    assert schedule(client, room, "08:00", "09:00").status_code == 201
+    assert schedule(client, room, "09:30", "10:30", date="2025-08-02").status_code == 201
+    assert schedule(client, {"id": 10 ** 9}, "09:00", "10:00").status_code == 404
+
+def test_update_excludes_the_conference_itself(client, room):
+    first = schedule(client, room, "09:00", "10:00").json()
+    second = schedule(client, room, "10:00", "11:00").json()
+
+    # 在自身原有时段内调整不与自己冲突
+    response = client.put(f"/api/conferences/{first['id']}", json={"start_time": "09:15", "end_time": "10:00"})
+    assert response.status_code == 200
+    response = client.put(f"/api/conferences/{first['id']}", json={"end_time": "10:30"})
+    assert response.status_code == 409
+    assert str(second["id"]) in response.json()["detail"]
+    # 移到另一天后原时段空出
+    assert client.put(f"/api/conferences/{second['id']}", json={"date": "2025-08-03"}).status_code == 200
+    assert client.put(f"/api/conferences/{first['id']}", json={"end_time": "10:30"}).status_code == 200
+
+@pytest.mark.parametrize("fields", [
+    {"start_time": "09:00"},
+    {"start_time": "10:00", "end_time": "09:00"},
+    {"start_time": "10:00", "end_time": "10:00"},
+    {"room_id": 1},
+])
+def test_invalid_schedule_on_create(client, fields):
+    body = {"name": "无效时段", "date": "2025-08-01", "location": "A座", **fields}
+    assert client.post("/api/conferences/", json=body).status_code == 422
+
+def test_invalid_schedule_on_update(client, room, make_conference):
+    scheduled = schedule(client, room, "13:00", "14:00").json()
+    unscheduled = make_conference()
+    assert client.put(f"/api/conferences/{scheduled['id']}", json={"end_time": "12:00"}).status_code == 422
+    assert client.put(f"/api/conferences/{scheduled['id']}", json={"start_time": None}).status_code == 422
+    assert client.put(f"/api/conferences/{unscheduled['id']}", json={"room_id": room["id"]}).status_code == 422
+    assert client.put(f"/api/conferences/{unscheduled['id']}", json={"start_time": "09:00"}).status_code == 422
+
+def test_batch_detects_conflicts_within_the_batch(client, room):
+    schedule(client, room, "09:00", "10:00", date="2025-08-05")
+    response = client.post("/api/conferences/batch", json=[
+        {"name": "批次一", "date": "2025-08-05", "location": "A座", "room_id": room["id"], "start_time": "09:30", "end_time": "10:30"},
+        {"name": "批次二", "date": "2025-08-05", "location": "A座", "room_id": room["id"], "start_time": "10:00", "end_time": "11:00"},
+        {"name": "批次三", "date": "2025-08-05", "location": "A座", "room_id": room["id"], "start_time": "10:30", "end_time": "11:30"},
+        {"name": "批次四", "date": "2025-08-05", "location": "A座", "room_id": 10 ** 9, "start_time": "09:00", "end_time": "10:00"},
+    ])
+    assert [result["status"] for result in response.json()] == ["conflict", "created", "conflict", "invalid"]
+
+def test_free_slots_endpoint(client, room):
+    schedule(client, room, "09:00", "10:00", date="2025-08-06")
+    schedule(client, room, "10:30", "12:00", date="2025-08-06")
+    url = f"/api/rooms/{room['id']}/slots"
+
+    slots = client.get(url, params={"date": "2025-08-06", "day_start": "08:00", "day_end": "13:00"}).json()
+    assert [(slot["start_time"], slot["end_time"]) for slot in slots] == [
+        ("08:00:00", "09:00:00"), ("10:00:00", "10:30:00"), ("12:00:00", "13:00:00")
+    ]
+    slots = client.get(url, params={"date": "2025-08-06", "day_start": "08:00", "day_end": "13:00", "min_minutes": 60}).json()
+    assert len(slots) == 2
+    assert client.get(url, params={"date": "2025-08-06", "day_start": "13:00", "day_end": "08:00"}).status_code == 422
+    assert client.get("/api/rooms/999999999/slots", params={"date": "2025-08-06"}).status_code == 404
+
+def test_available_rooms(client, room):
+    schedule(client, room, "09:00", "10:00", date="2025-08-07")
+    params = {"date": "2025-08-07", "start_time": "09:30", "end_time": "10:30"}
+    assert room["id"] not in [item["id"] for item in client.get("/api/rooms/available", params=params).json()]
+    params["start_time"] = "10:00"
+    assert room["id"] in [item["id"] for item in client.get("/api/rooms/available", params=params).json()]
+    params["min_capacity"] = 11
+    assert room["id"] not in [item["id"] for item in client.get("/api/rooms/available", params=params).json()]
+
+def test_free_slots_merges_overlapping_busy_intervals():
+    busy = [(time("09:00"), time("10:00")), (time("09:30"), time("11:00")), (time("11:00"), time("11:15"))]
+    assert free_slots(busy, time("08:00"), time("12:00")) == [(time("08:00"), time("09:00")), (time("11:15"), time("12:00"))]
+    assert free_slots(busy, time("09:15"), time("10:30")) == []
+    assert free_slots([], time("08:00"), time("09:00"), datetime.timedelta(hours=2)) == []
+
+def test_room_schedule_index():
+    schedule = RoomSchedule()
+    day = datetime.date(2025, 8, 1)
+    assert schedule.add(1, day, time("09:00"), time("10:00"))
+    assert schedule.add(1, day, time("10:00"), time("11:00"))
+    assert not schedule.add(1, day, time("10:59"), time("12:00"))
+    assert not schedule.add(1, day, time("08:00"), time("12:00"))
+    assert schedule.add(2, day, time("09:00"), time("10:00"))
+    assert schedule.add(1, day + datetime.timedelta(days=1), time("09:00"), time("10:00"))
@@ -0,0 +1,106 @@
+import asyncio
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from app.models.database import Base, create_configured_engine
+from app.models.employee import EmployeeDB
+from app.models.schema import create_schema
+from app.models.search import apply_search
+
+def names(response):
+    assert response.status_code == 200, response.text
+    return [item["name"] for item in response.json()]
+
+def test_search_chinese_name_fragments(client, make_employee):
+    make_employee(name="司马相如")
+    make_employee(name="司马光")
+    make_employee(name="相里勤")
+
+    # 三个字以上走 trigram 索引，更短的词按子串匹配
+    assert names(client.get("/api/employees/", params={"q": "马相如"})) == ["司马相如"]
+    assert names(client.get("/api/employees/", params={"q": "司马"})) == ["司马相如", "司马光"]
+    assert names(client.get("/api/employees/", params={"q": "相"})) == ["司马相如", "相里勤"]
+    assert names(client.get("/api/employees/", params={"q": "司马 相如"})) == ["司马相如"]
+    assert names(client.get("/api/employees/", params={"q": "司马懿"})) == []
+
+def test_search_email_and_description(client, make_employee, make_conference):
+    employee = make_employee(name="搜索邮箱")
+    assert names(client.get("/api/employees/", params={"q": employee["email"]})) == ["搜索邮箱"]
+
+    make_conference(name="年度预算评审", description="讨论 2026 财年预算")
+    make_conference(name="季度复盘", description="预算执行情况")
+    assert names(client.get("/api/conferences/", params={"q": "财年预算"})) == ["年度预算评审"]
+    assert names(client.get("/api/conferences/", params={"q": "预算", "limit": 1})) == ["年度预算评审"]
+    # 只含标点的词不参与检索，LIKE 的通配符按字面匹配
+    assert names(client.get("/api/conferences/", params={"q": "季度复盘 %"})) == ["季度复盘"]
+    make_conference(name="满500返50")
+    make_conference(name="折扣50%")
+    assert names(client.get("/api/conferences/", params={"q": "0%"})) == ["折扣50%"]
+
+def test_search_pages_follow_index_order(client, make_employee):
+    expected = [make_employee(name=f"分页检索{i}")["id"] for i in range(5)]
+    ids, after_id = [], None
+    while True:
+        params = {"q": "分页检索", "limit": 2, **({"after_id": after_id} if after_id is not None else {})}
+        response = client.get("/api/employees/", params=params)
+        ids += [item["id"] for item in response.json()]
+        after_id = response.headers.get("X-Next-Cursor")
+        if after_id is None:
+            break
+    assert ids == expected
+
+def test_filters(client, make_employee, make_conference):
+    make_employee(name="筛选甲", department="筛选部", position="经理")
+    make_employee(name="筛选乙", department="筛选部", position="工程师")
+    assert names(client.get("/api/employees/", params={"department": "筛选部"})) == ["筛选甲", "筛选乙"]
+    assert names(client.get("/api/employees/", params={"department": "筛选部", "position": "经理"})) == ["筛选甲"]
+
+    make_conference(name="筛选会议一", date="2031-01-10", location="筛选地点")
+    make_conference(name="筛选会议二", date="2031-01-20", location="筛选地点")
+    params = {"location": "筛选地点", "date_from": "2031-01-15"}
+    assert names(client.get("/api/conferences/", params=params)) == ["筛选会议二"]
+    params = {"location": "筛选地点", "date_to": "2031-01-10"}
+    assert names(client.get("/api/conferences/", params=params)) == ["筛选会议一"]
+
+def test_prefix_like_fallback_on_other_databases():
+    class Bind:
+        class dialect:
+            name = "postgresql"
+
+    class Session:
+        def get_bind(self):
+            return Bind()
+
+    query, id_column = apply_search(Session(), select(EmployeeDB.id), EmployeeDB, "zhang 50%")
+    compiled = query.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert id_column is EmployeeDB.id
+    assert "employees_fts" not in sql
+    assert sql.count("LIKE") == 4
+    assert sorted(compiled.params.values()) == ["50/%", "50/%", "zhang", "zhang"]
+
+def test_create_schema_rebuilds_unicode61_index(tmp_path):
+    async def run():
+        bind = create_configured_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+        # 升级前的数据库：索引表以 unicode61 分词
+        async with bind.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(text(
+                "CREATE VIRTUAL TABLE employees_fts USING fts5(name, email, content='employees', "
+                "content_rowid='id', tokenize='unicode61', prefix='2 3')"
+            ))
+            await connection.execute(text(
+                "INSERT INTO employees (id, name, email, department, position, created_at, updated_at) "
+                "VALUES (1, '欧阳修', 'ouyang@example.com', '技术部', '工程师', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ))
+
+        changes = await create_schema(bind)
+        async with bind.connect() as connection:
+            found = (await connection.execute(
+                text("SELECT rowid FROM employees_fts WHERE employees_fts MATCH '\"阳修\" OR \"欧阳修\"'")
+            )).scalars().all()
+        await bind.dispose()
+        return changes, found
+
+    changes, found = asyncio.run(run())
+    assert ("search_index", "employees_fts") in changes
+    assert found == [1]
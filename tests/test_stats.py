@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+from sqlalchemy import text
+from app.models.database import Base, create_configured_engine
+from app.models.schema import create_schema
+
+# 每个测试使用不同的部门和不同年份的月份，互不影响
+_years = itertools.count(2040)
+_departments = itertools.count(1)
+
+def unique_department() -> str:
+    return f"统计部门{next(_departments)}"
+
+def department_stats(client, department):
+    rows = {row["department"]: row for row in client.get("/api/stats/departments").json()}
+    row = rows.get(department, {"employees": 0, "bookings": 0})
+    return row["employees"], row["bookings"]
+
+def monthly_stats(client, month):
+    rows = client.get("/api/stats/months", params={"month_from": month, "month_to": month}).json()
+    return (rows[0]["conferences"], rows[0]["bookings"]) if rows else (0, 0)
+
+def book(client, conference, employee):
+    response = client.post(f"/api/conferences/{conference['id']}/book", params={"employee_id": employee["id"]})
+    assert response.status_code == 201
+
+def test_booking_and_cancellation(client, make_employee, make_conference):
+    department, year = unique_department(), next(_years)
+    employee = make_employee(department=department)
+    conference = make_conference(date=f"{year}-03-10")
+    assert department_stats(client, department) == (1, 0)
+    assert monthly_stats(client, f"{year}-03") == (1, 0)
+
+    book(client, conference, employee)
+    assert department_stats(client, department) == (1, 1)
+    assert monthly_stats(client, f"{year}-03") == (1, 1)
+
+    client.delete(f"/api/conferences/{conference['id']}/bookings/{employee['id']}")
+    assert department_stats(client, department) == (1, 0)
+    assert monthly_stats(client, f"{year}-03") == (1, 0)
+
+def test_deletes_cascade_into_stats(client, make_employee, make_conference):
+    department, other, year = unique_department(), unique_department(), next(_years)
+    first, second = make_employee(department=department), make_employee(department=other)
+    conference = make_conference(date=f"{year}-04-01")
+    kept = make_conference(date=f"{year}-04-02")
+    for employee in (first, second):
+        book(client, conference, employee)
+        book(client, kept, employee)
+    assert monthly_stats(client, f"{year}-04") == (2, 4)
+
+    client.delete(f"/api/conferences/{conference['id']}")
+    assert monthly_stats(client, f"{year}-04") == (1, 2)
+    assert department_stats(client, department) == (1, 1)
+    assert department_stats(client, other) == (1, 1)
+
+    client.delete(f"/api/employees/{first['id']}")
+    assert department_stats(client, department) == (0, 0)
+    assert monthly_stats(client, f"{year}-04") == (1, 1)
+
+def test_department_and_date_changes_move_counts(client, make_employee, make_conference):
+    before, after, year = unique_department(), unique_department(), next(_years)
+    employee = make_employee(department=before)
+    conference = make_conference(date=f"{year}-05-20")
+    book(client, conference, employee)
+
+    client.put(f"/api/employees/{employee['id']}", json={"department": after})
+    assert department_stats(client, before) == (0, 0)
+    assert department_stats(client, after) == (1, 1)
+
+    client.put(f"/api/conferences/{conference['id']}", json={"date": f"{year}-06-01"})
+    assert monthly_stats(client, f"{year}-05") == (0, 0)
+    assert monthly_stats(client, f"{year}-06") == (1, 1)
+
+def test_create_schema_backfills_existing_rows(tmp_path):
+    async def run():
+        bind = create_configured_engine(f"sqlite+aiosqlite:///{tmp_path / 'legacy.db'}")
+        # 升级前的数据库：已有数据，但没有汇总表的触发器
+        async with bind.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(text(
+                "INSERT INTO employees (id, name, email, department, position, created_at, updated_at) VALUES "
+                "(1, '甲', 'a@example.com', '技术部', '工程师', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), "
+                "(2, '乙', 'b@example.com', '技术部', '工程师', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), "
+                "(3, '丙', 'c@example.com', '市场部', '经理', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ))
+            await connection.execute(text(
+                "INSERT INTO conferences (id, name, date, location, booked_count, created_at, updated_at) VALUES "
+                "(1, '一', '2025-01-05', 'A', 2, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP), "
+                "(2, '二', '2025-02-05', 'A', 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ))
+            await connection.execute(text(
+                "INSERT INTO employee_conference (employee_id, conference_id) VALUES (1, 1), (3, 1), (1, 2)"
+            ))
+
+        changes = await create_schema(bind)
+        async with bind.connect() as connection:
+            departments = (await connection.execute(text("SELECT * FROM department_stats ORDER BY department"))).all()
+            months = (await connection.execute(text("SELECT * FROM monthly_stats ORDER BY month"))).all()
+        again = await create_schema(bind)
+        await bind.dispose()
+        return changes, departments, months, again
+
+    changes, departments, months, again = asyncio.run(run())
+    assert ("stats_table", "department_stats") in changes
+    assert [tuple(row) for row in departments] == [("市场部", 1, 1), ("技术部", 2, 2)]
+    assert [tuple(row) for row in months] == [("2025-01", 1, 2), ("2025-02", 1, 1)]
+    assert not [change for change in again if change[0] == "stats_table"]